@@ -2,12 +2,50 @@
 import tracker_config as tkc
 from PyQt6.QtSql import QSqlDatabase, QSqlQuery
 import os
+import re
 import shutil
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from logger_setup import logger
+from utility.app_operations.sleep_calc import sleep_duration_minutes
+from database.database_utility.db_paths import target_db_path
+from database.database_utility.sleep_sessions import rebuild_statements, sleep_session_statements
+from database.database_utility.sync import changelog_backfill_statements, changelog_statements
+from database.database_utility.commit_guard import CommitGuard
+from database.database_utility.validation import validate_values
+from database.table_specs import (DEFAULT_PET_ID, DEFAULT_PET_NAME, LIVE_ROWS, PET_TABLES, SCHEMA_VERSION,
+                                   SLEEP_SESSION_TABLES, TABLE_SPECS, insert_columns)
 
 user_dir = os.path.expanduser('~')
 db_path = os.path.join(os.getcwd(), tkc.DB_NAME)  # Database Name
-target_db_path = os.path.join(user_dir, tkc.DB_NAME)  # Database Name
+# Named connection used when no profile is given; every DataManager gets its own connection
+DEFAULT_CONNECTION_NAME = 'profile_' + tkc.DEFAULT_PROFILE
+
+# Free-text columns covered by the search_index FTS5 table.
+# table: (rowid tag, date column, time column, text column)
+# Index rowids are ``id * SEARCH_ROWID_STRIDE + tag`` so every source row maps to exactly one
+# index row and the sync triggers can hit it by rowid instead of scanning the index.
+SEARCH_ROWID_STRIDE = 8
+SEARCH_SOURCES = {
+    'lily_notes_table': (1, 'lily_date', 'lily_time', 'lily_notes'),
+    'lily_walk_notes_table': (2, 'lily_date', 'lily_time', 'lily_walk_note'),
+    'diet_table': (3, 'diet_date', 'diet_time', 'food_eaten'),
+}
+
+# Ids bound per statement when deleting or restoring rows by id
+ROW_ID_CHUNK = 500
+
+# Reminders seeded into a new database.
+# (kind, title, interval minutes, window start, window end, rule)
+# A reminder fires at the window start and every interval after it until the window end; the rule
+# names a check in utility.app_operations.reminders.REMINDER_RULES that can skip a firing.
+DEFAULT_REMINDERS = (
+    ('hydration', "Drink some water", 120, '09:00', '21:00', 'hydration_goal'),
+    ('meds', "Take your meds", 1440, '09:00', '09:00', None),
+    ('walk', "Take Lily for a walk", 240, '08:00', '20:00', 'walk_logged'),
+)
 
 
 def initialize_database():
@@ -28,24 +66,51 @@ def initialize_database():
 class DataManager:
     
     def __init__(self,
-                 db_name=target_db_path):
+                 db_name=target_db_path,
+                 connection_name=DEFAULT_CONNECTION_NAME):
+        self.db_path = db_name
+        self.connection_name = connection_name
+        # Callables run as listener(table, row_id) after every successful insert
+        self.insert_listeners: List[Callable[[str, int], None]] = []
+        # (table, row id) of the inserts made inside transaction(), told to the listeners on commit
+        self.held_inserts: Optional[List[Tuple[str, int]]] = None
+        # table -> (prepared INSERT, number of placeholders), filled by prepare_inserts
+        self.insert_queries: Dict[str, Tuple[QSqlQuery, int]] = {}
+        self.wal_guard: Optional[sqlite3.Connection] = None
+        # True while setup_tables upgrades a database stamped with an older SCHEMA_VERSION
+        self.migrating = False
+        # The window's recent commits to this database, so its commit paths can ignore repeats
+        self.commit_guard = CommitGuard()
         try:
-            self.db = QSqlDatabase.addDatabase('QSQLITE')
+            self.db = QSqlDatabase.addDatabase('QSQLITE', connection_name)
             self.db.setDatabaseName(db_name)
             
             if not self.db.open():
                 logger.error("Error: Unable to open database")
             logger.info("DB INITIALIZING")
-            self.query = QSqlQuery()
+            self.query = QSqlQuery(self.db)
+            # WAL lets the backup and analytics readers run alongside commits
+            self.query.exec("PRAGMA journal_mode=WAL")
             self.setup_tables()
+            # Workers open the file with Python's sqlite3, which links a different SQLite library
+            # than Qt's driver. POSIX locks can't tell the two apart, so a worker connection that
+            # closes thinks it's the last one and deletes the WAL from under this connection,
+            # hiding every later commit from other readers. A sqlite3 connection held open in WAL
+            # mode (it keeps a shared lock) stops that for as long as this manager is open. It is
+            # opened after the schema setup, whose writes can reset the WAL and drop its lock.
+            self.wal_guard = sqlite3.connect(db_name, check_same_thread=False)
+            self.wal_guard.execute("PRAGMA schema_version").fetchone()
         except Exception as e:
             logger.error(f"Error: Unable to open database {e}", exc_info=True)
     
     def setup_tables(self):
+        self.migrating = self.stored_schema_version() < SCHEMA_VERSION
+        self.setup_incremental_vacuum()
         self.setup_sleep_table()
         self.setup_total_hours_slept_table()
         self.setup_woke_up_like_table()
         self.setup_sleep_quality_table()
+        self.setup_sleep_session_columns()
         self.setup_shower()
         self.setup_exercise()
         self.setup_teethbrush()
@@ -57,6 +122,85 @@ class DataManager:
         self.setup_time_in_room_table()
         self.setup_lily_notes_table()
         self.setup_lily_walk_notes_table()
+        self.setup_pets_table()
+        self.setup_pet_columns()
+        self.setup_mental_mental_table()
+        self.setup_cspr_table()
+        self.setup_wefe_table()
+        self.setup_soft_delete()
+        self.setup_sleep_sessions()
+        self.setup_search_index()
+        self.setup_food_catalog_table()
+        self.setup_maintenance_log_table()
+        self.setup_reminders_table()
+        self.setup_changelog()
+        self.query.exec(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.migrating = False
+        self.prepare_inserts()
+    
+    def stored_schema_version(self) -> int:
+        """
+        Reads the schema version stamped into the database by the last setup_tables.
+
+        Returns:
+            int: PRAGMA user_version, or 0 if it cannot be read.
+        """
+        query = QSqlQuery(self.db)
+        if not query.exec("PRAGMA user_version") or not query.next():
+            logger.error(f"Error reading user_version - {query.lastError().text()}")
+            return 0
+        return query.value(0)
+    
+    def setup_incremental_vacuum(self) -> None:
+        """
+        Switches the database to auto_vacuum=INCREMENTAL, so that idle maintenance can free pages a
+        few at a time.
+
+        The mode only takes effect after a full VACUUM, which locks the file while it rewrites it.
+        That runs once per database, here, before the forms and the local API are up, rather than
+        in idle maintenance.
+
+        Returns:
+            None
+        """
+        if not self.query.exec("PRAGMA auto_vacuum") or not self.query.next():
+            logger.error(f"Error reading auto_vacuum - {self.query.lastError().text()}")
+            return
+        if self.query.value(0) == 2:
+            return
+        if not self.query.exec("PRAGMA auto_vacuum = INCREMENTAL"):
+            logger.error(f"Error setting auto_vacuum - {self.query.lastError().text()}")
+            return
+        logger.info(f"Converting {self.db_path} to incremental auto_vacuum with a one-time full "
+                    "VACUUM; this is expected once per database")
+        started = time.perf_counter()
+        if not self.query.exec("VACUUM"):
+            logger.error(f"Error vacuuming for auto_vacuum - {self.query.lastError().text()}")
+            return
+        logger.info(f"Full VACUUM took {(time.perf_counter() - started) * 1000:.0f} ms")
+    
+    def notify_inserted(self,
+                        table: str,
+                        row_id: int) -> None:
+        """
+        Tells the insert listeners about a newly inserted row. Inside transaction() they are told
+        once it commits, and not at all if it rolls back.
+
+        Args:
+            table (str): The table the row was inserted into.
+            row_id (int): The id of the new row.
+
+        Returns:
+            None
+        """
+        if self.held_inserts is not None:
+            self.held_inserts.append((table, row_id))
+            return
+        for listener in self.insert_listeners:
+            try:
+                listener(table, row_id)
+            except Exception as e:
+                logger.error(f"Insert listener failed for {table}: {e}", exc_info=True)
     
     def setup_lily_notes_table(self) -> None:
         """
@@ -84,7 +228,9 @@ class DataManager:
     def insert_into_lily_notes_table(self,
                                      lily_date: str,
                                      lily_time: str,
-                                     lily_notes: str) -> None:
+                                     lily_notes: str,
+                                     pet_id: int = DEFAULT_PET_ID,
+                                     validated: bool = False) -> bool:
         """
         Inserts a new record into the lily_notes_table.
 
@@ -92,28 +238,14 @@ class DataManager:
             lily_date (str): The date of the Lily note.
             lily_time (str): The time of the Lily note.
             lily_notes (str): The content of the Lily note.
-
-        Raises:
-            ValueError: If the number of bind values does not match the number of placeholders in the SQL query.
+            pet_id (int): The pet the record belongs to.
+            validated (bool): True if the values were already checked by validate_values.
 
         Returns:
-            None
+            bool: True if the row was inserted.
         """
-        sql: str = f"""INSERT INTO lily_notes_table(lily_date, lily_time, lily_notes) VALUES (?, ?, ?)"""
-        bind_values: List[str] = [lily_date, lily_time, lily_notes]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: lily_notes_table Expected {sql.count('?')}
-                            bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(f"Error inserting data: lily_notes_table - {self.query.lastError().text()}")
-        except ValueError as e:
-            logger.error(f"ValueError lily_notes_table: {e}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: lily_notes_table {e}", exc_info=True)
+        return self.insert_record('lily_notes_table', [lily_date, lily_time, lily_notes, pet_id],
+                                  validated=validated)
         
         ##################################################################################################################
         # Lily Diet Table
@@ -144,7 +276,9 @@ class DataManager:
     def insert_into_time_in_room_table(self,
                                        lily_date: str,
                                        lily_time: str,
-                                       time_in_room_slider: int) -> None:
+                                       time_in_room_slider: int,
+                                       pet_id: int = DEFAULT_PET_ID,
+                                       validated: bool = False) -> bool:
         """
         Inserts a new record into the lily_in_room_table.
 
@@ -152,30 +286,14 @@ class DataManager:
             lily_date (str): The date of the record.
             lily_time (str): The time of the record.
             time_in_room_slider (int): The value of the time_in_room_slider.
-
-        Raises:
-            ValueError: If the number of bind values does not match the expected number of placeholders in the SQL query.
+            pet_id (int): The pet the record belongs to.
+            validated (bool): True if the values were already checked by validate_values.
 
         Returns:
-            None
+            bool: True if the row was inserted.
         """
-        sql: str = f"""INSERT INTO lily_in_room_table(lily_date, lily_time,
-                                               time_in_room_slider) VALUES (?, ?, ?)"""
-        bind_values: List[Union[str, int]] = [lily_date, lily_time, time_in_room_slider]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: lily_in_room_table Expected {sql.count('?')}
-                            bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: lily_in_room_table - {self.query.lastError().text()}")
-        except ValueError as e:
-            logger.error(f"ValueError lily_in_room_table: {e}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: lily_in_room_table {e}", exc_info=True)
+        return self.insert_record('lily_in_room_table', [lily_date, lily_time, time_in_room_slider,
+                                                         pet_id], validated=validated)
         
         ##################################################################################################################
         # Lily Diet Table
@@ -203,36 +321,22 @@ class DataManager:
     
     def insert_into_lily_diet_table(self,
                                     lily_date: str,
-                                    lily_time: str) -> None:
+                                    lily_time: str,
+                                    pet_id: int = DEFAULT_PET_ID,
+                                    validated: bool = False) -> bool:
         """
         Inserts a new record into the lily_diet_table.
 
         Args:
             lily_date (str): The date of the record.
             lily_time (str): The time of the record.
-
-        Raises:
-            ValueError: If the number of bind values does not match the expected number of placeholders in the SQL query.
+            pet_id (int): The pet the record belongs to.
+            validated (bool): True if the values were already checked by validate_values.
 
         Returns:
-        None
+            bool: True if the row was inserted.
         """
-        sql: str = f"""INSERT INTO lily_diet_table(lily_date, lily_time) VALUES (?, ?)"""
-        bind_values: List[str] = [lily_date, lily_time]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: lily_eats_table Expected {sql.count('?')}
-                            bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: lily_eats_table - {self.query.lastError().text()}")
-        except ValueError as e:
-            logger.error(f"ValueError lily_eats_table: {e}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: lily_eats_table {e}", exc_info=True)
+        return self.insert_record('lily_diet_table', [lily_date, lily_time, pet_id], validated=validated)
         
         ##################################################################################################################
         #       Lily MOOD table
@@ -255,7 +359,9 @@ class DataManager:
                                     lily_time: str,
                                     lily_mood_slider: int,
                                     lily_mood_activity_slider: int,
-                                    lily_energy_slider: int) -> None:
+                                    lily_energy_slider: int,
+                                    pet_id: int = DEFAULT_PET_ID,
+                                    validated: bool = False) -> bool:
         """
         Inserts a new record into the lily_mood_table.
 
@@ -265,32 +371,15 @@ class DataManager:
             lily_mood_slider (int): The mood slider value.
             lily_mood_activity_slider (int): The mood activity slider value.
             lily_energy_slider (int): The energy slider value.
-
-        Raises:
-            ValueError: If the number of bind values does not match the expected number in the SQL query.
+            pet_id (int): The pet the record belongs to.
+            validated (bool): True if the values were already checked by validate_values.
 
         Returns:
-        None
+            bool: True if the row was inserted.
         """
-        sql: str = f"""INSERT INTO lily_mood_table(
-                lily_date, lily_time, lily_mood_slider, lily_mood_activity_slider, lily_energy_slider)
-                VALUES (?, ?, ?, ?, ?)"""
-        bind_values: List[Union[str, int]] = [lily_date, lily_time, lily_mood_slider,
-                                              lily_mood_activity_slider, lily_energy_slider]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: lily_mood_table Expected
-                            {sql.count('?')} bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: lily_mood_table - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError lily_mood_table: {str(ve)}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: lily_mood_table {e}", exc_info=True)
+        return self.insert_record('lily_mood_table', [lily_date, lily_time, lily_mood_slider,
+                                                      lily_mood_activity_slider, lily_energy_slider,
+                                                      pet_id], validated=validated)
         
         # Lily WALKS table
     
@@ -322,7 +411,9 @@ class DataManager:
                                         lily_date: str,
                                         lily_time: str,
                                         lily_behavior: int,
-                                        lily_gait: int) -> None:
+                                        lily_gait: int,
+                                        pet_id: int = DEFAULT_PET_ID,
+                                        validated: bool = False) -> bool:
         """
         Inserts a new record into the lily_walk_table.
 
@@ -331,33 +422,14 @@ class DataManager:
             lily_time (str): The time of the walk.
             lily_behavior (str): The behavior during the walk.
             lily_gait (str): The gait during the walk.
-
-        Raises:
-            ValueError: If the number of bind values does not match the number of placeholders in the SQL query.
+            pet_id (int): The pet the record belongs to.
+            validated (bool): True if the values were already checked by validate_values.
 
         Returns:
-        None
+            bool: True if the row was inserted.
         """
-        sql: str = f"""INSERT INTO lily_walk_table(
-                    lily_date, lily_time, lily_behavior, lily_gait)
-                    VALUES (?, ?, ?, ?)"""
-        
-        bind_values: List[Union[str, int]] = [lily_date, lily_time, lily_behavior, lily_gait]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(
-                    f"Mismatch: lily_walk_table Expected {sql.count('?')} bind values, got "
-                    f"{len(bind_values)}.")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: lily_walk_table - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError lily_walk_table: {str(ve)}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: lily_walk_table", str(e))
+        return self.insert_record('lily_walk_table', [lily_date, lily_time, lily_behavior,
+                                                      lily_gait, pet_id], validated=validated)
     
     def setup_lily_walk_notes_table(self) -> None:
         """
@@ -385,7 +457,9 @@ class DataManager:
     def insert_into_lily_walk_notes_table(self,
                                           lily_date: str,
                                           lily_time: str,
-                                          lily_walk_note: str) -> None:
+                                          lily_walk_note: str,
+                                          pet_id: int = DEFAULT_PET_ID,
+                                          validated: bool = False) -> bool:
         """
         Inserts a new record into the lily_walk_notes_table.
 
@@ -393,33 +467,14 @@ class DataManager:
             lily_date (str): The date of the walk.
             lily_time (str): The time of the walk.
             lily_walk_note (str): Additional notes about the walk.
-
-        Raises:
-            ValueError: If the number of bind values does not match the number of placeholders in the SQL query.
+            pet_id (int): The pet the record belongs to.
+            validated (bool): True if the values were already checked by validate_values.
 
         Returns:
-        None
+            bool: True if the row was inserted.
         """
-        sql: str = f"""INSERT INTO lily_walk_notes_table(
-                    lily_date, lily_time, lily_walk_note)
-                    VALUES (?, ?, ?)"""
-        
-        bind_values: List[Union[str, int]] = [lily_date, lily_time, lily_walk_note]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(
-                    f"Mismatch: lily_walk_notes_table Expected {sql.count('?')} bind values, got "
-                    f"{len(bind_values)}.")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: lily_walk_notes_table - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError lily_walk_notes_table: {str(ve)}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: lily_walk_notes_table", str(e))
+        return self.insert_record('lily_walk_notes_table', [lily_date, lily_time, lily_walk_note,
+                                                            pet_id], validated=validated)
     
     def setup_mental_mental_table(self) -> None:
         """
@@ -451,6 +506,339 @@ class DataManager:
                                     )"""):
             logger.error(f"Error creating table: mental_mental_table",
                          self.query.lastError().text())
+    
+    def insert_into_mental_mental_table(self,
+                                        mental_mental_date: str,
+                                        mental_mental_time: str,
+                                        mood_slider: int,
+                                        mania_slider: int,
+                                        depression_slider: int,
+                                        mixed_risk_slider: int,
+                                        validated: bool = False) -> bool:
+        """
+        Inserts a new record into the mental_mental_table.
+
+        Args:
+            mental_mental_date (str): The date of the record.
+            mental_mental_time (str): The time of the record.
+            mood_slider (int): The mood slider value.
+            mania_slider (int): The mania slider value.
+            depression_slider (int): The depression slider value.
+            mixed_risk_slider (int): The mixed risk slider value.
+            validated (bool): True if the values were already checked by validate_values.
+
+        Returns:
+            bool: True if the row was inserted.
+        """
+        return self.insert_record('mental_mental_table', [mental_mental_date, mental_mental_time,
+                                                          mood_slider, mania_slider,
+                                                          depression_slider, mixed_risk_slider],
+                                                         validated=validated)
+    
+    def setup_cspr_table(self) -> None:
+        """
+        Sets up the 'cspr_table' (calm, stress, pain, rage) in the database if it doesn't already exist.
+
+        Returns:
+            None
+        """
+        if not self.query.exec(f"""
+                        CREATE TABLE IF NOT EXISTS cspr_table (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        cspr_date TEXT,
+                        cspr_time TEXT,
+                        calm_slider INTEGER,
+                        stress_slider INTEGER,
+                        pain_slider INTEGER,
+                        rage_slider INTEGER
+                        )"""):
+            logger.error(f"Error creating table: cspr_table {self.query.lastError().text()}")
+    
+    def insert_into_cspr_table(self,
+                               cspr_date: str,
+                               cspr_time: str,
+                               calm_slider: int,
+                               stress_slider: int,
+                               pain_slider: int,
+                               rage_slider: int,
+                               validated: bool = False) -> bool:
+        """
+        Inserts a new record into the cspr_table.
+
+        Args:
+            cspr_date (str): The date of the record.
+            cspr_time (str): The time of the record.
+            calm_slider (int): The calm slider value.
+            stress_slider (int): The stress slider value.
+            pain_slider (int): The pain slider value.
+            rage_slider (int): The rage slider value.
+            validated (bool): True if the values were already checked by validate_values.
+
+        Returns:
+            bool: True if the row was inserted.
+        """
+        return self.insert_record('cspr_table', [cspr_date, cspr_time, calm_slider, stress_slider,
+                                                 pain_slider, rage_slider], validated=validated)
+    
+    def setup_wefe_table(self) -> None:
+        """
+        Sets up the 'wefe_table' (wellbeing, excitement, focus, energy and their sum) in the database
+        if it doesn't already exist.
+
+        Returns:
+            None
+        """
+        if not self.query.exec(f"""
+                        CREATE TABLE IF NOT EXISTS wefe_table (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        wefe_date TEXT,
+                        wefe_time TEXT,
+                        wellbeing_slider INTEGER,
+                        excite_slider INTEGER,
+                        focus_slider INTEGER,
+                        energy_slider INTEGER,
+                        summing_box INTEGER
+                        )"""):
+            logger.error(f"Error creating table: wefe_table {self.query.lastError().text()}")
+    
+    def insert_into_wefe_table(self,
+                               wefe_date: str,
+                               wefe_time: str,
+                               wellbeing_slider: int,
+                               excite_slider: int,
+                               focus_slider: int,
+                               energy_slider: int,
+                               summing_box: int,
+                               validated: bool = False) -> bool:
+        """
+        Inserts a new record into the wefe_table.
+
+        Args:
+            wefe_date (str): The date of the record.
+            wefe_time (str): The time of the record.
+            wellbeing_slider (int): The wellbeing slider value.
+            excite_slider (int): The excitement slider value.
+            focus_slider (int): The focus slider value.
+            energy_slider (int): The energy slider value.
+            summing_box (int): The sum of the four sliders.
+            validated (bool): True if the values were already checked by validate_values.
+
+        Returns:
+            bool: True if the row was inserted.
+        """
+        return self.insert_record('wefe_table', [wefe_date, wefe_time, wellbeing_slider,
+                                                 excite_slider, focus_slider, energy_slider,
+                                                 summing_box], validated=validated)
+    
+    def setup_soft_delete(self) -> None:
+        """
+        Gives every tracker table a deleted_at column and the two partial indexes soft deletes use.
+
+        The live index, on (date, time) over the rows with no deleted_at (led by pet_id for the
+        PET_TABLES), serves the views and every other reader filtering on LIVE_ROWS, and replaces
+        the full date indexes tables had before. The tombstone index, on deleted_at over the
+        deleted rows only, lets the maintenance purge find old tombstones without a table scan.
+
+        Returns:
+            None
+        """
+        try:
+            for table_name, (date_column, time_column, _) in TABLE_SPECS.items():
+                if not self.column_exists(table_name, 'deleted_at'):
+                    if not self.query.exec(f"ALTER TABLE {table_name} ADD COLUMN deleted_at TEXT"):
+                        logger.error(f"Error adding deleted_at to {table_name} - "
+                                     f"{self.query.lastError().text()}")
+                        continue
+                columns = ['pet_id'] if table_name in PET_TABLES else []
+                columns += [date_column] + ([time_column] if time_column else [])
+                for sql in (f"DROP INDEX IF EXISTS {table_name}_date_idx",
+                            f"DROP INDEX IF EXISTS {table_name}_pet_date_idx",
+                            f"CREATE INDEX IF NOT EXISTS {table_name}_live_idx "
+                            f"ON {table_name}({', '.join(columns)}) WHERE {LIVE_ROWS}",
+                            f"CREATE INDEX IF NOT EXISTS {table_name}_deleted_idx "
+                            f"ON {table_name}(deleted_at) WHERE deleted_at IS NOT NULL"):
+                    if not self.query.exec(sql):
+                        logger.error(f"Error indexing {table_name} - {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error setting up soft deletes: {e}", exc_info=True)
+    
+    def prepare_inserts(self) -> None:
+        """
+        Prepares each tracker table's INSERT once, binding the columns of
+        table_specs.insert_columns by position, so an insert is just bind and exec.
+
+        Every statement has its own QSqlQuery; nothing else prepares on them, so setup and lookup
+        queries run on self.query can't leave an insert with the wrong statement or stale values.
+
+        Returns:
+            None
+        """
+        for table_name in TABLE_SPECS:
+            columns = insert_columns(table_name)
+            query = QSqlQuery(self.db)
+            if not query.prepare(f"INSERT INTO {table_name}({', '.join(columns)}) "
+                                 f"VALUES ({', '.join('?' for _ in columns)})"):
+                logger.error(f"Error preparing insert: {table_name} - {query.lastError().text()}")
+                continue
+            self.insert_queries[table_name] = (query, len(columns))
+    
+    def insert_record(self,
+                      table_name: str,
+                      bind_values: List[Union[str, int]],
+                      validated: bool = False) -> bool:
+        """
+        Validates a row, runs the table's prepared INSERT and notifies the insert listeners.
+
+        The values are checked and normalized by validate_values first, so an invalid row is
+        refused without touching the database. Callers that have just validated the row
+        themselves, as the window's form commits do, pass validated to skip the second check.
+
+        Args:
+            table_name (str): A key of TABLE_SPECS.
+            bind_values (List[Union[str, int]]): The values, in insert_columns order.
+            validated (bool): True if the values were already checked by validate_values.
+
+        Returns:
+            bool: True if the row was inserted.
+        """
+        try:
+            query, placeholders = self.insert_queries[table_name]
+            if len(bind_values) != placeholders:
+                raise ValueError(f"Mismatch: {table_name} Expected {placeholders} bind values, "
+                                 f"got {len(bind_values)}.")
+            if not validated:
+                bind_values = validate_values(table_name, bind_values)
+            for position, value in enumerate(bind_values):
+                query.bindValue(position, value)
+            if not query.exec():
+                logger.error(f"Error inserting data: {table_name} - {query.lastError().text()}")
+                return False
+            row_id = query.lastInsertId()
+            query.finish()
+            self.notify_inserted(table_name, row_id)
+            return True
+        except KeyError:
+            logger.error(f"No prepared insert for {table_name}")
+        except ValueError as ve:
+            logger.error(f"ValueError {table_name}: {str(ve)}")
+        except Exception as e:
+            logger.error(f"Error during data insertion: {table_name} {e}", exc_info=True)
+        return False
+    
+    def delete_rows(self,
+                    table_name: str,
+                    row_ids: List[int]) -> bool:
+        """
+        Soft-deletes rows by id: they get a deleted_at time, drop out of every view, and stay
+        recoverable with restore_rows until maintenance purges them. Run it inside transaction()
+        to group it with other changes.
+
+        Args:
+            table_name (str): A key of TABLE_SPECS.
+            row_ids (List[int]): The rows' ids.
+
+        Returns:
+            bool: True if the rows were deleted.
+        """
+        return self.set_deleted_at(table_name, row_ids, "datetime('now', 'localtime')")
+    
+    def restore_rows(self,
+                     table_name: str,
+                     row_ids: List[int]) -> bool:
+        """
+        Brings soft-deleted rows back. Run it inside transaction() to group it with other changes.
+
+        Args:
+            table_name (str): A key of TABLE_SPECS.
+            row_ids (List[int]): The rows' ids.
+
+        Returns:
+            bool: True if the rows were restored.
+        """
+        return self.set_deleted_at(table_name, row_ids, "NULL")
+    
+    def set_deleted_at(self,
+                       table_name: str,
+                       row_ids: List[int],
+                       value: str) -> bool:
+        """
+        Sets deleted_at to an SQL expression on rows by id, ROW_ID_CHUNK ids per statement.
+        """
+        if table_name not in TABLE_SPECS:
+            logger.error(f"Not a tracker table: {table_name}")
+            return False
+        query = QSqlQuery(self.db)
+        for start in range(0, len(row_ids), ROW_ID_CHUNK):
+            chunk = row_ids[start:start + ROW_ID_CHUNK]
+            query.prepare(f"UPDATE {table_name} SET deleted_at = {value} "
+                          f"WHERE id IN ({', '.join('?' for _ in chunk)})")
+            for row_id in chunk:
+                query.addBindValue(row_id)
+            if not query.exec():
+                logger.error(f"Error setting deleted_at: {table_name} - {query.lastError().text()}")
+                return False
+        return True
+    
+    def update_value(self,
+                     table_name: str,
+                     row_id: int,
+                     column: str,
+                     value) -> bool:
+        """
+        Sets one column of one row.
+
+        Args:
+            table_name (str): A key of TABLE_SPECS.
+            row_id (int): The row's id.
+            column (str): The column, as reported by the table's model.
+            value: The new value.
+
+        Returns:
+            bool: True if the row was updated.
+        """
+        if table_name not in TABLE_SPECS or not re.fullmatch(r'\w+', column):
+            logger.error(f"Not a tracker column: {table_name}.{column}")
+            return False
+        query = QSqlQuery(self.db)
+        query.prepare(f"UPDATE {table_name} SET {column} = ? WHERE id = ?")
+        query.addBindValue(value)
+        query.addBindValue(row_id)
+        if not query.exec():
+            logger.error(f"Error updating {table_name}.{column} - {query.lastError().text()}")
+            return False
+        return True
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Groups the inserts made inside the with-block into one transaction, so several rows cost one
+        commit. Rolls back if the block raises, and raises RuntimeError if the commit fails. The insert
+        listeners hear about the rows after the commit, so they never see a row that was rolled
+        back. A nested block joins the outer one.
+        """
+        if self.held_inserts is not None:
+            yield
+            return
+        started = self.db.transaction()
+        if not started:
+            logger.error(f"Error starting transaction - {self.db.lastError().text()}")
+        self.held_inserts = []
+        try:
+            yield
+        except Exception:
+            if started:
+                self.db.rollback()
+            raise
+        else:
+            if started and not self.db.commit():
+                error = self.db.lastError().text()
+                self.db.rollback()
+                raise RuntimeError(f"Error committing transaction - {error}")
+            held, self.held_inserts = self.held_inserts, None
+            for table, row_id in held:
+                self.notify_inserted(table, row_id)
+        finally:
+            self.held_inserts = None
             
     def setup_diet_table(self):
         if not self.query.exec(f"""
@@ -467,25 +855,446 @@ class DataManager:
                                diet_date,
                                diet_time,
                                food_eaten,
-                               calories):
-        
-        sql = f"""INSERT INTO diet_table(diet_date, diet_time, food_eaten, calories) VALUES
-                (?, ?, ?, ?)"""
-        
-        bind_values = [diet_date, diet_time, food_eaten, calories]
+                               calories,
+                               validated: bool = False) -> bool:
+        return self.insert_record('diet_table', [diet_date, diet_time, food_eaten, calories],
+                                  validated=validated)
+    
+    def setup_pets_table(self) -> None:
+        """
+        Sets up the 'pets' table, seeded with Lily as pet DEFAULT_PET_ID.
+
+        Returns:
+            None
+        """
         try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"Mismatch: diet_table Expected {sql.count('?')} bind values, got "
-                                 f"{len(bind_values)}.")
+            if not self.query.exec("""
+                    CREATE TABLE IF NOT EXISTS pets (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    pet_name TEXT NOT NULL UNIQUE COLLATE NOCASE
+                    )"""):
+                logger.error(f"Error creating table: pets {self.query.lastError().text()}")
+                return
+            self.query.prepare("INSERT OR IGNORE INTO pets(id, pet_name) VALUES (?, ?)")
+            self.query.addBindValue(DEFAULT_PET_ID)
+            self.query.addBindValue(DEFAULT_PET_NAME)
             if not self.query.exec():
-                logger.error(f"Error inserting data: diet_table - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError diet_table: {str(ve)}")
+                logger.error(f"Error seeding pets - {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error setting up pets table: {e}", exc_info=True)
+    
+    def setup_sleep_session_columns(self) -> None:
+        """
+        Gives the SLEEP_SESSION_TABLES a sleep_session_id column where it is missing.
+
+        A commit of the sleep form writes one row to each table with the same sleep_session_id, a
+        random hex id rather than a row id, so the rows still match up after syncing to a device
+        that numbers them differently. Rows from before the column existed have none.
+
+        Returns:
+            None
+        """
+        try:
+            for table in SLEEP_SESSION_TABLES:
+                if not self.column_exists(table, 'sleep_session_id'):
+                    if not self.query.exec(f"ALTER TABLE {table} ADD COLUMN sleep_session_id TEXT"):
+                        logger.error(f"Error adding sleep_session_id to {table} - "
+                                     f"{self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error adding sleep session columns: {e}", exc_info=True)
+    
+    def setup_sleep_sessions(self) -> None:
+        """
+        Sets up sleep_sessions, the one-row-per-night table the sleep page reads, with the triggers
+        keeping it current from the SLEEP_SESSION_TABLES (see database.database_utility.sleep_sessions).
+
+        The first time, it is filled from every night already stored.
+
+        Returns:
+            None
+        """
+        try:
+            is_new = not self.table_exists('sleep_sessions')
+            for statement in sleep_session_statements():
+                if not self.query.exec(statement):
+                    logger.error(f"Error setting up sleep_sessions - {self.query.lastError().text()}")
+                    return
+            if is_new:
+                for statement in rebuild_statements():
+                    if not self.query.exec(statement):
+                        logger.error(f"Error filling sleep_sessions - {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error setting up sleep_sessions {e}", exc_info=True)
+    
+    def setup_pet_columns(self) -> None:
+        """
+        Migrates the PET_TABLES to the shared multi-pet layout.
+
+        Adds a pet_id column where it is missing, which gives every existing row to Lily. The
+        tables' live index (see setup_soft_delete) leads with pet_id, so a pet's rows are read in
+        date order without scanning the other pets' rows.
+
+        Returns:
+            None
+        """
+        try:
+            for table in PET_TABLES:
+                if not self.column_exists(table, 'pet_id'):
+                    if not self.query.exec(f"ALTER TABLE {table} ADD COLUMN pet_id INTEGER NOT NULL "
+                                           f"DEFAULT {DEFAULT_PET_ID}"):
+                        logger.error(f"Error adding pet_id to {table} - {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error migrating pet tables: {e}", exc_info=True)
+    
+    def fetch_pets(self) -> List[Tuple[int, str]]:
+        """
+        Returns:
+            List[Tuple[int, str]]: (pet id, pet name) for every pet, in the order they were added.
+        """
+        pets: List[Tuple[int, str]] = []
+        query = QSqlQuery(self.db)
+        if not query.exec("SELECT id, pet_name FROM pets ORDER BY id"):
+            logger.error(f"Error reading pets - {query.lastError().text()}")
+            return pets
+        while query.next():
+            pets.append((query.value(0), query.value(1)))
+        return pets
+    
+    def add_pet(self,
+                pet_name: str) -> int:
+        """
+        Adds a pet, or finds the existing pet with that name.
+
+        Args:
+            pet_name (str): The pet's name.
+
+        Returns:
+            int: The pet's id, or -1 on error.
+        """
+        pet_name = (pet_name or "").strip()
+        if not pet_name:
+            return -1
+        query = QSqlQuery(self.db)
+        query.prepare("INSERT INTO pets(pet_name) VALUES (?) "
+                      "ON CONFLICT(pet_name) DO UPDATE SET pet_name = pet_name RETURNING id")
+        query.addBindValue(pet_name)
+        if not query.exec() or not query.next():
+            logger.error(f"Error adding pet {pet_name} - {query.lastError().text()}")
+            return -1
+        return query.value(0)
+    
+    def setup_maintenance_log_table(self) -> None:
+        """
+        Sets up the 'maintenance_log' table, where each maintenance run records its task timings.
+
+        Returns:
+            None
+        """
+        try:
+            if not self.query.exec("""
+                    CREATE TABLE IF NOT EXISTS maintenance_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_at TEXT NOT NULL,
+                    task TEXT NOT NULL,
+                    elapsed_ms REAL,
+                    result TEXT
+                    )"""):
+                logger.error(f"Error creating table: maintenance_log {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error setting up maintenance_log table: {e}", exc_info=True)
+    
+    def setup_changelog(self) -> None:
+        """
+        Sets up the change log that device sync reads from, with a capture trigger on every tracker
+        table (see database.database_utility.sync).
+
+        The first time, every existing row is logged as an insert so it syncs like a new one.
+
+        Returns:
+            None
+        """
+        try:
+            is_new = not self.table_exists('changelog')
+            for statement in changelog_statements():
+                if not self.query.exec(statement):
+                    logger.error(f"Error setting up the changelog - {self.query.lastError().text()}")
+                    return
+            if is_new:
+                for statement in changelog_backfill_statements():
+                    if not self.query.exec(statement):
+                        logger.error(f"Error backfilling the changelog - {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error setting up the changelog {e}", exc_info=True)
+    
+    def setup_reminders_table(self) -> None:
+        """
+        Sets up the 'reminders' table and seeds it with DEFAULT_REMINDERS.
+
+        next_due holds the next firing as 'yyyy-MM-dd hh:mm:ss' so a reminder skipped or fired
+        keeps its place across restarts.
+
+        Returns:
+            None
+        """
+        try:
+            if not self.query.exec("""
+                    CREATE TABLE IF NOT EXISTS reminders (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL UNIQUE,
+                    title TEXT NOT NULL,
+                    interval_minutes INTEGER NOT NULL CHECK (interval_minutes > 0),
+                    window_start TEXT NOT NULL,
+                    window_end TEXT NOT NULL,
+                    rule TEXT,
+                    enabled INTEGER NOT NULL DEFAULT 1,
+                    next_due TEXT
+                    )"""):
+                logger.error(f"Error creating table: reminders {self.query.lastError().text()}")
+                return
+            self.query.prepare("""INSERT OR IGNORE INTO reminders(
+                    kind, title, interval_minutes, window_start, window_end, rule)
+                    VALUES (?, ?, ?, ?, ?, ?)""")
+            for reminder in DEFAULT_REMINDERS:
+                for value in reminder:
+                    self.query.addBindValue(value)
+                if not self.query.exec():
+                    logger.error(f"Error seeding reminders - {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error setting up reminders table: {e}", exc_info=True)
+    
+    def fetch_reminders(self) -> List[dict]:
+        """
+        Loads every reminder.
+
+        Returns:
+            List[dict]: One dict per reminder, keyed by column name.
+        """
+        reminders: List[dict] = []
+        try:
+            query = QSqlQuery(self.db)
+            if not query.exec("""SELECT id, kind, title, interval_minutes, window_start, window_end, rule,
+                              enabled, next_due FROM reminders ORDER BY id"""):
+                logger.error(f"Error reading reminders - {query.lastError().text()}")
+                return reminders
+            record = query.record()
+            while query.next():
+                reminders.append({record.fieldName(i): query.value(i) for i in range(record.count())})
+        except Exception as e:
+            logger.error(f"Error reading reminders {e}", exc_info=True)
+        return reminders
+    
+    def update_reminder(self,
+                        reminder_id: int,
+                        **columns) -> bool:
+        """
+        Updates columns of one reminder, e.g. update_reminder(1, next_due='2024-06-17 11:00:00').
+
+        Args:
+            reminder_id (int): The reminder's id.
+            **columns: Column name -> new value; only enabled and next_due can be changed.
+
+        Returns:
+            bool: True if the reminder was updated, False otherwise.
+        """
+        unknown = set(columns) - {'enabled', 'next_due'}
+        if unknown or not columns:
+            logger.error(f"Error updating reminder {reminder_id}: can't set {sorted(unknown) or 'nothing'}")
+            return False
+        try:
+            query = QSqlQuery(self.db)
+            query.prepare(f"UPDATE reminders SET {', '.join(f'{name} = ?' for name in columns)} WHERE id = ?")
+            for value in [*columns.values(), reminder_id]:
+                query.addBindValue(value)
+            if not query.exec():
+                logger.error(f"Error updating reminder {reminder_id} - {query.lastError().text()}")
+                return False
+            return True
+        except Exception as e:
+            logger.error(f"Error updating reminder {reminder_id} {e}", exc_info=True)
+            return False
+    
+    def hydration_total(self, diet_date: str) -> int:
+        """
+        Sums the water logged on one day; served by the hydration_table live index.
+
+        Args:
+            diet_date (str): The day, 'yyyy-MM-dd'.
+
+        Returns:
+            int: Ounces logged that day.
+        """
+        query = QSqlQuery(self.db)
+        query.prepare(f"SELECT coalesce(SUM(hydration), 0) FROM hydration_table "
+                      f"WHERE diet_date = ? AND {LIVE_ROWS}")
+        query.addBindValue(diet_date)
+        if not query.exec() or not query.next():
+            logger.error(f"Error summing hydration_table - {query.lastError().text()}")
+            return 0
+        return query.value(0)
+    
+    def latest_entry_time(self,
+                          table_name: str,
+                          date_column: str,
+                          time_column: str,
+                          pet_id: Optional[int] = None) -> str:
+        """
+        Finds when the newest row of a table was logged.
+
+        Args:
+            table_name (str): The table.
+            date_column (str): Its date column.
+            time_column (str): Its time column.
+            pet_id (int): For the pet tables, only look at this pet's rows.
+
+        Returns:
+            str: 'yyyy-MM-dd hh:mm:ss', or an empty string if the table has no rows.
+        """
+        where = f"WHERE {LIVE_ROWS} " + ("AND pet_id = ? " if pet_id is not None else "")
+        query = QSqlQuery(self.db)
+        query.prepare(f"SELECT {date_column} || ' ' || {time_column} FROM {table_name} {where}"
+                      f"ORDER BY {date_column} DESC, {time_column} DESC LIMIT 1")
+        if pet_id is not None:
+            query.addBindValue(pet_id)
+        if not query.exec():
+            logger.error(f"Error reading {table_name} - {query.lastError().text()}")
+            return ""
+        return query.value(0) if query.next() else ""
+    
+    def setup_food_catalog_table(self) -> None:
+        """
+        Sets up the 'food_catalog' table and the trigger that keeps it in step with diet_table.
+
+        The catalog holds one row per distinct food (case and surrounding whitespace ignored) with
+        the calories last logged for it, how often it was eaten and when it was last eaten. Every
+        insert into diet_table upserts its food, so the catalog grows incrementally; deleting or
+        restoring a diet row, or changing its food, takes back or adds its count, so times_eaten
+        counts the live entries. The first time the table is created it is filled from the
+        existing diet history, and the first time the update trigger is created the counts are
+        taken again from the live entries.
+
+        Returns:
+            None
+        """
+        try:
+            is_new = not self.table_exists('food_catalog')
+            if not self.query.exec("""
+                    CREATE TABLE IF NOT EXISTS food_catalog (
+                    food_key TEXT PRIMARY KEY,
+                    food_name TEXT NOT NULL,
+                    calories INTEGER NOT NULL DEFAULT 0,
+                    times_eaten INTEGER NOT NULL DEFAULT 0,
+                    last_eaten TEXT
+                    ) WITHOUT ROWID"""):
+                logger.error(f"Error creating table: food_catalog {self.query.lastError().text()}")
+                return
+            
+            if not self.query.exec("""
+                    CREATE TRIGGER IF NOT EXISTS diet_table_food_catalog_ai AFTER INSERT ON diet_table
+                    WHEN trim(coalesce(new.food_eaten, '')) <> ''
+                    BEGIN
+                    INSERT INTO food_catalog(food_key, food_name, calories, times_eaten, last_eaten)
+                    VALUES (lower(trim(new.food_eaten)), trim(new.food_eaten), coalesce(new.calories, 0), 1,
+                            new.diet_date)
+                    ON CONFLICT(food_key) DO UPDATE SET
+                    food_name = excluded.food_name,
+                    calories = excluded.calories,
+                    times_eaten = times_eaten + 1,
+                    last_eaten = max(coalesce(last_eaten, ''), excluded.last_eaten);
+                    END"""):
+                logger.error(f"Error creating trigger: diet_table_food_catalog_ai "
+                             f"{self.query.lastError().text()}")
+            
+            recount = not is_new and not self.trigger_sql('diet_table_food_catalog_au')
+            if not self.query.exec("""
+                    CREATE TRIGGER IF NOT EXISTS diet_table_food_catalog_au
+                    AFTER UPDATE OF deleted_at, food_eaten ON diet_table
+                    WHEN old.deleted_at IS NOT new.deleted_at OR old.food_eaten IS NOT new.food_eaten
+                    BEGIN
+                    UPDATE food_catalog SET times_eaten = max(times_eaten - 1, 0)
+                    WHERE old.deleted_at IS NULL AND food_key = lower(trim(old.food_eaten));
+                    INSERT INTO food_catalog(food_key, food_name, calories, times_eaten, last_eaten)
+                    SELECT lower(trim(new.food_eaten)), trim(new.food_eaten), coalesce(new.calories, 0), 1,
+                           new.diet_date
+                    WHERE new.deleted_at IS NULL AND trim(coalesce(new.food_eaten, '')) <> ''
+                    ON CONFLICT(food_key) DO UPDATE SET times_eaten = times_eaten + 1;
+                    END"""):
+                logger.error(f"Error creating trigger: diet_table_food_catalog_au "
+                             f"{self.query.lastError().text()}")
+            elif recount:
+                for sql in ("UPDATE food_catalog SET times_eaten = 0",
+                            f"""UPDATE food_catalog SET times_eaten = counts.times_eaten
+                                FROM (SELECT lower(trim(food_eaten)) AS food_key, COUNT(*) AS times_eaten
+                                      FROM diet_table WHERE {LIVE_ROWS} GROUP BY 1) AS counts
+                                WHERE counts.food_key = food_catalog.food_key"""):
+                    if not self.query.exec(sql):
+                        logger.error(f"Error recounting food_catalog: {self.query.lastError().text()}")
+                        break
+            
+            # Bare columns next to max() come from the row holding the max, i.e. the latest entry
+            if is_new and not self.query.exec(f"""
+                    INSERT INTO food_catalog(food_key, food_name, calories, times_eaten, last_eaten)
+                    SELECT lower(trim(food_eaten)), trim(food_eaten), coalesce(calories, 0), COUNT(*),
+                           substr(MAX(coalesce(diet_date, '') || ' ' || coalesce(diet_time, '')), 1, 10)
+                    FROM diet_table
+                    WHERE trim(coalesce(food_eaten, '')) <> '' AND {LIVE_ROWS}
+                    GROUP BY lower(trim(food_eaten))"""):
+                logger.error(f"Error filling food_catalog: {self.query.lastError().text()}")
+        except Exception as e:
+            logger.error(f"Error setting up food_catalog {e}", exc_info=True)
+    
+    def fetch_food_catalog(self) -> List[Tuple[str, int, int]]:
+        """
+        Loads the whole food catalog in one query.
+
+        Returns:
+            List[Tuple[str, int, int]]: (food name, calories, times eaten) rows.
+        """
+        rows: List[Tuple[str, int, int]] = []
+        try:
+            query = QSqlQuery(self.db)
+            if not query.exec("SELECT food_name, calories, times_eaten FROM food_catalog"):
+                logger.error(f"Error reading food_catalog - {query.lastError().text()}")
+                return rows
+            while query.next():
+                rows.append((query.value(0), query.value(1), query.value(2)))
+        except Exception as e:
+            logger.error(f"Error reading food_catalog {e}", exc_info=True)
+        return rows
+    
+    def upsert_food_catalog(self,
+                            food_name: str,
+                            calories: int) -> bool:
+        """
+        Sets the calories for a food in the catalog, adding the food if it isn't there yet.
+
+        Used when the user corrects the calories filled in for a food (see
+        food_catalog.connect_food_completer); unlike diet inserts it doesn't count as an eaten entry.
+
+        Args:
+            food_name (str): The food name.
+            calories (int): The calories for the food.
+
+        Returns:
+            bool: True if the catalog was updated, False otherwise.
+        """
+        food_name = (food_name or "").strip()
+        if not food_name:
+            return False
+        try:
+            query = QSqlQuery(self.db)
+            query.prepare("""INSERT INTO food_catalog(food_key, food_name, calories, times_eaten)
+                            VALUES (lower(?), ?, ?, 0)
+                            ON CONFLICT(food_key) DO UPDATE SET
+                            food_name = excluded.food_name, calories = excluded.calories""")
+            for value in (food_name, food_name, calories):
+                query.addBindValue(value)
+            if not query.exec():
+                logger.error(f"Error updating food_catalog - {query.lastError().text()}")
+                return False
+            return True
         except Exception as e:
-            logger.error(f"Error during data insertion: diet_table", str(e))
+            logger.error(f"Error updating food_catalog {e}", exc_info=True)
+            return False
     
     def setup_hydration_table(self):
         if not self.query.exec(f"""
@@ -502,22 +1311,9 @@ class DataManager:
     def insert_into_hydration_table(self,
                                     diet_date,
                                     diet_time,
-                                    hydration):
-        sql = """INSERT INTO hydration_table(diet_date, diet_time, hydration) VALUES (?, ?, ?)"""
-        
-        bind_values = [diet_date, diet_time, hydration]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"Mismatch: hydration_table Expected {sql.count('?')} bind values, got {len(bind_values)}.")
-            if not self.query.exec():
-                logger.error(f"Error inserting data: hydration_table - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError hydration_table: {str(ve)}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: hydration_table", str(e))
+                                    hydration,
+                                    validated: bool = False) -> bool:
+        return self.insert_record('hydration_table', [diet_date, diet_time, hydration], validated=validated)
         
         # -:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-
         # SLEEP table
@@ -536,27 +1332,10 @@ class DataManager:
     def insert_into_shower_table(self,
                                  basics_date: str,
                                  basics_time: str,
-                                 shower_check: int) -> None:
-        
-        sql: str = f"""INSERT INTO shower_table(basics_date, basics_time,
-                shower_check) VALUES (?, ?, ?)"""
-        
-        bind_values: List[Union[str, bool]] = [basics_date, basics_time,
-                                               shower_check]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: shower_table Expected {sql.count('?')}
-                            bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: shower_table - {self.query.lastError().text()}")
-        except ValueError as e:
-            logger.error(f"ValueError shower_table: {e}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: shower_table {e}", exc_info=True)
+                                 shower_check: int,
+                                 validated: bool = False) -> bool:
+        return self.insert_record('shower_table', [basics_date, basics_time, shower_check],
+                                  validated=validated)
     
     def setup_exercise(self) -> None:
         if not self.query.exec(f"""
@@ -571,27 +1350,10 @@ class DataManager:
     def insert_into_exercise_table(self,
                                    basics_date: str,
                                    basics_time: str,
-                                   exerc_check: int) -> None:
-        
-        sql: str = f"""INSERT INTO exercise_table(basics_date, basics_time,
-                exerc_check) VALUES (?, ?, ?)"""
-        
-        bind_values: List[Union[str, bool]] = [basics_date, basics_time,
-                                               exerc_check]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: exercise_table Expected {sql.count('?')}
-                            bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: exercise_table - {self.query.lastError().text()}")
-        except ValueError as e:
-            logger.error(f"ValueError exercise_table: {e}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: exercise_table {e}", exc_info=True)
+                                   exerc_check: int,
+                                   validated: bool = False) -> bool:
+        return self.insert_record('exercise_table', [basics_date, basics_time, exerc_check],
+                                  validated=validated)
         
         # Teethbrushing Table
     
@@ -608,27 +1370,9 @@ class DataManager:
     def insert_into_tooth_table(self,
                                 basics_date: str,
                                 basics_time: str,
-                                tooth_check: int) -> None:
-        
-        sql: str = f"""INSERT INTO tooth_table(basics_date, basics_time,
-                tooth_check) VALUES (?, ?, ?)"""
-        
-        bind_values: List[Union[str, bool]] = [basics_date, basics_time,
-                                               tooth_check]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(f"""Mismatch: tooth_table Expected {sql.count('?')}
-                            bind values, got {len(bind_values)}.""")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: tooth_table - {self.query.lastError().text()}")
-        except ValueError as e:
-            logger.error(f"ValueError tooth_table: {e}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: tooth_table {e}", exc_info=True)
+                                tooth_check: int,
+                                validated: bool = False) -> bool:
+        return self.insert_record('tooth_table', [basics_date, basics_time, tooth_check], validated=validated)
     
     # SLEEP TIMES TABLE 
     def setup_sleep_table(self):
@@ -637,31 +1381,78 @@ class DataManager:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 sleep_date TEXT,
                 time_asleep TEXT,
-                time_awake TEXT
+                time_awake TEXT,
+                sleep_minutes INTEGER
                 )"""):
             logger.error(f"Error creating table: sleep_table", self.query.lastError().text())
+            return
+        # Databases created before sleep_minutes existed get the column and a one-off backfill, run
+        # only while migrating. The Data menu's Recompute reruns it by hand.
+        column_added = False
+        if not self.column_exists('sleep_table', 'sleep_minutes'):
+            if not self.query.exec("ALTER TABLE sleep_table ADD COLUMN sleep_minutes INTEGER"):
+                logger.error(f"Error adding sleep_minutes to sleep_table {self.query.lastError().text()}")
+                return
+            column_added = True
+        if column_added or self.migrating:
+            self.backfill_sleep_minutes()
+    
+    def column_exists(self,
+                      table_name: str,
+                      column_name: str) -> bool:
+        """
+        Checks whether a table has a column.
+
+        Args:
+            table_name (str): The name of the table.
+            column_name (str): The name of the column.
+
+        Returns:
+            bool: True if the column exists, False otherwise.
+        """
+        query = QSqlQuery(self.db)
+        if not query.exec(f"PRAGMA table_info({table_name})"):
+            return False
+        while query.next():
+            if query.value(1) == column_name:
+                return True
+        return False
+    
+    def backfill_sleep_minutes(self,
+                               recompute_all: bool = False) -> int:
+        """
+        Computes sleep_minutes from time_asleep/time_awake for historical sleep_table rows.
+
+        Runs as one UPDATE over the table, wrapping durations that cross midnight.
+
+        Args:
+            recompute_all (bool): Recompute every row instead of only rows without sleep_minutes.
+
+        Returns:
+            int: The number of rows updated, or -1 on error.
+        """
+        asleep = "(CAST(substr(time_asleep, 1, 2) AS INTEGER) * 60 + CAST(substr(time_asleep, 4, 2) AS INTEGER))"
+        awake = "(CAST(substr(time_awake, 1, 2) AS INTEGER) * 60 + CAST(substr(time_awake, 4, 2) AS INTEGER))"
+        sql = f"""UPDATE sleep_table
+                  SET sleep_minutes = (({awake} - {asleep}) % 1440 + 1440) % 1440
+                  WHERE time_asleep LIKE '__:__%' AND time_awake LIKE '__:__%'"""
+        if not recompute_all:
+            sql += " AND sleep_minutes IS NULL"
+        query = QSqlQuery(self.db)
+        if not query.exec(sql):
+            logger.error(f"Error backfilling sleep_minutes - {query.lastError().text()}")
+            return -1
+        return query.numRowsAffected()
     
     def insert_into_sleep_table(self,
                                 sleep_date,
                                 time_asleep,
-                                time_awake):
-        sql = f"""INSERT INTO sleep_table(sleep_date, time_asleep, time_awake) VALUES (?, ?, ?)"""
-        bind_values = [sleep_date, time_asleep, time_awake]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(
-                    f"Mismatch: sleep_table Expected {sql.count('?')} bind values, got "
-                    f"{len(bind_values)}.")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: sleep_table - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError sleep_table: {str(ve)}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: sleep_table", str(e))
+                                time_awake,
+                                sleep_session_id: Optional[str] = None,
+                                validated: bool = False) -> bool:
+        return self.insert_record('sleep_table', [sleep_date, time_asleep, time_awake,
+                                                  sleep_duration_minutes(time_asleep, time_awake),
+                                                  sleep_session_id], validated=validated)
     
     # -:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-
     # BASICS table
@@ -677,25 +1468,11 @@ class DataManager:
     
     def insert_into_total_hours_slept_table(self,
                                             sleep_date,
-                                            total_hours_slept):
-        # Prepare the SQL statement
-        sql = f"""INSERT INTO total_hours_slept_table(sleep_date, total_hours_slept) VALUES (?, ?)"""
-        bind_values = [sleep_date, total_hours_slept]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(
-                    f"Mismatch: total_hours_slept Expected {sql.count('?')} bind values, got "
-                    f"{len(bind_values)}.")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: total_hours_slept - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError total_hours_slept: {str(ve)}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: total_hours_slept", str(e))
+                                            total_hours_slept,
+                                            sleep_session_id: Optional[str] = None,
+                                            validated: bool = False) -> bool:
+        return self.insert_record('total_hours_slept_table', [sleep_date, total_hours_slept,
+                                                              sleep_session_id], validated=validated)
     
     def setup_woke_up_like_table(self):
         if not self.query.exec(f"""
@@ -708,25 +1485,11 @@ class DataManager:
     
     def insert_woke_up_like_table(self,
                                   sleep_date,
-                                  woke_up_like):
-        # Prepare the SQL statement
-        sql = f"""INSERT INTO woke_up_like_table(sleep_date, woke_up_like) VALUES (?, ?)"""
-        bind_values = [sleep_date, woke_up_like]
-        try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(
-                    f"Mismatch: woke_up_like Expected {sql.count('?')} bind values, got "
-                    f"{len(bind_values)}.")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: woke_up_like - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError woke_up_like: {str(ve)}")
-        except Exception as e:
-            logger.error(f"Error during data insertion: woke_up_like", str(e))
+                                  woke_up_like,
+                                  sleep_session_id: Optional[str] = None,
+                                  validated: bool = False) -> bool:
+        return self.insert_record('woke_up_like_table', [sleep_date, woke_up_like, sleep_session_id],
+                                  validated=validated)
     
     def setup_sleep_quality_table(self):
         if not self.query.exec(f"""
@@ -739,25 +1502,179 @@ class DataManager:
     
     def insert_into_sleep_quality_table(self,
                                         sleep_date,
-                                        sleep_quality):
-        # Prepare the SQL statement
-        sql = f"""INSERT INTO sleep_quality_table(sleep_date, sleep_quality) VALUES (?, ?)"""
-        bind_values = [sleep_date, sleep_quality]
+                                        sleep_quality,
+                                        sleep_session_id: Optional[str] = None,
+                                        validated: bool = False) -> bool:
+        return self.insert_record('sleep_quality_table', [sleep_date, sleep_quality, sleep_session_id],
+                                  validated=validated)
+    
+    # -:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-
+    # SEARCH index
+    # -:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-:-
+    def setup_search_index(self) -> None:
+        """
+        Sets up the 'search_index' FTS5 table over the free-text columns in SEARCH_SOURCES.
+
+        The index is kept in sync by AFTER INSERT/UPDATE/DELETE triggers on every source table;
+        a soft-deleted row leaves the index and comes back if it is restored.
+        When the index is created for the first time, the existing rows are indexed in one
+        INSERT ... SELECT per source table.
+
+        Returns:
+            None
+        """
         try:
-            self.query.prepare(sql)
-            for value in bind_values:
-                self.query.addBindValue(value)
-            if sql.count('?') != len(bind_values):
-                raise ValueError(
-                    f"Mismatch: sleep_quality Expected {sql.count('?')} bind values, got "
-                    f"{len(bind_values)}.")
-            if not self.query.exec():
-                logger.error(
-                    f"Error inserting data: sleep_quality - {self.query.lastError().text()}")
-        except ValueError as ve:
-            logger.error(f"ValueError sleep_quality: {str(ve)}")
+            is_new = not self.table_exists('search_index')
+            if not self.query.exec("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                    body,
+                    source UNINDEXED,
+                    entry_date UNINDEXED,
+                    entry_time UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                    )"""):
+                logger.error(f"Error creating table: search_index {self.query.lastError().text()}")
+                return
+            
+            for table, (tag, date_col, time_col, text_col) in SEARCH_SOURCES.items():
+                new_row = (f"new.id * {SEARCH_ROWID_STRIDE} + {tag}, new.{text_col}, '{table}', "
+                           f"new.{date_col}, new.{time_col}")
+                old_rowid = f"old.id * {SEARCH_ROWID_STRIDE} + {tag}"
+                triggers = {
+                    f"{table}_search_ai": f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN
+                        INSERT INTO search_index(rowid, body, source, entry_date, entry_time)
+                        VALUES ({new_row});
+                        END""",
+                    f"{table}_search_ad": f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN
+                        DELETE FROM search_index WHERE rowid = {old_rowid};
+                        END""",
+                    f"{table}_search_au": f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE ON {table} BEGIN
+                        DELETE FROM search_index WHERE rowid = {old_rowid};
+                        INSERT INTO search_index(rowid, body, source, entry_date, entry_time)
+                        SELECT {new_row} WHERE new.deleted_at IS NULL;
+                        END""",
+                }
+                # Triggers made before soft deletes would keep deleted rows searchable
+                if 'deleted_at' not in self.trigger_sql(f"{table}_search_au"):
+                    self.query.exec(f"DROP TRIGGER IF EXISTS {table}_search_au")
+                for name, sql in triggers.items():
+                    if not self.query.exec(sql):
+                        logger.error(f"Error creating trigger: {name} {self.query.lastError().text()}")
+                
+                if is_new and not self.query.exec(f"""
+                        INSERT INTO search_index(rowid, body, source, entry_date, entry_time)
+                        SELECT id * {SEARCH_ROWID_STRIDE} + {tag}, {text_col}, '{table}',
+                        {date_col}, {time_col} FROM {table} WHERE {LIVE_ROWS}"""):
+                    logger.error(f"Error indexing {table}: {self.query.lastError().text()}")
         except Exception as e:
-            logger.error(f"Error during data insertion: sleep_quality", str(e))
+            logger.error(f"Error setting up search_index {e}", exc_info=True)
+    
+    def table_exists(self, table_name: str) -> bool:
+        """
+        Checks whether a table (or virtual table) exists in the database.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            bool: True if the table exists, False otherwise.
+        """
+        query = QSqlQuery(self.db)
+        query.prepare("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?")
+        query.addBindValue(table_name)
+        return query.exec() and query.next()
+    
+    def trigger_sql(self, trigger_name: str) -> str:
+        """
+        Args:
+            trigger_name (str): The name of the trigger.
+
+        Returns:
+            str: The trigger's CREATE statement, or an empty string if it doesn't exist.
+        """
+        query = QSqlQuery(self.db)
+        query.prepare("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?")
+        query.addBindValue(trigger_name)
+        return query.value(0) if query.exec() and query.next() else ""
+    
+    def search_entries(self,
+                       text: str,
+                       limit: int = 50) -> List[Tuple[str, str, str, str]]:
+        """
+        Full-text search over the notes and food entries, best matches first.
+
+        Every word typed is matched as a prefix, so "wal gra" finds "walked on the grass".
+
+        Args:
+            text (str): The search text as typed by the user.
+            limit (int): The maximum number of results to return.
+
+        Returns:
+            List[Tuple[str, str, str, str]]: (source table, date, time, highlighted snippet) rows.
+        """
+        match = fts_match_expression(text)
+        if not match:
+            return []
+        results: List[Tuple[str, str, str, str]] = []
+        try:
+            query = QSqlQuery(self.db)
+            query.prepare("""SELECT source, entry_date, entry_time,
+                            snippet(search_index, 0, '[', ']', '...', 12)
+                            FROM search_index WHERE search_index MATCH ?
+                            ORDER BY rank LIMIT ?""")
+            query.addBindValue(match)
+            query.addBindValue(limit)
+            if not query.exec():
+                logger.error(f"Error searching search_index - {query.lastError().text()}")
+                return results
+            while query.next():
+                results.append((query.value(0), query.value(1), query.value(2), query.value(3)))
+        except Exception as e:
+            logger.error(f"Error during search: search_index {e}", exc_info=True)
+        return results
+
+    
+    def close(self) -> None:
+        """
+        Closes this manager's connection and removes it from QSqlDatabase's registry.
+
+        Returns:
+            None
+        """
+        try:
+            for query, _ in self.insert_queries.values():
+                query.finish()
+            self.insert_queries.clear()
+            self.query.finish()
+            self.query = None
+            if self.db.isOpen():
+                self.db.close()
+            self.db = None
+            QSqlDatabase.removeDatabase(self.connection_name)
+            if self.wal_guard is not None:
+                self.wal_guard.close()
+                self.wal_guard = None
+        except Exception as e:
+            logger.error(f"Error closing database {self.connection_name}: {e}", exc_info=True)
+
+def fts_match_expression(text: str) -> str:
+    """
+    Turns free text typed by the user into a safe FTS5 MATCH expression.
+
+    Each word is quoted (so FTS5 operators and punctuation can't break the query) and
+    marked as a prefix term.
+
+    Args:
+        text (str): The raw search text.
+
+    Returns:
+        str: The MATCH expression, or an empty string if there is nothing to search for.
+    """
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
 
 
 def close_database(self):
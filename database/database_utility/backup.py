@@ -0,0 +1,255 @@
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+from typing import List, Optional, Tuple
+from urllib.request import pathname2url
+
+import tracker_config as tkc
+from logger_setup import logger
+
+try:
+    import zstandard
+except ImportError:  # optional; archives fall back to gzip
+    zstandard = None
+
+BACKUP_STAMP_FORMAT = '%Y%m%d-%H%M%S'
+ZSTD_SUFFIX = '.db.zst'
+GZIP_SUFFIX = '.db.gz'
+ARCHIVE_SUFFIXES = (ZSTD_SUFFIX, GZIP_SUFFIX)
+
+default_backup_dir = os.path.join(os.path.expanduser('~'), tkc.PRINGLES, tkc.BACKUP_DIR_NAME)
+
+
+class _CopyRestarted(Exception):
+    pass
+
+
+def stepped_copy(source: sqlite3.Connection,
+                 target: sqlite3.Connection,
+                 pages: int = tkc.BACKUP_PAGES_PER_STEP,
+                 pause: float = tkc.BACKUP_STEP_PAUSE,
+                 max_restarts: int = tkc.BACKUP_MAX_RESTARTS) -> None:
+    """
+    Copies one database into another with the SQLite online backup API, a few pages at a time.
+
+    The source read lock is only held while a step runs, so the GUI connection can keep committing
+    between steps. A commit from another connection makes SQLite restart the copy; after
+    max_restarts of those the rest is copied in a single step, which in WAL mode reads one snapshot
+    without holding up writers.
+
+    :param source: The connection to copy from.
+    :param target: The connection to copy into; its contents are replaced.
+    :param pages: Pages copied per step.
+    :param pause: Seconds to sleep between steps.
+    :param max_restarts: Restarts tolerated before falling back to a single step.
+    """
+    restarts = 0
+    last_remaining = None
+
+    def between_steps(status, remaining, total):
+        nonlocal restarts, last_remaining
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > max_restarts:
+                raise _CopyRestarted()
+        last_remaining = remaining
+        if remaining:
+            time.sleep(pause)
+
+    try:
+        source.backup(target, pages=pages, progress=between_steps)
+    except _CopyRestarted:
+        source.backup(target)
+
+
+def quick_check(path: str) -> bool:
+    """
+    :return: True if PRAGMA quick_check passes on the database at path.
+    """
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("PRAGMA quick_check").fetchone()[0] == 'ok'
+
+
+def compress_file(source_path: str, archive_path: str) -> None:
+    """
+    Streams a file into a zstd archive, or a gzip one when zstandard isn't installed.
+
+    :param source_path: The file to compress.
+    :param archive_path: The archive to write; name it with archive_suffix().
+    """
+    with open(source_path, 'rb') as source, open(archive_path, 'wb') as archive:
+        if zstandard is not None:
+            zstandard.ZstdCompressor(level=tkc.BACKUP_ZSTD_LEVEL, threads=-1).copy_stream(source, archive)
+        else:
+            with gzip.GzipFile(fileobj=archive, mode='wb') as zipped:
+                shutil.copyfileobj(source, zipped)
+
+
+def decompress_file(archive_path: str, target_path: str) -> None:
+    """
+    Expands an archive written by compress_file.
+
+    :param archive_path: The .db.zst or .db.gz archive.
+    :param target_path: The file to write the database to.
+    """
+    with open(archive_path, 'rb') as archive, open(target_path, 'wb') as target:
+        if archive_path.endswith(ZSTD_SUFFIX):
+            if zstandard is None:
+                raise RuntimeError("The zstandard package is needed to restore .zst backups")
+            zstandard.ZstdDecompressor().copy_stream(archive, target)
+        else:
+            with gzip.GzipFile(fileobj=archive, mode='rb') as zipped:
+                shutil.copyfileobj(zipped, target)
+
+
+def archive_suffix() -> str:
+    return ZSTD_SUFFIX if zstandard is not None else GZIP_SUFFIX
+
+
+def backup_stem(db_path: str) -> str:
+    """
+    :return: The name archives of db_path start with.
+    """
+    return os.path.splitext(os.path.basename(db_path))[0]
+
+
+def list_backups(backup_dir: str = default_backup_dir,
+                 stem: Optional[str] = None) -> List[Tuple[datetime.datetime, str]]:
+    """
+    Lists the archives in backup_dir.
+
+    :param backup_dir: The backup directory.
+    :param stem: Only list archives of this database, as returned by backup_stem.
+    :return: (taken at, path) pairs, newest first.
+    """
+    if not os.path.isdir(backup_dir):
+        return []
+    backups = []
+    for name in os.listdir(backup_dir):
+        suffix = next((s for s in ARCHIVE_SUFFIXES if name.endswith(s)), None)
+        if suffix is None:
+            continue
+        base = name[:-len(suffix)]
+        if stem is not None and base[:-16] != stem:
+            continue
+        try:
+            taken_at = datetime.datetime.strptime(base[-15:], BACKUP_STAMP_FORMAT)
+        except ValueError:
+            continue
+        backups.append((taken_at, os.path.join(backup_dir, name)))
+    backups.sort(reverse=True)
+    return backups
+
+
+def latest_backup_time(db_path: str, backup_dir: str = default_backup_dir) -> Optional[datetime.datetime]:
+    backups = list_backups(backup_dir, backup_stem(db_path))
+    return backups[0][0] if backups else None
+
+
+def backups_to_keep(taken: List[datetime.datetime],
+                    keep_last: int = tkc.BACKUP_KEEP_LAST,
+                    keep_daily: int = tkc.BACKUP_KEEP_DAILY,
+                    keep_weekly: int = tkc.BACKUP_KEEP_WEEKLY,
+                    keep_monthly: int = tkc.BACKUP_KEEP_MONTHLY) -> set:
+    """
+    Applies the retention rules: the keep_last newest backups, plus the newest backup of each of
+    the last keep_daily days, keep_weekly ISO weeks and keep_monthly months that have one.
+
+    :param taken: Backup times, newest first.
+    :return: The times to keep.
+    """
+    keep = set(taken[:keep_last])
+    for period, count in ((lambda t: t.date(), keep_daily),
+                          (lambda t: t.isocalendar()[:2], keep_weekly),
+                          (lambda t: (t.year, t.month), keep_monthly)):
+        seen = set()
+        for taken_at in taken:
+            bucket = period(taken_at)
+            if bucket not in seen and len(seen) < count:
+                seen.add(bucket)
+                keep.add(taken_at)
+    return keep
+
+
+def rotate_backups(stem: str, backup_dir: str = default_backup_dir) -> List[str]:
+    """
+    Deletes the archives of one database that fall outside the retention rules.
+
+    :param stem: The database's archive name, as returned by backup_stem.
+    :param backup_dir: The backup directory.
+    :return: The paths removed.
+    """
+    backups = list_backups(backup_dir, stem)
+    keep = backups_to_keep([taken_at for taken_at, _ in backups])
+    removed = []
+    for taken_at, path in backups:
+        if taken_at not in keep:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError as e:
+                logger.error(f"Could not remove old backup {path}: {e}")
+    return removed
+
+
+def create_backup(db_path: str, backup_dir: str = default_backup_dir) -> str:
+    """
+    Takes a compressed online backup of the database and rotates old ones; runs in a worker thread.
+
+    The live database is copied into a scratch file with stepped_copy, checked, compressed and then
+    moved into place, so a half-written archive never carries a backup name.
+
+    :param db_path: The database to back up.
+    :param backup_dir: Where archives are kept.
+    :return: The path of the new archive.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stem = backup_stem(db_path)
+    stamp = datetime.datetime.now().strftime(BACKUP_STAMP_FORMAT)
+    archive_path = os.path.join(backup_dir, f"{stem}-{stamp}{archive_suffix()}")
+    snapshot_path = archive_path + '.snapshot'
+    partial_path = archive_path + '.partial'
+    try:
+        with closing(sqlite3.connect(f"file:{pathname2url(db_path)}?mode=ro", uri=True)) as source, \
+                closing(sqlite3.connect(snapshot_path)) as snapshot:
+            stepped_copy(source, snapshot)
+        if not quick_check(snapshot_path):
+            raise RuntimeError(f"Backup snapshot of {db_path} failed quick_check")
+        compress_file(snapshot_path, partial_path)
+        os.replace(partial_path, archive_path)
+    finally:
+        for scratch in (snapshot_path, partial_path):
+            if os.path.exists(scratch):
+                os.remove(scratch)
+    rotate_backups(stem, backup_dir)
+    return archive_path
+
+
+def restore_backup(archive_path: str, db_path: str) -> str:
+    """
+    Restores an archive over the live database; runs in a worker thread.
+
+    The archive is expanded and checked first, then copied in with the backup API rather than by
+    replacing the file, so connections that are already open see the restored data. The copy is
+    done in one step: the destination stays locked for the whole copy either way.
+
+    :param archive_path: The archive to restore.
+    :param db_path: The database to overwrite.
+    :return: The archive path.
+    """
+    snapshot_path = f"{db_path}.restore"
+    try:
+        decompress_file(archive_path, snapshot_path)
+        if not quick_check(snapshot_path):
+            raise RuntimeError(f"{os.path.basename(archive_path)} is not a valid database")
+        with closing(sqlite3.connect(snapshot_path)) as source, \
+                closing(sqlite3.connect(db_path, timeout=30)) as target:
+            source.backup(target)
+    finally:
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+    return archive_path
@@ -0,0 +1,123 @@
+"""
+The NumPy half of validation: the checks of a batch of entries made a column at a time.
+
+A ranged or whole-number column is converted to one float array and its whole-number and range
+masks are taken in one pass, and a date, time or duration column is matched against its canonical
+layout (yyyy-MM-dd, hh:mm:ss, HH:mm) on an array of its characters. Duplicates are found by coding
+each column's values as integers and looking for repeated rows of codes. validation imports this
+module only for batches of several entries, so single rows never load NumPy.
+"""
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from database.database_utility.validation import to_date, to_duration, to_time, whole_number
+
+# The canonical layout of each format's text: 9 is any digit, other characters stand for themselves
+LAYOUTS = {to_date: '9999-99-99', to_time: '99:99:99', to_duration: '99:99'}
+
+
+def layout_digits(text: np.ndarray, layout: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Matches text against a layout, a column at a time over an array of its characters.
+
+    :param text: A column's values as a unicode array.
+    :param layout: One of LAYOUTS.
+    :return: (the mask of the values in the layout, their digits as an int array, one row per
+        matching value and one column per 9 of the layout).
+    """
+    matches = np.char.str_len(text) == len(layout)
+    chars = text[matches].astype(f'U{len(layout)}').view(np.uint32).reshape(-1, len(layout)).astype(np.int64)
+    is_digit = np.array([c == '9' for c in layout])
+    literals = np.array([ord(c) for c in layout])
+    digits = chars[:, is_digit] - ord('0')
+    fits = ((digits >= 0) & (digits <= 9)).all(axis=1) & (chars[:, ~is_digit] == literals[~is_digit]).all(axis=1)
+    matches[matches] = fits
+    return matches, digits[fits]
+
+
+def pair(digits: np.ndarray, at: int) -> np.ndarray:
+    return digits[:, at] * 10 + digits[:, at + 1]
+
+
+def canonical_mask(convert: Callable[[Any], Any], text: np.ndarray) -> np.ndarray:
+    """
+    :param convert: to_date, to_time or to_duration.
+    :param text: A column's values as a unicode array.
+    :return: The mask of the values already valid and in their normalized form.
+    """
+    matches, digits = layout_digits(text, LAYOUTS[convert])
+    if convert is to_date:
+        year = digits[:, 0] * 1000 + digits[:, 1] * 100 + pair(digits, 2)
+        month, day = pair(digits, 4), pair(digits, 6)
+        valid = (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+        months = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype('datetime64[M]')
+        month_days = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+        valid &= day <= month_days
+    else:
+        valid = (pair(digits, 0) < 24) & (pair(digits, 2) < 60)
+        if convert is to_time:
+            valid &= pair(digits, 4) < 60
+    matches[matches] = valid
+    return matches
+
+
+def vector_pass(convert: Callable[[Any], Any], values: List[Any]) -> Optional[Tuple[List[int], List[Any]]]:
+    """
+    The batch check of a column whose converter has one.
+
+    :return: (the indexes of the values that don't pass, the normalized values, taken where they
+        pass), or None if the column's values are checked one by one.
+    """
+    bounds = getattr(convert, 'bounds', None)
+    if bounds is not None or convert is whole_number:
+        numbers = np.array([np.nan if value is None or isinstance(value, str) and not value.strip() else value
+                            for value in values], dtype=object)
+        try:
+            numbers = numbers.astype(np.float64)
+        except (TypeError, ValueError):
+            return None  # text that isn't a number; the converter names it
+        # past 2 ** 53 a float no longer holds every whole number; the converter keeps those exact
+        passed = (np.abs(numbers) < 2 ** 53) & (numbers == np.floor(numbers))
+        if bounds is not None:
+            passed &= (numbers >= bounds[0]) & (numbers <= bounds[1])
+        whole = np.where(passed, numbers, 0).astype(np.int64)
+        return (np.flatnonzero(~passed).tolist(),
+                (whole.astype(str) if bounds is not None and bounds[2] else whole).tolist())
+    if convert in LAYOUTS:
+        text = np.array(['' if value is None else value for value in values], dtype=str)
+        return np.flatnonzero(~canonical_mask(convert, text)).tolist(), text.tolist()
+    return None
+
+
+
+
+def duplicate_rows(columns: List[List[Any]], rows: List[int]) -> List[Tuple[int, int]]:
+    """
+    Finds rows repeating an earlier row. Each column's values are coded as integers (equal values,
+    equal codes) and the codes of a row are combined into one key, so rows compare as integers.
+
+    :param columns: The batch's values, a list per column.
+    :param rows: The indexes of the rows to compare, ascending.
+    :return: (index of a repeating row, index of the first row it repeats), in batch order.
+    """
+    rows = np.array(rows, dtype=np.int64)
+    keys = np.zeros(rows.size, dtype=np.int64)
+    for column in columns:
+        values = [column[index] for index in rows.tolist()]
+        kinds = set(map(type, values))
+        if kinds == {type(None)}:
+            continue
+        if len(kinds) == 1 and kinds <= {int, str}:
+            array = np.array(values)
+        else:
+            # tag values with their type, so 1 and '1' stay apart
+            array = np.array([f"{type(value).__name__}:{value}" for value in values], dtype=str)
+        distinct, codes = np.unique(array, return_inverse=True)
+        if distinct.size > 1:
+            # keys are re-coded below rows.size after every column, so this product can't overflow
+            keys = np.unique(keys * distinct.size + codes.reshape(-1), return_inverse=True)[1].reshape(-1)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    first_of_row = first[inverse.reshape(-1)]
+    repeats = np.flatnonzero(first_of_row != np.arange(rows.size))
+    return [(int(rows[at]), int(rows[first_of_row[at]])) for at in repeats]
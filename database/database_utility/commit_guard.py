@@ -0,0 +1,101 @@
+"""
+Refusing repeated commits: a double click on a commit button, or a commit action fired twice,
+must not insert the same entry twice.
+
+Every commit made from the window has an idempotency key, the hash of its table, date, time bucket
+and entry values. The bucket is the entry's time (or, for tables without a time column, the time
+of the commit) divided into windows of COMMIT_REPEAT_WINDOW_SECONDS, so the same values logged at
+08:00 and again at 09:30 are two entries, while a repeated click a second later is caught; a
+repeat that crosses into the next bucket is caught by also checking the bucket before. CommitGuard
+keeps the keys committed in the last few seconds in insertion order, so a check is two dict
+lookups and expired keys are dropped from the front as new ones arrive.
+
+Only the window's commit paths use the guard. Rows inserted by the local API, the command line
+or an import are never refused as repeats.
+"""
+import enum
+import time
+from collections import OrderedDict
+from typing import Sequence
+
+import tracker_config as tkc
+from database.table_specs import TABLE_SPECS
+
+
+class CommitResult(enum.Enum):
+    """
+    What a guarded commit did.
+    """
+    COMMITTED = 'committed'
+    REPEATED = 'repeated'  # ignored as a repeat of an entry committed moments ago
+    FAILED = 'failed'
+
+
+def time_bucket(table: str, values: Sequence, window: float) -> int:
+    """
+    :param table: A key of TABLE_SPECS.
+    :param values: A row's values in insert_columns order, its time as hh:mm:ss.
+    :param window: The bucket length in seconds, above 0.
+    :return: The bucket of the row's time, or of now for tables without a time column.
+    """
+    if TABLE_SPECS[table][1]:
+        hours, minutes, seconds = (int(part) for part in str(values[1]).split(':'))
+        return int((hours * 3600 + minutes * 60 + seconds) // window)
+    return int(time.time() // window)
+
+
+def commit_key(table: str, values: Sequence, bucket: int) -> int:
+    """
+    :param table: A key of TABLE_SPECS.
+    :param values: A row's values in insert_columns order; values past the entry columns (the
+        derived columns) are ignored.
+    :param bucket: The row's time bucket (see time_bucket).
+    :return: The row's idempotency key.
+    """
+    _, time_column, columns = TABLE_SPECS[table]
+    first_entry = 2 if time_column else 1
+    return hash((table, values[0], bucket, *values[first_entry:first_entry + len(columns)]))
+
+
+class CommitGuard:
+    """
+    The idempotency keys committed within the last window seconds.
+    """
+
+    def __init__(self, window: float = tkc.COMMIT_REPEAT_WINDOW_SECONDS) -> None:
+        """
+        :param window: How long, in seconds, a committed entry refuses its repeats. 0 turns the
+            guard off.
+        """
+        self.window = window
+        self.recent: 'OrderedDict[int, float]' = OrderedDict()
+
+    def is_repeat(self, table: str, values: Sequence) -> bool:
+        """
+        :param table: A key of TABLE_SPECS.
+        :param values: A validated row's values in insert_columns order.
+        :return: True if the same entry was committed within the window.
+        """
+        if self.window <= 0:
+            return False
+        now = time.monotonic()
+        while self.recent:
+            oldest, committed_at = next(iter(self.recent.items()))
+            if now - committed_at < self.window:
+                break
+            del self.recent[oldest]
+        bucket = time_bucket(table, values, self.window)
+        return (commit_key(table, values, bucket) in self.recent
+                or commit_key(table, values, bucket - 1) in self.recent)
+
+    def remember(self, table: str, values: Sequence) -> None:
+        """
+        Records a row as committed now.
+
+        :param table: A key of TABLE_SPECS.
+        :param values: A validated row's values in insert_columns order.
+        """
+        if self.window > 0:
+            key = commit_key(table, values, time_bucket(table, values, self.window))
+            self.recent[key] = time.monotonic()
+            self.recent.move_to_end(key)
@@ -0,0 +1,54 @@
+import os
+from typing import Dict, List
+
+import tracker_config as tkc
+from database.database_manager import DataManager
+from database.database_utility.db_paths import profile_db_path, profile_key, profiles_dir  # noqa: F401
+from logger_setup import logger
+
+
+class ConnectionRegistry:
+    """
+    Keeps one open DataManager, on its own named QSqlDatabase connection, per profile.
+
+    A profile's connection is opened and its tables set up the first time it is asked for; after
+    that get() just hands back the open manager, so switching profiles never reopens a database.
+
+    Attributes:
+        managers (Dict[str, DataManager]): profile -> its open DataManager.
+    """
+
+    def __init__(self) -> None:
+        self.managers: Dict[str, DataManager] = {}
+
+    @staticmethod
+    def available_profiles() -> List[str]:
+        """
+        :return: The default profile followed by every profile with a database file, sorted.
+        """
+        found = []
+        if os.path.isdir(profiles_dir):
+            found = sorted(os.path.splitext(name)[0] for name in os.listdir(profiles_dir)
+                           if name.endswith('.db'))
+        return [tkc.DEFAULT_PROFILE] + [profile for profile in found if profile != tkc.DEFAULT_PROFILE]
+
+    def get(self, profile: str) -> DataManager:
+        """
+        Returns the DataManager of a profile, opening its connection on first use.
+
+        :param profile: A key from profile_key.
+        :return: The profile's DataManager.
+        """
+        manager = self.managers.get(profile)
+        if manager is None:
+            db_path = profile_db_path(profile)
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            manager = DataManager(db_path, connection_name=f"profile_{profile}")
+            self.managers[profile] = manager
+            logger.info(f"Opened profile {profile} at {db_path}")
+        return manager
+
+    def close_all(self) -> None:
+        for manager in self.managers.values():
+            manager.close()
+        self.managers.clear()
@@ -0,0 +1,27 @@
+import os
+import re
+
+import tracker_config as tkc
+
+# Kept free of Qt imports so the command line can find databases without loading QtSql
+target_db_path = os.path.join(os.path.expanduser('~'), tkc.DB_NAME)
+profiles_dir = os.path.join(os.path.expanduser('~'), tkc.PRINGLES, tkc.PROFILES_DIR_NAME)
+
+
+def profile_key(name: str) -> str:
+    """
+    Normalises a profile name into the key used for its connection name and database file.
+
+    :param name: The profile name as typed.
+    :return: Lower-case letters, digits, '_' and '-' only; empty if nothing usable is left.
+    """
+    return re.sub(r'[^\w-]+', '_', (name or '').strip().lower()).strip('_')
+
+
+def profile_db_path(profile: str) -> str:
+    """
+    :return: The database file of a profile; the default profile keeps the original database.
+    """
+    if profile == tkc.DEFAULT_PROFILE:
+        return target_db_path
+    return os.path.join(profiles_dir, f"{profile}.db")
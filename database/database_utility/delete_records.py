@@ -1,37 +1,29 @@
-from PyQt6.QtWidgets import QTableView, QMainWindow
+from typing import List
+
+from PyQt6.QtWidgets import QTableView
+from PyQt6.QtSql import QSqlTableModel
 from logger_setup import logger
 
-def delete_selected_rows(main_window_instance: QMainWindow, table_view_widget_name: str,
-                         model_name: str):
+
+def selected_row_ids(table_view: QTableView, model: QSqlTableModel, id_column: str = 'id') -> List[int]:
     """
-    Delete the selected rows from the specified QTableView model.
+    Collects the ids of the rows selected in a table view, for deleting them.
 
     Args:
-        main_window_instance (QMainWindow): The instance of the main window.
-        table_view_widget_name (str): The name of the QTableView widget in the main window.
-        model_name (str): The name of the model associated with the QTableView.
-
-    Raises:
-        Exception: If an error occurs while deleting records.
+        table_view (QTableView): The view.
+        model (QSqlTableModel): The view's model.
+        id_column (str): The column holding the ids; rows where it is empty are skipped.
 
+    Returns:
+        List[int]: The selected rows' ids, ascending.
     """
     try:
-        # Retrieve the QTableView and model instances from the main window
-        table_view: QTableView = getattr(main_window_instance, table_view_widget_name)
-        model = getattr(main_window_instance, model_name)  # The model's specific type could vary
-
-        if table_view is not None:
-            # Get indices of selected rows, sorted in reverse order for deletion
-            selected_rows = table_view.selectionModel().selectedRows()
-            rows_to_delete = sorted([index.row() for index in selected_rows], reverse=True)
-
-            # Delete each selected row from the model
-            for row in rows_to_delete:
-                model.removeRow(row)
-
-            # Submit changes and refresh the model
-            model.submitAll()
-            model.select()
-
+        selection = table_view.selectionModel()
+        if selection is None:
+            return []
+        column = model.fieldIndex(id_column)
+        ids = (model.data(model.index(index.row(), column)) for index in selection.selectedRows())
+        return sorted({int(row_id) for row_id in ids if row_id is not None})
     except Exception as e:
-        logger.error(f"An error occurred while deleting records: {str(e)}")
+        logger.error(f"An error occurred while reading the selected rows: {str(e)}")
+        return []
@@ -0,0 +1,220 @@
+"""
+Building, writing and reading tracker entries with sqlite3, for code that runs outside the GUI's
+QtSql connection (the command line and the local API).
+
+IngestWriter is the single writer thread: batches queued from any thread are drained together and
+written in one transaction, each batch inside its own savepoint so a bad batch only fails itself.
+Batches are validated when they are submitted, so an invalid one is refused before it is queued.
+"""
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+import tracker_config as tkc
+from database.database_utility.sync import PET_ID_TABLES
+from database.database_utility.validation import reject_stored, validate_entries, whole_number
+from database.table_specs import DEFAULT_PET_ID, LIVE_ROWS, TABLE_SPECS
+from logger_setup import logger
+
+
+def pet_id_for(conn: sqlite3.Connection, pet_name: Optional[str]) -> int:
+    """
+    :param conn: An open connection.
+    :param pet_name: A pet's name, or None for the default pet.
+    :return: The pet's id.
+    :raises ValueError: If there is no pet with that name.
+    """
+    if not pet_name:
+        return DEFAULT_PET_ID
+    row = conn.execute("SELECT id FROM pets WHERE pet_name = ?", (pet_name.strip(),)).fetchone()
+    if row is None:
+        raise ValueError(f"No pet named {pet_name}")
+    return row[0]
+
+
+def build_row(conn: sqlite3.Connection, table: str, fields: Dict) -> Dict:
+    """
+    Turns an entry's fields into the row to insert, the way the app's commit does.
+
+    The fields are checked and normalized by validate_entries (missing columns take their
+    TABLE_SPECS default, date and time default to now), then the derived columns (sleep_minutes,
+    summing_box, pet_id) are filled in. A pet can be given by name ('pet') or id ('pet_id').
+
+    :param conn: An open connection, used to look up pets.
+    :param table: A key of TABLE_SPECS.
+    :param fields: Column name -> value.
+    :return: Column name -> value, ready to insert.
+    :raises ValueError: If a field is unknown, missing or invalid, or the pet doesn't exist.
+    """
+    return complete_row(conn, table, validate_entries(table, [fields])[0])
+
+
+def complete_row(conn: sqlite3.Connection, table: str, row: Dict) -> Dict:
+    """
+    Fills in a validated row's derived columns.
+
+    :param conn: An open connection, used to look up pets.
+    :param table: A key of TABLE_SPECS.
+    :param row: A row returned by validate_entries.
+    :return: Column name -> value, ready to insert.
+    :raises ValueError: If the pet doesn't exist.
+    """
+    row = dict(row)
+    pet_id, pet_name = row.pop('pet_id', None), row.pop('pet', None)
+    if table == 'sleep_table':
+        from utility.app_operations.sleep_calc import sleep_duration_minutes
+        row['sleep_minutes'] = sleep_duration_minutes(row['time_asleep'], row['time_awake'])
+    elif table == 'wefe_table':
+        row['summing_box'] = sum(row[name] for name, _, _ in TABLE_SPECS[table][2])
+    if table in PET_ID_TABLES:
+        row['pet_id'] = whole_number(pet_id) if pet_id is not None else pet_id_for(conn, pet_name)
+    return row
+
+
+def insert_row(conn: sqlite3.Connection, table: str, row: Dict) -> int:
+    """
+    :return: The new row's id.
+    """
+    cursor = conn.execute(f"INSERT INTO {table}({', '.join(row)}) "
+                          f"VALUES ({', '.join('?' for _ in row)})", list(row.values()))
+    return cursor.lastrowid
+
+
+def entries_query(table: str,
+                  since: Optional[str] = None,
+                  until: Optional[str] = None,
+                  pet_id: Optional[int] = None,
+                  limit: Optional[int] = None) -> Tuple[str, list]:
+    """
+    Builds the query for a table's live entries in a date range, oldest first.
+
+    :param table: A key of TABLE_SPECS.
+    :param since: First date, yyyy-MM-dd.
+    :param until: Last date, yyyy-MM-dd.
+    :param pet_id: Only this pet's entries (pet tables only).
+    :param limit: At most this many rows.
+    :return: The SQL and its parameters.
+    """
+    date_column, time_column, _ = TABLE_SPECS[table]
+    order = f"{date_column}, {time_column}, id" if time_column else f"{date_column}, id"
+    where: List[str] = [LIVE_ROWS]
+    params: list = []
+    if since:
+        where.append(f"{date_column} >= ?")
+        params.append(since)
+    if until:
+        where.append(f"{date_column} <= ?")
+        params.append(until)
+    if table in PET_ID_TABLES and pet_id is not None:
+        where.append("pet_id = ?")
+        params.append(pet_id)
+    sql = f"SELECT * FROM {table} WHERE {' AND '.join(where)} ORDER BY {order}"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params
+
+
+class IngestWriter:
+    """
+    Writes queued batches of entries on one thread with its own connection.
+
+    submit() may be called from any thread. The writer takes whatever is queued, up to
+    tkc.API_COALESCE_BATCHES batches, and writes it in a single transaction, so a burst of small
+    requests costs one commit rather than one each. Every batch is resolved once its transaction
+    has committed.
+
+    Attributes:
+        on_written: Called on the writer thread with (table, row ids) after each committed batch.
+    """
+
+    def __init__(self, db_path: str,
+                 on_written: Optional[Callable[[str, List[int]], None]] = None) -> None:
+        self.db_path = db_path
+        self.on_written = on_written
+        self.queue: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name='ingest-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, table: str, entries: List[Dict]) -> Future:
+        """
+        Queues a batch of entries for one table.
+
+        :param table: A key of TABLE_SPECS.
+        :param entries: Each entry's fields, as for build_row.
+        :return: A future for the new rows' ids, or the error that refused or rolled back the batch.
+        """
+        future: Future = Future()
+        try:
+            rows = validate_entries(table, entries)
+        except ValueError as e:
+            future.set_exception(e)
+            return future
+        self.queue.put((table, rows, future))
+        return future
+
+    def close(self) -> None:
+        """
+        Writes everything still queued and stops the writer thread.
+        """
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self) -> None:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            stopping = False
+            while not stopping:
+                batches = [self.queue.get()]
+                while len(batches) < tkc.API_COALESCE_BATCHES:
+                    try:
+                        batches.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batches:
+                    stopping = True
+                    batches = [batch for batch in batches if batch is not None]
+                if batches:
+                    self.write(conn, batches)
+        finally:
+            conn.close()
+
+    def write(self, conn: sqlite3.Connection, batches: List[Tuple[str, List[Dict], Future]]) -> None:
+        """
+        Writes batches in one transaction, each in a savepoint that is rolled back if it fails.
+        """
+        written = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for table, rows, future in batches:
+                conn.execute("SAVEPOINT batch")
+                try:
+                    rows = [complete_row(conn, table, row) for row in rows]
+                    reject_stored(conn, table, rows)
+                    ids = [insert_row(conn, table, row) for row in rows]
+                except (ValueError, sqlite3.Error) as e:
+                    conn.execute("ROLLBACK TO batch")
+                    conn.execute("RELEASE batch")
+                    future.set_exception(e)
+                else:
+                    conn.execute("RELEASE batch")
+                    written.append((table, ids, future))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.error(f"Error writing {len(batches)} queued batches: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, _, future in batches:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for table, ids, future in written:
+            future.set_result(ids)
+            if self.on_written is not None:
+                try:
+                    self.on_written(table, ids)
+                except Exception as e:
+                    logger.error(f"Ingest listener failed for {table}: {e}", exc_info=True)
@@ -0,0 +1,160 @@
+import sqlite3
+import time
+from contextlib import closing
+from typing import Callable, Dict, List, Tuple
+
+import tracker_config as tkc
+from database.table_specs import TABLE_SPECS
+from logger_setup import logger
+
+# A maintenance task takes a read-write connection and returns a short result for the log
+MaintenanceTask = Callable[[sqlite3.Connection], str]
+
+
+def purge_deleted_rows(conn: sqlite3.Connection,
+                       days: int = tkc.PURGE_DELETED_AFTER_DAYS,
+                       batch: int = tkc.PURGE_BATCH_ROWS,
+                       pause: float = tkc.MAINTENANCE_STEP_PAUSE) -> str:
+    """
+    Deletes for good the soft-deleted rows older than the given number of days.
+
+    Each table's tombstones are found through its partial deleted_at index and removed in batches,
+    each its own short write transaction with a pause after it, like incremental_vacuum.
+    """
+    purged = 0
+    for table in TABLE_SPECS:
+        while True:
+            removed = conn.execute(
+                f"DELETE FROM {table} WHERE id IN (SELECT id FROM {table} "
+                f"WHERE deleted_at < datetime('now', 'localtime', ?) LIMIT ?)",
+                (f"-{int(days)} days", batch)).rowcount
+            conn.commit()
+            purged += removed
+            if removed < batch:
+                break
+            time.sleep(pause)
+    return f"purged {purged} rows"
+
+
+def incremental_vacuum(conn: sqlite3.Connection,
+                       pages: int = tkc.MAINTENANCE_VACUUM_PAGES,
+                       pause: float = tkc.MAINTENANCE_STEP_PAUSE) -> str:
+    """
+    Returns free pages to the file system a few at a time.
+
+    Each PRAGMA incremental_vacuum(pages) is its own short write transaction, with a pause after it
+    so that commits from the GUI are never held up for long. DataManager switches the database to
+    auto_vacuum=INCREMENTAL when it opens it.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return "skipped, auto_vacuum is not incremental"
+    freed = 0
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    while free:
+        # Each step of the pragma frees one page; executescript steps it to completion
+        conn.executescript(f"PRAGMA incremental_vacuum({pages});")
+        remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if remaining >= free:
+            break
+        freed += free - remaining
+        free = remaining
+        time.sleep(pause)
+    return f"freed {freed} pages"
+
+
+def optimize(conn: sqlite3.Connection) -> str:
+    """
+    Refreshes the query planner statistics.
+
+    The first run does a full ANALYZE; after that PRAGMA optimize only re-analyzes the tables whose
+    statistics have gone stale, with analysis_limit keeping each ANALYZE bounded.
+    """
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'").fetchone()
+    conn.execute(f"PRAGMA analysis_limit = {tkc.MAINTENANCE_ANALYSIS_LIMIT}")
+    if not has_stats:
+        conn.execute("ANALYZE")
+        conn.commit()
+        return "full ANALYZE"
+    conn.execute("PRAGMA optimize").fetchall()
+    conn.commit()
+    return "PRAGMA optimize"
+
+
+def quick_check(conn: sqlite3.Connection) -> str:
+    """
+    Runs PRAGMA quick_check; the result is 'ok' or the first problems found.
+    """
+    problems = [row[0] for row in conn.execute("PRAGMA quick_check(10)")]
+    if problems != ['ok']:
+        logger.error(f"Database quick_check failed: {problems}")
+    return "; ".join(problems)
+
+
+def checkpoint(conn: sqlite3.Connection) -> str:
+    """
+    Copies the WAL back into the database file and truncates it if no reader is using it.
+    """
+    busy, wal_pages, moved = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return f"{moved}/{wal_pages} WAL pages" + (" (busy)" if busy else "")
+
+
+def compact_changelog(conn: sqlite3.Connection) -> str:
+    """
+    Drops change log entries superseded by a later change to the same row.
+
+    A sync sends each changed row's latest state, so only a row's newest entry is ever needed.
+    """
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'changelog'").fetchone():
+        return "skipped, no changelog"
+    removed = conn.execute("""DELETE FROM changelog WHERE seq NOT IN (
+                              SELECT max(seq) FROM changelog GROUP BY tbl, row_id)""").rowcount
+    conn.commit()
+    return f"removed {removed} entries"
+
+
+# Run in this order: purge before compacting the change log, which then drops the purged rows'
+# older entries, and before the vacuum, which frees their pages; vacuum before the checkpoint so
+# the freed pages leave the WAL too
+MAINTENANCE_TASKS: List[Tuple[str, MaintenanceTask]] = [
+    ('purge_deleted_rows', purge_deleted_rows),
+    ('compact_changelog', compact_changelog),
+    ('incremental_vacuum', incremental_vacuum),
+    ('optimize', optimize),
+    ('quick_check', quick_check),
+    ('checkpoint', checkpoint),
+]
+
+
+def run_maintenance(db_path: str,
+                    tasks: List[Tuple[str, MaintenanceTask]] = None) -> Dict[str, Tuple[float, str]]:
+    """
+    Runs the maintenance tasks on their own connection and records their timings; runs in a worker
+    thread.
+
+    A failing task is logged and recorded, and the remaining tasks still run. Every task's time and
+    result goes into the maintenance_log table.
+
+    :param db_path: The database to maintain.
+    :param tasks: (name, task) pairs, MAINTENANCE_TASKS by default.
+    :return: task name -> (milliseconds taken, result).
+    """
+    timings: Dict[str, Tuple[float, str]] = {}
+    with closing(sqlite3.connect(db_path, timeout=30)) as conn:
+        for name, task in tasks if tasks is not None else MAINTENANCE_TASKS:
+            started = time.perf_counter()
+            try:
+                result = task(conn)
+            except sqlite3.Error as e:
+                conn.rollback()
+                logger.error(f"Maintenance task {name} failed: {e}", exc_info=True)
+                result = f"failed: {e}"
+            timings[name] = ((time.perf_counter() - started) * 1000, result)
+        conn.executemany(
+            "INSERT INTO maintenance_log (run_at, task, elapsed_ms, result) "
+            "VALUES (datetime('now', 'localtime'), ?, ?, ?)",
+            [(name, round(elapsed, 1), result) for name, (elapsed, result) in timings.items()])
+        conn.commit()
+    logger.info("Maintenance: " + ", ".join(f"{name} {elapsed:.0f} ms ({result})"
+                                            for name, (elapsed, result) in timings.items()))
+    return timings
@@ -1,25 +1,150 @@
 from PyQt6 import QtSql
-from PyQt6.QtWidgets import QAbstractItemView
+from PyQt6.QtCore import QModelIndex, Qt, pyqtSignal
+from PyQt6.QtWidgets import QAbstractItemView, QTableView
+from database.database_utility.sleep_sessions import ROW_ID_COLUMNS
+from database.database_utility.validation import ValidationError, validate_value
+from database.table_specs import LIVE_ROWS, TABLE_SPECS
 from logger_setup import logger
 
 # model_setup.py
 
 
-def create_and_set_model(table_name: str, view_widget: QAbstractItemView) -> QtSql.QSqlTableModel:
+class RecordingTableModel(QtSql.QSqlTableModel):
+    """
+    A QSqlTableModel that checks every cell the user edits against the table's column rules and
+    reports it, so the edit can be undone.
+
+    Attributes:
+        cellEdited: Emitted after an edit is written, with (table, row id, column, old value, new value).
+    """
+    cellEdited = pyqtSignal(str, int, str, object, object)
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return super().setData(index, value, role)
+        column = self.record().fieldName(index.column())
+        if self.tableName() in TABLE_SPECS:
+            try:
+                value = validate_value(self.tableName(), column, value)
+            except ValidationError as e:
+                logger.error(f"Edit of {self.tableName()}.{column} refused: {e}")
+                return False
+        old = self.data(index, role)
+        row_id = self.data(self.index(index.row(), self.fieldIndex('id')))
+        if not super().setData(index, value, role):
+            return False
+        if old != value and row_id is not None:
+            self.cellEdited.emit(self.tableName(), int(row_id), column, old, value)
+        return True
+
+
+class SleepSessionsModel(QtSql.QSqlQueryModel):
+    """
+    The sleep_sessions rows, one per night, for the four sleep views to share.
+
+    sleep_sessions is built from the sleep tables by triggers, so the model reads it with one query
+    on its sleep_date index and writes edits to the sleep table row each cell came from; the
+    triggers then rebuild the night. select() reloads it, so it can stand in for a QSqlTableModel
+    wherever a model is refreshed after a commit.
+
+    Attributes:
+        cellEdited: Emitted after an edit is written, with (sleep table, row id, column, old value, new value).
+    """
+    cellEdited = pyqtSignal(str, int, str, object, object)
+
+    # column: the sleep table it is edited in
+    EDITABLE = {
+        'time_asleep': 'sleep_table',
+        'time_awake': 'sleep_table',
+        'total_hours_slept': 'total_hours_slept_table',
+        'woke_up_like': 'woke_up_like_table',
+        'sleep_quality': 'sleep_quality_table',
+    }
+
+    def __init__(self, db: QtSql.QSqlDatabase, parent=None) -> None:
+        super().__init__(parent)
+        self.db = db
+        self.order_by = 'sleep_date, id'
+
+    def select(self) -> bool:
+        query = QtSql.QSqlQuery(self.db)
+        if not query.exec(f"SELECT * FROM sleep_sessions ORDER BY {self.order_by}"):
+            logger.error(f"Error selecting sleep_sessions - {query.lastError().text()}")
+            return False
+        self.setQuery(query)
+        while self.canFetchMore():
+            self.fetchMore()
+        return True
+
+    def fieldIndex(self, name: str) -> int:
+        return self.record().indexOf(name)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        name = self.record().fieldName(column)
+        if not name:
+            return
+        direction = 'DESC' if order == Qt.SortOrder.DescendingOrder else 'ASC'
+        self.order_by = f"{name} {direction}, id {direction}"
+        self.select()
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.isValid() and self.record().fieldName(index.column()) in self.EDITABLE:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        column = self.record().fieldName(index.column())
+        table = self.EDITABLE.get(column)
+        if table is None:
+            return False
+        row_id = self.data(self.index(index.row(), self.fieldIndex(ROW_ID_COLUMNS[table])))
+        if row_id is None:
+            logger.error(f"Edit of sleep_sessions.{column} refused: the night has no {table} entry")
+            return False
+        try:
+            value = validate_value(table, column, value)
+        except ValidationError as e:
+            logger.error(f"Edit of {table}.{column} refused: {e}")
+            return False
+        old = self.data(index, role)
+        query = QtSql.QSqlQuery(self.db)
+        query.prepare(f"UPDATE {table} SET {column} = ? WHERE id = ?")
+        query.addBindValue(value)
+        query.addBindValue(int(row_id))
+        if not query.exec():
+            logger.error(f"Error editing {table}.{column} - {query.lastError().text()}")
+            return False
+        self.select()
+        if old != value:
+            self.cellEdited.emit(table, int(row_id), column, old, value)
+        return True
+
+
+def create_and_set_model(table_name: str,
+                         view_widget: QAbstractItemView,
+                         db: QtSql.QSqlDatabase = None) -> QtSql.QSqlTableModel:
     """
     Creates and sets up a QSqlTableModel for the specified table name and view widget.
 
+    The model shows the live rows only and the view hides their deleted_at column. Filters set
+    later must keep LIVE_ROWS in them.
+
     Args:
         table_name (str): The name of the table to create the model for.
         view_widget (QAbstractItemView): The view widget to set the model on.
+        db (QSqlDatabase): The connection the model reads from; the default connection if omitted.
 
     Returns:
-        QSqlTableModel: The created QSqlTableModel.
+        RecordingTableModel: The created model.
 
     """
-    model = QtSql.QSqlTableModel()
+    model = RecordingTableModel(db=db) if db is not None else RecordingTableModel()
     model.setTable(table_name)
     model.setEditStrategy(QtSql.QSqlTableModel.EditStrategy.OnFieldChange)
+    model.setFilter(LIVE_ROWS)
 
     if not model.select():
         error_message = f"Error selecting data from table: {table_name}, {model.lastError().text()}"
@@ -27,4 +152,6 @@ def create_and_set_model(table_name: str, view_widget: QAbstractItemView) -> QtS
         raise RuntimeError(error_message)
 
     view_widget.setModel(model)
+    if isinstance(view_widget, QTableView):
+        view_widget.hideColumn(model.fieldIndex('deleted_at'))
     return model
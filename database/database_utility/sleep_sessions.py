@@ -0,0 +1,145 @@
+"""
+The sleep_sessions table: one row per night, consolidated from the four sleep tables.
+
+The sleep form writes a row to each of sleep_table, total_hours_slept_table, woke_up_like_table and
+sleep_quality_table (see table_specs.SLEEP_SESSION_TABLES), and those tables stay where entries are
+written, synced, edited and deleted. sleep_sessions is materialized from them: triggers on the four
+tables rebuild the session a changed row belongs to, so a night is always one indexed row to read.
+
+A session is the live rows sharing a sleep_session_id, or, for rows committed before session ids
+existed, the live rows of one sleep_date. Each session keeps the id of the row it took from every
+table, so the sleep page can delete or edit the underlying rows. sleep_date is taken as the
+morning the night ended: ended_at is that date at time_awake, started_at is duration_minutes before.
+"""
+from typing import List
+
+from database.table_specs import LIVE_ROWS, SLEEP_SESSION_TABLES
+
+SESSION_KEY = "COALESCE({row}sleep_session_id, 'legacy:' || {row}sleep_date)"
+
+# The row id column each of the sleep tables fills in a session
+ROW_ID_COLUMNS = {
+    'sleep_table': 'sleep_row_id',
+    'total_hours_slept_table': 'hours_row_id',
+    'woke_up_like_table': 'woke_row_id',
+    'sleep_quality_table': 'quality_row_id',
+}
+
+SESSION_COLUMNS = ('session_key', 'sleep_date', 'time_asleep', 'time_awake', 'started_at', 'ended_at',
+                   'duration_minutes', 'total_hours_slept', 'woke_up_like', 'sleep_quality',
+                   *ROW_ID_COLUMNS.values())
+
+
+def minutes_of(column: str) -> str:
+    return f"(CAST(substr({column}, 1, 2) AS INTEGER) * 60 + CAST(substr({column}, 4, 2) AS INTEGER))"
+
+
+# Minutes from time_asleep to time_awake, wrapping past midnight, as in sleep_calc
+SLEEP_MINUTES = (f"CASE WHEN s.time_asleep LIKE '__:__%' AND s.time_awake LIKE '__:__%' "
+                 f"THEN (({minutes_of('s.time_awake')} - {minutes_of('s.time_asleep')}) % 1440 + 1440) % 1440 END")
+# total_hours_slept is HH:mm, or hours with a fraction in rows from before it was validated
+HOURS_MINUTES = ("CASE WHEN instr(h.total_hours_slept, ':') > 0 "
+                 "THEN CAST(substr(h.total_hours_slept, 1, instr(h.total_hours_slept, ':') - 1) AS INTEGER) * 60"
+                 " + CAST(substr(h.total_hours_slept, instr(h.total_hours_slept, ':') + 1) AS INTEGER) "
+                 "ELSE CAST(round(CAST(h.total_hours_slept AS REAL) * 60) AS INTEGER) END")
+
+
+def session_select(keys_sql: str) -> str:
+    """
+    The SELECT building the sessions of the given keys from the sleep tables' live rows.
+
+    Every table's row is found through its session index, then read by id.
+
+    :param keys_sql: A SELECT of the session keys, as column 'key'.
+    :return: A SELECT of SESSION_COLUMNS.
+    """
+    row_ids = ',\n'.join(
+        f"(SELECT id FROM {table} WHERE {SESSION_KEY.format(row='')} = k.key AND {LIVE_ROWS} "
+        f"ORDER BY id DESC LIMIT 1) AS {column}"
+        for table, column in ROW_ID_COLUMNS.items())
+    duration = f"COALESCE({SLEEP_MINUTES}, {HOURS_MINUTES})"
+    ended_at = "datetime(r.sleep_date || ' ' || substr(s.time_awake, 1, 8))"
+    return f"""
+        SELECT r.key, r.sleep_date, s.time_asleep, s.time_awake,
+               datetime({ended_at}, '-' || {duration} || ' minutes'), {ended_at},
+               {duration}, h.total_hours_slept,
+               CAST(w.woke_up_like AS INTEGER), CAST(q.sleep_quality AS INTEGER),
+               r.sleep_row_id, r.hours_row_id, r.woke_row_id, r.quality_row_id
+        FROM (SELECT ids.*,
+                     COALESCE((SELECT sleep_date FROM sleep_table WHERE id = ids.sleep_row_id),
+                              (SELECT sleep_date FROM total_hours_slept_table WHERE id = ids.hours_row_id),
+                              (SELECT sleep_date FROM woke_up_like_table WHERE id = ids.woke_row_id),
+                              (SELECT sleep_date FROM sleep_quality_table WHERE id = ids.quality_row_id))
+                         AS sleep_date
+              FROM (SELECT k.key AS key, {row_ids} FROM ({keys_sql}) AS k) AS ids) AS r
+        LEFT JOIN sleep_table AS s ON s.id = r.sleep_row_id
+        LEFT JOIN total_hours_slept_table AS h ON h.id = r.hours_row_id
+        LEFT JOIN woke_up_like_table AS w ON w.id = r.woke_row_id
+        LEFT JOIN sleep_quality_table AS q ON q.id = r.quality_row_id
+        WHERE r.sleep_date IS NOT NULL"""
+
+
+def refresh_statements(keys: List[str]) -> List[str]:
+    """
+    :param keys: SQL expressions of the session keys to rebuild (in a trigger, from new or old).
+    :return: The statements dropping those sessions and building them again from the live rows.
+    """
+    keys_sql = ' UNION '.join(f"SELECT {key} AS key" for key in keys)
+    return [f"DELETE FROM sleep_sessions WHERE session_key IN ({', '.join(keys)})",
+            f"INSERT INTO sleep_sessions({', '.join(SESSION_COLUMNS)}) {session_select(keys_sql)}"]
+
+
+def sleep_session_statements() -> List[str]:
+    """
+    The DDL for sleep_sessions, its index, the sleep tables' session indexes and the triggers
+    keeping sessions current. Every statement is idempotent.
+
+    :return: The SQL statements, in order.
+    """
+    statements = [
+        """CREATE TABLE IF NOT EXISTS sleep_sessions (
+           id INTEGER PRIMARY KEY,
+           session_key TEXT NOT NULL UNIQUE,
+           sleep_date TEXT NOT NULL,
+           time_asleep TEXT,
+           time_awake TEXT,
+           started_at TEXT,
+           ended_at TEXT,
+           duration_minutes INTEGER,
+           total_hours_slept TEXT,
+           woke_up_like INTEGER,
+           sleep_quality INTEGER,
+           sleep_row_id INTEGER,
+           hours_row_id INTEGER,
+           woke_row_id INTEGER,
+           quality_row_id INTEGER
+           )""",
+        "CREATE INDEX IF NOT EXISTS sleep_sessions_date_idx ON sleep_sessions(sleep_date)",
+    ]
+    new_key, old_key = SESSION_KEY.format(row='new.'), SESSION_KEY.format(row='old.')
+    for table in SLEEP_SESSION_TABLES:
+        statements.append(f"CREATE INDEX IF NOT EXISTS {table}_session_idx "
+                          f"ON {table}({SESSION_KEY.format(row='')}, id) WHERE {LIVE_ROWS}")
+        for suffix, event, keys in (('ai', 'INSERT', [new_key]),
+                                    ('au', 'UPDATE', [old_key, new_key]),
+                                    ('ad', 'DELETE', [old_key])):
+            body = ';\n'.join(refresh_statements(keys))
+            statements.append(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_sessions_{suffix} AFTER {event} ON {table}
+                BEGIN
+                {body};
+                END""")
+    return statements
+
+
+def rebuild_statements() -> List[str]:
+    """
+    Rebuilds every session from the sleep tables in one pass, which is how sleep_sessions is first
+    filled from the rows committed before it existed.
+
+    :return: The SQL statements, in order.
+    """
+    keys_sql = ' UNION '.join(f"SELECT {SESSION_KEY.format(row='')} AS key FROM {table} WHERE {LIVE_ROWS}"
+                              for table in SLEEP_SESSION_TABLES)
+    return ["DELETE FROM sleep_sessions",
+            f"INSERT INTO sleep_sessions({', '.join(SESSION_COLUMNS)}) {session_select(keys_sql)}"]
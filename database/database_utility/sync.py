@@ -0,0 +1,322 @@
+import sqlite3
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
+
+from logger_setup import logger
+
+# Tables whose rows are replicated between devices
+SYNC_TABLES = (
+    'sleep_table',
+    'total_hours_slept_table',
+    'woke_up_like_table',
+    'sleep_quality_table',
+    'shower_table',
+    'exercise_table',
+    'tooth_table',
+    'diet_table',
+    'hydration_table',
+    'lily_diet_table',
+    'lily_mood_table',
+    'lily_walk_table',
+    'lily_in_room_table',
+    'lily_notes_table',
+    'lily_walk_notes_table',
+    'mental_mental_table',
+    'cspr_table',
+    'wefe_table',
+)
+# Pet ids differ between devices, so rows of these tables travel with the pet's name instead
+PET_ID_TABLES = (
+    'lily_diet_table',
+    'lily_mood_table',
+    'lily_walk_table',
+    'lily_in_room_table',
+    'lily_notes_table',
+    'lily_walk_notes_table',
+)
+
+# Hybrid logical clock: milliseconds since the epoch shifted left, with the low bits counting
+# changes within one millisecond. Taking the max with the newest logged HLC keeps the clock
+# monotonic and, because merged changes are logged with their own HLC, ahead of every peer seen.
+HLC_SHIFT = 16
+HLC_NOW = (f"max(CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER) << {HLC_SHIFT}, "
+           f"coalesce((SELECT max(hlc) FROM changelog), 0) + 1)")
+# While this sync_state key exists (inside a merge transaction) the changelog triggers stand aside
+APPLYING_KEY = 'applying'
+
+
+def changelog_statements(tables=SYNC_TABLES) -> List[str]:
+    """
+    The DDL for the change log, the sync bookkeeping tables and the capture triggers.
+
+    - changelog: one compact row per insert, update or delete on a tracker table; node is NULL for
+      changes made here and the author's node_id for changes merged from elsewhere.
+    - sync_state: this database's node_id.
+    - sync_rowmap: local row id of every row that was created on another device.
+    - sync_peers: how far into each peer's changelog this database has merged.
+
+    Every statement is idempotent.
+
+    :param tables: The tables to capture.
+    :return: The SQL statements, in order.
+    """
+    statements = [
+        """CREATE TABLE IF NOT EXISTS changelog (
+           seq INTEGER PRIMARY KEY,
+           tbl TEXT NOT NULL,
+           row_id INTEGER NOT NULL,
+           op TEXT NOT NULL CHECK (op IN ('I', 'U', 'D')),
+           hlc INTEGER NOT NULL,
+           node TEXT
+           )""",
+        "CREATE INDEX IF NOT EXISTS changelog_row_idx ON changelog(tbl, row_id, hlc)",
+        "CREATE INDEX IF NOT EXISTS changelog_hlc_idx ON changelog(hlc)",
+        "CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID",
+        "INSERT OR IGNORE INTO sync_state(key, value) VALUES ('node_id', lower(hex(randomblob(8))))",
+        """CREATE TABLE IF NOT EXISTS sync_rowmap (
+           tbl TEXT NOT NULL,
+           row_id INTEGER NOT NULL,
+           origin TEXT NOT NULL,
+           origin_row_id INTEGER NOT NULL,
+           PRIMARY KEY (tbl, origin, origin_row_id)
+           ) WITHOUT ROWID""",
+        "CREATE UNIQUE INDEX IF NOT EXISTS sync_rowmap_local_idx ON sync_rowmap(tbl, row_id)",
+        """CREATE TABLE IF NOT EXISTS sync_peers (
+           peer_id TEXT PRIMARY KEY,
+           pulled_seq INTEGER NOT NULL DEFAULT 0,
+           synced_at TEXT
+           ) WITHOUT ROWID""",
+    ]
+    when = f"WHEN NOT EXISTS (SELECT 1 FROM sync_state WHERE key = '{APPLYING_KEY}')"
+    for table in tables:
+        for suffix, event, op, row in (('ai', 'INSERT', 'I', 'new'),
+                                       ('au', 'UPDATE', 'U', 'new'),
+                                       ('ad', 'DELETE', 'D', 'old')):
+            statements.append(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_changelog_{suffix} AFTER {event} ON {table} {when}
+                BEGIN
+                INSERT INTO changelog(tbl, row_id, op, hlc) VALUES ('{table}', {row}.id, '{op}', {HLC_NOW});
+                END""")
+    return statements
+
+
+def changelog_backfill_statements(tables=SYNC_TABLES) -> List[str]:
+    """
+    Logs every existing row as an insert, so rows from before the change log was set up sync too.
+
+    :param tables: The captured tables.
+    :return: One INSERT ... SELECT per table.
+    """
+    now = f"(CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER) << {HLC_SHIFT})"
+    return [f"INSERT INTO changelog(tbl, row_id, op, hlc) SELECT '{table}', id, 'I', {now} FROM {table}"
+            for table in tables]
+
+
+def table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (table,)).fetchone() is not None
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def node_id(conn: sqlite3.Connection) -> str:
+    return conn.execute("SELECT value FROM sync_state WHERE key = 'node_id'").fetchone()[0]
+
+
+def ensure_sync_schema(conn: sqlite3.Connection, template: sqlite3.Connection) -> None:
+    """
+    Prepares a database to take part in a sync.
+
+    Tracker tables it lacks are created from the template database's schema, so an empty file can
+    serve as a stand-in server that devices sync through; then the change log is set up.
+
+    :param conn: The database to prepare.
+    :param template: A tracker database to copy missing table definitions from.
+    """
+    for table in SYNC_TABLES + ('pets',):
+        if not table_exists(conn, table):
+            row = template.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                   (table,)).fetchone()
+            if row is not None:
+                conn.execute(row[0])
+    is_new = not table_exists(conn, 'changelog')
+    tables = [table for table in SYNC_TABLES if table_exists(conn, table)]
+    for statement in changelog_statements(tables):
+        conn.execute(statement)
+    if is_new:
+        for statement in changelog_backfill_statements(tables):
+            conn.execute(statement)
+    conn.commit()
+
+
+def export_changes(conn: sqlite3.Connection,
+                   since_seq: int,
+                   for_node: Optional[str] = None) -> Tuple[List[dict], int]:
+    """
+    Collects the changes logged after a watermark, one per row, with the row's current values.
+
+    Only changelog rows past the watermark are read (by primary key), and each changed row is
+    fetched by id, so the cost follows the number of changes, not the size of the database.
+
+    :param conn: The database to read.
+    :param since_seq: The changelog seq already merged by the reader.
+    :param for_node: The reader's node_id; changes that came from the reader are left out, so they
+        don't echo back to where they were made.
+    :return: (changes, the newest seq read). A change is a dict with tbl, origin, origin_row_id,
+        op, hlc, node (its author) and values (column -> value, None for deletes).
+    """
+    local_node = node_id(conn)
+    latest: Dict[Tuple[str, int], tuple] = {}
+    last_seq = conn.execute("SELECT coalesce(max(seq), 0) FROM changelog").fetchone()[0]
+    for seq, tbl, row_id, op, hlc, author, origin, origin_row_id in conn.execute(
+            """SELECT c.seq, c.tbl, c.row_id, c.op, c.hlc, c.node, m.origin, m.origin_row_id
+               FROM changelog c
+               LEFT JOIN sync_rowmap m ON m.tbl = c.tbl AND m.row_id = c.row_id
+               WHERE c.seq > ? AND c.seq <= ? AND c.node IS NOT ?
+               ORDER BY c.seq""", (since_seq, last_seq, for_node or '')):
+        key = (tbl, row_id)
+        if key not in latest or hlc >= latest[key][1]:
+            latest[key] = (op, hlc, author or local_node, origin or local_node, origin_row_id or row_id)
+
+    pet_names = dict(conn.execute("SELECT id, pet_name FROM pets")) if table_exists(conn, 'pets') else {}
+    changes = []
+    for (tbl, row_id), (op, hlc, author, origin, origin_row_id) in latest.items():
+        values = None
+        if op != 'D':
+            cursor = conn.execute(f"SELECT * FROM {tbl} WHERE id = ?", (row_id,))
+            row = cursor.fetchone()
+            if row is None:
+                op = 'D'
+            else:
+                values = {column[0]: value for column, value in zip(cursor.description, row)
+                          if column[0] != 'id'}
+                if tbl in PET_ID_TABLES and 'pet_id' in values:
+                    values['pet_id'] = pet_names.get(values['pet_id'], values['pet_id'])
+        changes.append({'tbl': tbl, 'origin': origin, 'origin_row_id': origin_row_id,
+                        'op': op, 'hlc': hlc, 'node': author, 'values': values})
+    return changes, last_seq
+
+
+def local_pet_id(conn: sqlite3.Connection, pet_name) -> Optional[int]:
+    if not isinstance(pet_name, str):
+        return pet_name
+    conn.execute("INSERT OR IGNORE INTO pets(pet_name) VALUES (?)", (pet_name,))
+    return conn.execute("SELECT id FROM pets WHERE pet_name = ?", (pet_name,)).fetchone()[0]
+
+
+def apply_changes(conn: sqlite3.Connection, changes: List[dict]) -> int:
+    """
+    Merges changes into a database, last writer wins.
+
+    A change is applied only if its HLC is newer than the newest change logged for the same row
+    here. Applied changes are logged with their original HLC, which both moves this database's
+    clock past the peer's and lets the change travel on to further devices. The caller commits.
+
+    :param conn: The database to merge into, inside a transaction.
+    :param changes: Changes from export_changes.
+    :return: The number of changes applied.
+    """
+    local_node = node_id(conn)
+    columns_of: Dict[str, List[str]] = {}
+    applied = 0
+    conn.execute("INSERT OR REPLACE INTO sync_state(key, value) VALUES (?, '1')", (APPLYING_KEY,))
+    try:
+        for change in changes:
+            tbl = change['tbl']
+            if tbl not in SYNC_TABLES or not table_exists(conn, tbl):
+                continue
+            if change['origin'] == local_node:
+                row_id = change['origin_row_id']
+            else:
+                found = conn.execute("SELECT row_id FROM sync_rowmap WHERE tbl = ? AND origin = ? "
+                                     "AND origin_row_id = ?",
+                                     (tbl, change['origin'], change['origin_row_id'])).fetchone()
+                row_id = found[0] if found else None
+            if row_id is not None:
+                newest = conn.execute("SELECT max(hlc) FROM changelog WHERE tbl = ? AND row_id = ?",
+                                      (tbl, row_id)).fetchone()[0]
+                if newest is not None and newest >= change['hlc']:
+                    continue
+
+            if change['op'] == 'D':
+                if row_id is None:
+                    continue
+                conn.execute(f"DELETE FROM {tbl} WHERE id = ?", (row_id,))
+                op = 'D'
+            else:
+                if tbl not in columns_of:
+                    columns_of[tbl] = [c for c in table_columns(conn, tbl) if c != 'id']
+                values = {c: v for c, v in change['values'].items() if c in columns_of[tbl]}
+                if tbl in PET_ID_TABLES and 'pet_id' in values:
+                    values['pet_id'] = local_pet_id(conn, values['pet_id'])
+                exists = row_id is not None and conn.execute(
+                    f"SELECT 1 FROM {tbl} WHERE id = ?", (row_id,)).fetchone() is not None
+                if exists:
+                    conn.execute(f"UPDATE {tbl} SET {', '.join(f'{c} = ?' for c in values)} WHERE id = ?",
+                                 [*values.values(), row_id])
+                    op = 'U'
+                else:
+                    # A row of our own coming back keeps its id (AUTOINCREMENT never reuses it)
+                    if change['origin'] == local_node:
+                        values = {'id': change['origin_row_id'], **values}
+                    cursor = conn.execute(f"INSERT INTO {tbl}({', '.join(values)}) "
+                                          f"VALUES ({', '.join('?' for _ in values)})", list(values.values()))
+                    row_id = cursor.lastrowid
+                    op = 'I'
+                    if change['origin'] != local_node:
+                        conn.execute("INSERT OR REPLACE INTO sync_rowmap(tbl, row_id, origin, origin_row_id) "
+                                     "VALUES (?, ?, ?, ?)",
+                                     (tbl, row_id, change['origin'], change['origin_row_id']))
+            conn.execute("INSERT INTO changelog(tbl, row_id, op, hlc, node) VALUES (?, ?, ?, ?, ?)",
+                         (tbl, row_id, op, change['hlc'], change['node']))
+            applied += 1
+    finally:
+        conn.execute("DELETE FROM sync_state WHERE key = ?", (APPLYING_KEY,))
+    return applied
+
+
+def pull(source: sqlite3.Connection, target: sqlite3.Connection) -> int:
+    """
+    Merges into target every change source has logged since target last pulled from it, and moves
+    target's watermark for source forward, in one transaction on target.
+
+    :return: The number of changes applied.
+    """
+    source_node = node_id(source)
+    row = target.execute("SELECT pulled_seq FROM sync_peers WHERE peer_id = ?", (source_node,)).fetchone()
+    changes, last_seq = export_changes(source, row[0] if row else 0, node_id(target))
+    try:
+        applied = apply_changes(target, changes)
+        target.execute("""INSERT INTO sync_peers(peer_id, pulled_seq, synced_at)
+                          VALUES (?, ?, datetime('now', 'localtime'))
+                          ON CONFLICT(peer_id) DO UPDATE SET
+                          pulled_seq = excluded.pulled_seq, synced_at = excluded.synced_at""",
+                       (source_node, last_seq))
+        target.commit()
+    except sqlite3.Error:
+        target.rollback()
+        raise
+    return applied
+
+
+def sync_databases(db_path: str, peer_path: str) -> Dict[str, int]:
+    """
+    Two-way sync between this device's database and another database file; runs in a worker thread.
+
+    The peer can be another device's database (e.g. on a shared drive) or any file used as a
+    stand-in server that every device syncs with; a new file is set up on first use.
+
+    :param db_path: This device's database.
+    :param peer_path: The other database file.
+    :return: {'pulled': changes merged here, 'pushed': changes merged into the peer}.
+    """
+    with closing(sqlite3.connect(db_path, timeout=30)) as local, \
+            closing(sqlite3.connect(peer_path, timeout=30)) as peer:
+        ensure_sync_schema(local, local)
+        ensure_sync_schema(peer, local)
+        pulled = pull(peer, local)
+        pushed = pull(local, peer)
+    logger.info(f"Synced {db_path} with {peer_path}: pulled {pulled}, pushed {pushed}")
+    return {'pulled': pulled, 'pushed': pushed}
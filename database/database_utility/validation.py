@@ -0,0 +1,278 @@
+"""
+Checking and normalizing tracker entries before they are inserted.
+
+The rules come from table_specs: each entry column's type and default, COLUMN_RANGES and
+COLUMN_FORMATS, plus the table's date and time columns. Each value goes through its column's
+converter, which normalizes it (hh:mm gets :00, 7.5 hours becomes 07:30) or names the problem.
+A batch of several entries is first checked a column at a time with NumPy (see batch_validation),
+so only the values its masks reject reach the converters, and its duplicates are found there too.
+NumPy is imported for batches only; a single row, as the command line and the forms commit, is
+checked in plain Python. Every problem in the batch is collected into one ValidationError, so a
+bad batch is reported in full and never reaches SQLite.
+"""
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from database.table_specs import COLUMN_FORMATS, COLUMN_RANGES, LIVE_ROWS, TABLE_SPECS
+
+# Fields an entry may carry besides its columns, resolved to pet_id when the row is built
+PET_FIELDS = ('pet', 'pet_id')
+MAX_REPORTED_ERRORS = 10
+
+
+class ValidationError(ValueError):
+    """
+    Raised for entries that fail validation.
+
+    Attributes:
+        errors (List[Tuple[int, str]]): (the entry's index in its batch, the problem), in batch order.
+    """
+
+    def __init__(self, errors: List[Tuple[int, str]], batch_size: int = 1) -> None:
+        self.errors = sorted(errors)
+        if batch_size == 1:
+            lines = [message for _, message in self.errors[:MAX_REPORTED_ERRORS]]
+        else:
+            lines = [f"entry {index + 1}: {message}" for index, message in self.errors[:MAX_REPORTED_ERRORS]]
+        if len(self.errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"and {len(self.errors) - MAX_REPORTED_ERRORS} more")
+        super().__init__('; '.join(lines))
+
+
+def whole_number(value: Any) -> int:
+    """
+    :param value: An int, an integral float, or text holding either.
+    :return: The value as an int.
+    :raises ValueError: If it isn't a whole number.
+    """
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise ValueError(f"must be a whole number, got {value!r}")
+
+
+def to_date(value: Any) -> str:
+    try:
+        return date.fromisoformat(str(value).strip()).isoformat()
+    except ValueError:
+        raise ValueError(f"must be a date as yyyy-MM-dd, got {value!r}")
+
+
+def to_time(value: Any) -> str:
+    """
+    :return: The time as hh:mm:ss; hh:mm is accepted and gets :00.
+    """
+    parts = str(value).strip().split(':')
+    try:
+        if len(parts) not in (2, 3):
+            raise ValueError
+        hours, minutes, seconds = (int(part) for part in parts + ['0'] * (3 - len(parts)))
+        if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"must be a time as hh:mm:ss, got {value!r}")
+    return f"{hours:02}:{minutes:02}:{seconds:02}"
+
+
+def to_duration(value: Any) -> str:
+    """
+    :return: The duration as HH:mm, under a day; hours with a fraction (7.5) are accepted too.
+    """
+    text = str(value).strip()
+    try:
+        if ':' in text:
+            hours, minutes = text.split(':')
+            total = int(hours) * 60 + int(minutes)
+            if not 0 <= int(minutes) < 60:
+                raise ValueError
+        else:
+            total = round(float(text) * 60)
+        if not 0 <= total < 24 * 60:
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"must be a duration under a day as HH:mm, got {value!r}")
+    return f"{total // 60:02}:{total % 60:02}"
+
+
+def ranged(low: int, high: int, as_text: bool = False) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        number = whole_number(value)
+        if not low <= number <= high:
+            raise ValueError(f"must be from {low} to {high}, got {number}")
+        return str(number) if as_text else number
+    convert.bounds = (low, high, as_text)
+    return convert
+
+
+def text(required: bool) -> Callable[[Any], str]:
+    def convert(value: Any) -> str:
+        value = str(value).strip()
+        if required and not value:
+            raise ValueError("can't be blank")
+        return value
+    return convert
+
+
+FORMATS = {'time': to_time, 'duration': to_duration}
+
+@lru_cache(maxsize=None)
+def column_rules(table: str) -> Tuple[Tuple[str, Callable[[Any], Any], Any], ...]:
+    """
+    :param table: A key of TABLE_SPECS.
+    :return: (column, converter, default) for the date, time and entry columns, in insert order.
+        A default of None means the column is required; date and time default to now.
+    """
+    date_column, time_column, columns = TABLE_SPECS[table]
+    rules = [(date_column, to_date, date.today)]
+    if time_column:
+        rules.append((time_column, to_time, lambda: datetime.now().strftime('%H:%M:%S')))
+    for name, kind, default in columns:
+        if name in COLUMN_RANGES:
+            convert = ranged(*COLUMN_RANGES[name], as_text=kind is str)
+        elif name in COLUMN_FORMATS:
+            convert = FORMATS[COLUMN_FORMATS[name]]
+        elif kind is int:
+            convert = whole_number
+        else:
+            convert = text(required=default is None)
+        rules.append((name, convert, default))
+    return tuple(rules)
+
+
+def convert_column(name: str, convert: Callable[[Any], Any], default: Any,
+                   values: List[Any], errors: List[Tuple[int, str]]) -> List[Any]:
+    """
+    Checks one column of a batch: in a batch of several entries, the column's vector_pass, then
+    its converter on the values that pass doesn't accept.
+
+    :param values: The column's value in each entry, None where it is missing.
+    :param errors: Collects (index, problem) for the values that fail.
+    :return: The converted values, None where they failed.
+    """
+    if default is not None and None in values:
+        fill = default() if callable(default) else default
+        values = [fill if value is None else value for value in values]
+    checked = None
+    if len(values) > 1:
+        from database.database_utility.batch_validation import vector_pass
+        checked = vector_pass(convert, values)
+    if checked is not None:
+        rest, converted = checked
+    else:
+        converted, rest = list(values), range(len(values))
+    for index in rest:
+        value = values[index]
+        if value is None:
+            errors.append((index, f"{name} is required"))
+            converted[index] = None
+            continue
+        try:
+            converted[index] = convert(value)
+        except ValueError as e:
+            errors.append((index, f"{name} {e}"))
+            converted[index] = None
+    return converted
+
+
+def validate_entries(table: str, entries: Sequence[Dict]) -> List[Dict]:
+    """
+    Checks and normalizes a batch of entries for one table.
+
+    Missing dates and times become now and missing optional columns take their default. Entries
+    that repeat an earlier entry of the batch are reported as duplicates.
+
+    :param table: A key of TABLE_SPECS.
+    :param entries: Each entry's fields: column name -> value, and optionally 'pet' or 'pet_id'.
+    :return: The entries' columns, normalized, with any pet fields passed through.
+    :raises ValidationError: Listing every problem in the batch.
+    """
+    rules = column_rules(table)
+    known = {name for name, _, _ in rules} | set(PET_FIELDS)
+    errors: List[Tuple[int, str]] = []
+    for index, fields in enumerate(entries):
+        unknown = set(fields) - known
+        if unknown:
+            errors.append((index, f"{table} has no column {', '.join(sorted(map(str, unknown)))}"))
+
+    columns = {name: convert_column(name, convert, default, [fields.get(name) for fields in entries], errors)
+               for name, convert, default in rules}
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    for row, fields in zip(rows, entries):
+        row.update((name, fields[name]) for name in PET_FIELDS if fields.get(name) is not None)
+
+    invalid = {index for index, _ in errors}
+    valid = [index for index in range(len(rows)) if index not in invalid]
+    if len(valid) > 1:
+        from database.database_utility.batch_validation import duplicate_rows
+        fields = [columns[name] for name in columns]
+        fields += [[entry.get(name) for entry in entries] for name in PET_FIELDS]
+        for index, first in duplicate_rows(fields, valid):
+            errors.append((index, f"duplicates entry {first + 1}"))
+    if errors:
+        raise ValidationError(errors, len(entries))
+    return rows
+
+
+def validate_values(table: str, values: Sequence[Any]) -> List[Any]:
+    """
+    Checks and normalizes one row's values given in insert_columns order. Values past the date,
+    time and entry columns (the derived columns) are passed through.
+
+    :raises ValidationError: Listing the row's problems.
+    """
+    names = [name for name, _, _ in column_rules(table)]
+    row = validate_entries(table, [dict(zip(names, values))])[0]
+    return [row[name] for name in names] + list(values[len(names):])
+
+
+def validate_value(table: str, column: str, value: Any) -> Any:
+    """
+    Checks and normalizes one column's new value, as for an edit. Columns without a rule (id,
+    pet_id, the derived columns) are passed through.
+
+    :raises ValidationError: If the value is invalid.
+    """
+    for name, convert, default in column_rules(table):
+        if name == column:
+            errors: List[Tuple[int, str]] = []
+            value = convert_column(name, convert, None, [value], errors)[0]
+            if errors:
+                raise ValidationError(errors)
+            break
+    return value
+
+
+def reject_stored(conn: sqlite3.Connection, table: str, rows: Sequence[Dict]) -> None:
+    """
+    Refuses rows that are already stored as live entries, with one query for the whole batch.
+
+    :param conn: An open connection.
+    :param table: A key of TABLE_SPECS.
+    :param rows: Built rows (see entries.build_row), with pet_id resolved for the pet tables.
+    :raises ValidationError: Listing the rows already stored.
+    """
+    if not rows:
+        return
+    names = [name for name, _, _ in column_rules(table)]
+    if 'pet_id' in rows[0]:
+        names.append('pet_id')
+    date_column = names[0]
+    dates = [row[date_column] for row in rows]
+    stored = set(conn.execute(f"SELECT {', '.join(names)} FROM {table} "
+                              f"WHERE {LIVE_ROWS} AND {date_column} BETWEEN ? AND ?",
+                              (min(dates), max(dates))))
+    errors = [(index, f"{table} already has this entry") for index, row in enumerate(rows)
+              if tuple(row[name] for name in names) in stored]
+    if errors:
+        raise ValidationError(errors, len(rows))
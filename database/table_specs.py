@@ -0,0 +1,180 @@
+from typing import Tuple
+
+import tracker_config as tkc
+
+# What each tracker table holds, without any Qt, for code that works on the database directly.
+# table: (date column, time column or None, entry columns)
+# Entry columns are (name, type, default) in insert order; a default of None means the value is
+# required. Columns filled in by the code that inserts (sleep_minutes, summing_box, pet_id) are
+# left out.
+TABLE_SPECS = {
+    'sleep_table': ('sleep_date', None, (
+        ('time_asleep', str, None),
+        ('time_awake', str, None),
+    )),
+    'total_hours_slept_table': ('sleep_date', None, (
+        ('total_hours_slept', str, None),
+    )),
+    'woke_up_like_table': ('sleep_date', None, (
+        ('woke_up_like', str, None),
+    )),
+    'sleep_quality_table': ('sleep_date', None, (
+        ('sleep_quality', str, None),
+    )),
+    'shower_table': ('basics_date', 'basics_time', (
+        ('shower_check', int, 1),
+    )),
+    'exercise_table': ('basics_date', 'basics_time', (
+        ('exerc_check', int, 1),
+    )),
+    'tooth_table': ('basics_date', 'basics_time', (
+        ('tooth_check', int, 1),
+    )),
+    'diet_table': ('diet_date', 'diet_time', (
+        ('food_eaten', str, None),
+        ('calories', int, 0),
+    )),
+    'hydration_table': ('diet_date', 'diet_time', (
+        ('hydration', int, None),
+    )),
+    'lily_diet_table': ('lily_date', 'lily_time', ()),
+    'lily_mood_table': ('lily_date', 'lily_time', (
+        ('lily_mood_slider', int, None),
+        ('lily_mood_activity_slider', int, None),
+        ('lily_energy_slider', int, None),
+    )),
+    'lily_walk_table': ('lily_date', 'lily_time', (
+        ('lily_behavior', int, None),
+        ('lily_gait', int, None),
+    )),
+    'lily_in_room_table': ('lily_date', 'lily_time', (
+        ('time_in_room_slider', int, None),
+    )),
+    'lily_notes_table': ('lily_date', 'lily_time', (
+        ('lily_notes', str, None),
+    )),
+    'lily_walk_notes_table': ('lily_date', 'lily_time', (
+        ('lily_walk_note', str, None),
+    )),
+    'mental_mental_table': ('mental_mental_date', 'mental_mental_time', (
+        ('mood_slider', int, None),
+        ('mania_slider', int, None),
+        ('depression_slider', int, None),
+        ('mixed_risk_slider', int, None),
+    )),
+    'cspr_table': ('cspr_date', 'cspr_time', (
+        ('calm_slider', int, None),
+        ('stress_slider', int, None),
+        ('pain_slider', int, None),
+        ('rage_slider', int, None),
+    )),
+    'wefe_table': ('wefe_date', 'wefe_time', (
+        ('wellbeing_slider', int, None),
+        ('excite_slider', int, None),
+        ('focus_slider', int, None),
+        ('energy_slider', int, None),
+    )),
+}
+
+# The sleep form's tables. One commit of the form writes a row to each, sharing a sleep_session_id
+SLEEP_SESSION_TABLES = ('sleep_table', 'total_hours_slept_table', 'woke_up_like_table', 'sleep_quality_table')
+
+# Columns filled in by the code that inserts, bound after the entry columns
+DERIVED_COLUMNS = {
+    'sleep_table': ('sleep_minutes', 'sleep_session_id'),
+    'total_hours_slept_table': ('sleep_session_id',),
+    'woke_up_like_table': ('sleep_session_id',),
+    'sleep_quality_table': ('sleep_session_id',),
+    'wefe_table': ('summing_box',),
+    'lily_diet_table': ('pet_id',),
+    'lily_mood_table': ('pet_id',),
+    'lily_walk_table': ('pet_id',),
+    'lily_in_room_table': ('pet_id',),
+    'lily_notes_table': ('pet_id',),
+    'lily_walk_notes_table': ('pet_id',),
+}
+
+# What the entry columns accept, checked before a row reaches the database (see
+# database_utility.validation). Whole-number columns take (minimum, maximum), matching the widgets
+# that enter them; sleep_quality and woke_up_like keep their spin box's number as text. Text
+# columns with a set form name it: 'time' is hh:mm:ss, 'duration' is HH:mm. Date and time columns
+# are always checked, and other text only has to be non-blank when it is required.
+COLUMN_RANGES = {
+    'sleep_quality': (0, 10),
+    'woke_up_like': (0, 10),
+    'shower_check': (0, 1),
+    'exerc_check': (0, 1),
+    'tooth_check': (0, 1),
+    'calories': (0, 2000),
+    'hydration': (1, 128),
+    'lily_mood_slider': (0, 10),
+    'lily_mood_activity_slider': (0, 10),
+    'lily_energy_slider': (0, 10),
+    'lily_behavior': (0, 100),
+    'lily_gait': (0, 100),
+    'time_in_room_slider': (0, 100),
+    **{name: (0, tkc.MIND_SLIDER_MAX)
+       for table in ('mental_mental_table', 'cspr_table', 'wefe_table')
+       for name, _, _ in TABLE_SPECS[table][2]},
+}
+COLUMN_FORMATS = {
+    'time_asleep': 'time',
+    'time_awake': 'time',
+    'total_hours_slept': 'duration',
+}
+
+# Deleting a row only stamps its deleted_at; maintenance purges it later. Everything that reads
+# the tracker tables selects the live rows only.
+LIVE_ROWS = "deleted_at IS NULL"
+
+# Stamped into PRAGMA user_version once DataManager has set the schema up. Raise it with every
+# schema change, so code that opens the file without DataManager knows to migrate it first.
+SCHEMA_VERSION = 1
+
+# The pet the pet tables' rows belong to when no pet is given. The tables keep their lily_ names
+# from when Lily was the only pet.
+DEFAULT_PET_ID = 1
+DEFAULT_PET_NAME = 'Lily'
+
+# The pet tables are shared by every pet; rows carry the pet's id from the pets table.
+PET_TABLES = (
+    'lily_diet_table',
+    'lily_mood_table',
+    'lily_walk_table',
+    'lily_in_room_table',
+    'lily_notes_table',
+    'lily_walk_notes_table',
+)
+
+
+def insert_columns(table: str) -> Tuple[str, ...]:
+    """
+    :param table: A key of TABLE_SPECS.
+    :return: The columns an insert binds, in order: date, time, entry columns, derived columns.
+    """
+    date_column, time_column, columns = TABLE_SPECS[table]
+    return ((date_column,) + ((time_column,) if time_column else ())
+            + tuple(name for name, _, _ in columns) + DERIVED_COLUMNS.get(table, ()))
+
+
+# Short names for the tables, used by the command line and the local API
+TABLE_ALIASES = {
+    'sleep': 'sleep_table',
+    'hours-slept': 'total_hours_slept_table',
+    'woke-up': 'woke_up_like_table',
+    'sleep-quality': 'sleep_quality_table',
+    'shower': 'shower_table',
+    'exercise': 'exercise_table',
+    'teeth': 'tooth_table',
+    'diet': 'diet_table',
+    'hydration': 'hydration_table',
+    'pet-diet': 'lily_diet_table',
+    'pet-mood': 'lily_mood_table',
+    'walk': 'lily_walk_table',
+    'in-room': 'lily_in_room_table',
+    'pet-note': 'lily_notes_table',
+    'walk-note': 'lily_walk_notes_table',
+    'mood': 'mental_mental_table',
+    'cspr': 'cspr_table',
+    'wefe': 'wefe_table',
+}
@@ -0,0 +1,168 @@
+"""
+Command line for logging and querying the tracker without starting the GUI.
+
+    python -m fullfucker log hydration 16
+    python -m fullfucker log walk 7 8 --pet Lily
+    python -m fullfucker log sleep 23:30 07:15 --date 2026-10-18
+    python -m fullfucker query sleep --since 2026-10-01
+    python -m fullfucker query hydration --since 2026-10-01 --json
+    python -m fullfucker serve
+
+It talks to the database with sqlite3 and never imports QtWidgets, QtSql or the generated UI (only
+logging sleep loads QtCore, for the shared duration calculation), so it starts in milliseconds.
+The database's triggers (search index, food catalog, change log) keep everything else in step
+exactly as for entries made in the app. 'serve' runs the local HTTP API (see
+utility.app_operations.local_api) in the foreground until interrupted.
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from typing import List, Optional
+
+# Before logger_setup is imported: its basicConfig then leaves the app's log file alone
+logging.basicConfig(level=logging.WARNING, stream=sys.stderr, format='%(levelname)s: %(message)s')
+
+import tracker_config as tkc  # noqa: E402
+from database.database_utility.db_paths import profile_db_path, profile_key  # noqa: E402
+from database.database_utility.entries import build_row, entries_query, insert_row, pet_id_for  # noqa: E402
+from database.database_utility.validation import reject_stored  # noqa: E402
+from database.table_specs import SCHEMA_VERSION, TABLE_ALIASES, TABLE_SPECS  # noqa: E402
+
+
+def open_database(profile: str) -> sqlite3.Connection:
+    """
+    Opens a profile's database, creating or migrating it with the app's DataManager when its
+    schema is older than SCHEMA_VERSION (or it doesn't exist yet).
+
+    Setting the schema up is the one case that loads QtSql, as the schema lives in DataManager.
+
+    :param profile: The profile name.
+    :return: An open connection.
+    """
+    db_path = profile_db_path(profile_key(profile) or tkc.DEFAULT_PROFILE)
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        from PyQt6.QtCore import QCoreApplication
+        from database.database_manager import DataManager
+        app = QCoreApplication.instance() or QCoreApplication([])  # noqa: F841
+        DataManager(db_path, connection_name='cli').close()
+    return conn
+
+
+def log_entry(conn: sqlite3.Connection, args: argparse.Namespace) -> int:
+    """
+    Inserts one entry from the log command's arguments.
+
+    :return: The new row's id.
+    """
+    table = TABLE_ALIASES[args.table]
+    columns = TABLE_SPECS[table][2]
+    if len(args.values) > len(columns):
+        raise SystemExit(f"{args.table} takes at most {len(columns)} values: "
+                         f"{' '.join(name for name, _, _ in columns)}")
+    fields = {name: value for (name, _, _), value in zip(columns, args.values)}
+    date_column, time_column, _ = TABLE_SPECS[table]
+    fields[date_column] = args.date
+    if time_column:
+        fields[time_column] = args.time
+    fields['pet'] = args.pet
+    try:
+        row = build_row(conn, table, fields)
+        reject_stored(conn, table, [row])
+    except ValueError as e:
+        raise SystemExit(str(e))
+    with conn:
+        return insert_row(conn, table, row)
+
+
+def query_entries(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    """
+    Prints a table's entries in a date range, oldest first, as tab-separated text or JSON lines.
+    """
+    table = TABLE_ALIASES[args.table]
+    try:
+        pet_id = pet_id_for(conn, args.pet) if args.pet else None
+    except ValueError as e:
+        raise SystemExit(str(e))
+    sql, params = entries_query(table, args.since, args.until, pet_id, args.limit)
+    cursor = conn.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    if not args.json:
+        print('\t'.join(columns))
+    for row in cursor:
+        if args.json:
+            print(json.dumps(dict(zip(columns, row))))
+        else:
+            print('\t'.join('' if value is None else str(value) for value in row))
+
+
+def serve_api(conn: sqlite3.Connection, port: int) -> int:
+    """
+    Serves the local API on the profile's database until interrupted.
+
+    :return: The exit status.
+    """
+    from utility.app_operations.local_api import LocalApiServer
+    db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+    server = LocalApiServer(db_path, port)
+    if not server.start():
+        print(f"Could not listen on {tkc.API_HOST}:{port}", file=sys.stderr)
+        return 1
+    print(f"Serving {db_path} on http://{tkc.API_HOST}:{server.port}", file=sys.stderr)
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='fullfucker', description="Log and query the tracker.")
+    parser.add_argument('--profile', default=tkc.DEFAULT_PROFILE, help="profile to use")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    log = commands.add_parser('log', help="add an entry")
+    log.add_argument('table', choices=TABLE_ALIASES)
+    log.add_argument('values', nargs='*', help="the entry's values, in column order")
+    log.add_argument('--date', help="yyyy-MM-dd, default today")
+    log.add_argument('--time', help="hh:mm:ss, default now")
+    log.add_argument('--pet', help="pet name for the pet tables, default Lily")
+
+    query = commands.add_parser('query', help="print entries")
+    query.add_argument('table', choices=TABLE_ALIASES)
+    query.add_argument('--since', help="first date, yyyy-MM-dd")
+    query.add_argument('--until', help="last date, yyyy-MM-dd")
+    query.add_argument('--pet', help="only this pet's entries")
+    query.add_argument('--limit', type=int)
+    query.add_argument('--json', action='store_true', help="one JSON object per line")
+
+    serve = commands.add_parser('serve', help="run the local HTTP API")
+    serve.add_argument('--port', type=int, default=tkc.API_PORT)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        with closing(open_database(args.profile)) as conn:
+            if args.command == 'serve':
+                return serve_api(conn, args.port)
+            if args.command == 'log':
+                print(log_entry(conn, args))
+            else:
+                query_entries(conn, args)
+    except sqlite3.Error as e:
+        print(f"Database error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,6 +10,47 @@ DATEFORMAT = '%d-%b-%y %I:%M:%S %p'  # this is how you want it from now on lolol
 FILE_MODE = 'w'
 # database
 DB_NAME = 'the_one_and_only_babababy_june17.db'
+# profiles
+DEFAULT_PROFILE = 'default'  # uses DB_NAME in the home directory
+PROFILES_DIR_NAME = 'profiles'  # other profiles' databases, inside the PRINGLES directory
+# theming
+THEME = 'dusk'  # default theme, a key of utility.app_operations.theme.THEMES
+# mind tracker
+MIND_SLIDER_MAX = 10
+MIND_PAGE_SIZE = 50  # rows per page in the mind data views
+# analytics
+HYDRATION_GOAL_OZ = 64  # daily water goal, ounces
+TRENDS_DAYS = 365  # how far back the trends summary looks
+REPORT_CACHE_SECTIONS = 64  # rendered report sections kept for reuse while their data is unchanged
+COMMIT_REPEAT_WINDOW_SECONDS = 2.0  # the same entry committed again this soon is a double click, 0 allows it
+# backups
+BACKUP_DIR_NAME = 'backups'  # inside the PRINGLES directory
+BACKUP_INTERVAL_HOURS = 24  # take a backup when the newest one is older than this
+BACKUP_PAGES_PER_STEP = 256  # pages copied per backup step
+BACKUP_STEP_PAUSE = 0.005  # seconds between backup steps, lets commits through
+BACKUP_MAX_RESTARTS = 3  # copy restarts caused by commits before finishing in one step
+BACKUP_ZSTD_LEVEL = 10
+BACKUP_KEEP_LAST = 3
+BACKUP_KEEP_DAILY = 7
+BACKUP_KEEP_WEEKLY = 4
+BACKUP_KEEP_MONTHLY = 12
+# maintenance
+MAINTENANCE_INTERVAL_HOURS = 24  # run at most this often
+MAINTENANCE_IDLE_SECONDS = 120  # only after this long without keyboard or mouse input
+MAINTENANCE_CHECK_MINUTES = 5  # how often the scheduler checks
+MAINTENANCE_VACUUM_PAGES = 128  # pages freed per incremental_vacuum step
+MAINTENANCE_STEP_PAUSE = 0.01  # seconds between incremental_vacuum steps
+MAINTENANCE_ANALYSIS_LIMIT = 400  # rows sampled per index by ANALYZE
+PURGE_DELETED_AFTER_DAYS = 30  # deleted entries stay recoverable this long
+PURGE_BATCH_ROWS = 500  # deleted rows purged per transaction
+# local API
+API_ENABLED = False  # start the server with the app (the Data menu toggles it)
+API_HOST = '127.0.0.1'  # loopback only
+API_PORT = 8737
+API_TOKEN = ''  # if set, requests must send 'Authorization: Bearer <token>'
+API_MAX_BODY_BYTES = 4 * 1024 * 1024
+API_COALESCE_BATCHES = 64  # queued POSTs written per transaction
+API_STREAM_ROWS = 500  # rows read per chunk of a streamed GET
 
 
 
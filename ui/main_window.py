@@ -1,8 +1,13 @@
 import datetime
+import os
+import uuid
+from functools import partial
+from typing import Tuple
 from PyQt6 import QtWidgets
-from PyQt6.QtCore import QDate, QSettings, QTime, Qt, QByteArray, QDateTime
-from PyQt6.QtGui import QCloseEvent
-from PyQt6.QtWidgets import QApplication, QTextEdit, QPushButton, QDialog, QFormLayout, QLineEdit
+from PyQt6.QtCore import QDate, QSettings, QTime, QTimer, Qt, QByteArray, QDateTime, pyqtSignal
+from PyQt6.QtGui import QAction, QActionGroup, QCloseEvent, QKeySequence, QUndoGroup
+from PyQt6.QtWidgets import (QApplication, QTextEdit, QPushButton, QDialog, QFormLayout, QLineEdit,
+                             QMessageBox, QFileDialog, QInputDialog, QSystemTrayIcon)
 from PyQt6.QtPrintSupport import QPrintDialog
 
 import tracker_config as tkc
@@ -10,6 +15,9 @@ import tracker_config as tkc
 #############################################################################
 # UI
 from ui.main_ui.gui import Ui_MainWindow
+from ui.pages.search_page import SearchPage
+from ui.pages.charts_page import ChartsPage
+from ui.pages.mind_page import MIND_SECTIONS, MindPage
 
 #############################################################################
 # LOGGER
@@ -25,6 +33,26 @@ from navigation.master_navigation import change_mainStack
 #############################################################################
 from utility.app_operations.diet_calc import (
     calculate_calories)
+from utility.app_operations.sleep_calc import (
+    format_minutes, sleep_duration_minutes)
+from utility.app_operations.food_catalog import (
+    FoodCatalog, connect_food_completer)
+from utility.app_operations.analytics import (
+    compute_trends, format_trends)
+from utility.app_operations.background_worker import (
+    run_in_background)
+from utility.app_operations.reports import (
+    PERIODS, SectionCache, generate_report)
+from utility.app_operations.maintenance_scheduler import (
+    IdleMonitor, MaintenanceScheduler)
+from utility.app_operations.reminders import (
+    ReminderScheduler)
+from utility.app_operations.local_api import (
+    LocalApiServer)
+from utility.app_operations.undo_history import (
+    TABLE_LABELS, UndoHistory)
+from utility.app_operations.form_bindings import (
+    FORMS, MIND_FORMS, FormBindings)
 from utility.app_operations.save_generic import (
     TextEditSaver)
 from utility.widgets_set_widgets.slider_spinbox_connections import (
@@ -37,6 +65,10 @@ from utility.app_operations.window_controls import (
     WindowController)
 from utility.app_operations.current_date_highlighter import (
     DateHighlighter)
+from utility.app_operations.day_clock import (
+    shared_clock)
+from utility.app_operations.theme import (
+    ThemeManager)
 from utility.widgets_set_widgets.line_connections import (
     line_edit_times)
 
@@ -57,31 +89,62 @@ from utility.widgets_set_widgets.buttons_set_time import (
 ##############################################################################
 # Database connections
 from database.database_manager import (
-    DataManager)
+    DEFAULT_PET_ID, PET_TABLES)
+from database.database_utility.connection_registry import (
+    ConnectionRegistry, profile_db_path, profile_key)
+from database.table_specs import (
+    LIVE_ROWS, SLEEP_SESSION_TABLES)
 
 # Delete Records
 from database.database_utility.delete_records import (
-    delete_selected_rows)
+    selected_row_ids)
 
 # setup Models
+from database.database_utility.backup import (
+    ARCHIVE_SUFFIXES, create_backup, default_backup_dir, latest_backup_time, restore_backup)
+from database.database_utility.sync import (
+    sync_databases)
+from database.database_utility.validation import (
+    ValidationError, validate_values)
+from database.database_utility.commit_guard import (
+    CommitResult)
 from database.database_utility.model_setup import (
-    create_and_set_model)
+    SleepSessionsModel, create_and_set_model)
+from database.database_utility.sleep_sessions import (
+    ROW_ID_COLUMNS)
 # Add personal diet
-from database.add_data.basics_mod.basics_shower import add_shower_data
-from database.add_data.basics_mod.basics_exercise import add_exercise_data
-from database.add_data.basics_mod.basics_teethbrushing import add_teethbrush_data
-from database.add_data.diet_mod.diet_hydration import add_hydration_data
-from database.add_data.diet_mod.diet import add_diet_data
-from database.add_data.lily_mod.lily_walk_notes import add_lily_walk_notes
-from database.add_data.lily_mod.lily_diet import add_lily_diet_data
-from database.add_data.lily_mod.lily_walks import add_lily_walk_data
-from database.add_data.lily_mod.lily_time_in_room import add_time_in_room_data
-from database.add_data.lily_mod.lily_mood import add_lily_mood_data
-from database.add_data.lily_mod.lily_notes import add_lily_note_data
-from database.add_data.sleep_mod.sleep_quality import add_sleep_quality_data
-from database.add_data.sleep_mod.sleep_total_hours_slept import add_total_hours_slept_data
-from database.add_data.sleep_mod.sleep_woke_up_like import add_woke_up_like_data
-from database.add_data.sleep_mod.sleep import add_sleep_data
+
+
+# model attribute, table, view attribute for every table shown in the data views
+MODEL_BINDINGS = (
+    ("shower_model", "shower_table", "shower_table"),
+    ("tooth_model", "tooth_table", "teethbrushed_table"),
+    ("exercise_model", "exercise_table", "yoga_table"),
+    ("diet_model", "diet_table", "diet_table"),
+    ("hydro_model", "hydration_table", "hydration_table"),
+    ("lily_diet_model", "lily_diet_table", "lily_diet_table"),
+    ("lily_mood_model", "lily_mood_table", "lily_mood_table"),
+    ("lily_walk_model", "lily_walk_table", "lily_walk_table"),
+    ("lily_room_model", "lily_in_room_table", "time_in_room_table"),
+    ("lily_note_model", "lily_notes_table", "lily_notes_table"),
+    ("lily_walk_note_model", "lily_walk_notes_table", "lily_walk_note_table"),
+)
+
+# The sleep views all show sleep_sessions_model, one row per night.
+# view attribute, the sleep table its rows are deleted from, the sleep_sessions columns it shows
+SLEEP_VIEWS = (
+    ("sleep_tableview", "sleep_table", ("sleep_date", "time_asleep", "time_awake", "duration_minutes")),
+    ("total_hours_slept_tableview", "total_hours_slept_table", ("sleep_date", "total_hours_slept")),
+    ("woke_up_like_tableview", "woke_up_like_table", ("sleep_date", "woke_up_like")),
+    ("sleep_quality_tableview", "sleep_quality_table", ("sleep_date", "sleep_quality")),
+)
+
+# table -> the model attribute showing its rows, for refreshing after writes made outside the views
+TABLE_MODELS = {
+    **{table_name: model_name for model_name, table_name, _ in MODEL_BINDINGS},
+    **{table: f"{section}_model" for section, (_, table, _, _, _) in MIND_SECTIONS.items()},
+    **{table_name: "sleep_sessions_model" for table_name in SLEEP_SESSION_TABLES},
+}
 
 
 class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
@@ -108,16 +171,14 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
     - cspr_model: The cspr model.
     - wefe_model: The wefe model.
     - btn_times: The button times.
-    - sleep_quality_model: The sleep quality model.
-    - woke_up_like_model: The woke up like model.
-    - sleep_model: The sleep model.
-    - total_hours_slept_model: The total hours slept model.
+    - sleep_sessions_model: The sleep sessions model, shared by the sleep views.
     - total_hrs_slept: The total hours slept.
     - basics_model: The basics model.
     - ui: The UI object.
     - db_manager: The database manager.
     - settings: The QSettings object.
     - window_controller: The WindowController object.
+    - apiWritten: Emitted from the local API's writer thread with (table, row ids).
 
     Methods:
     - __init__: Initializes the MainWindow object.
@@ -136,10 +197,14 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
     - mmwefecspr_datapage: Switches to the mmwefecspr datapage.
     - switch_lilys_mod: Switches to the lilys mod page.
     - switch_to_lilys_dataviews: Switches to the lilys dataviews page.
+    - switch_to_search_page: Switches to the notes and food search page.
+    - switch_to_charts_page: Switches to the charts page.
     - auto_date_setters: Automatically sets the date for various widgets.
     - auto_time_setters: Automatically sets the time for various widgets.
     - app_operations: Performs various operations related to the application.
     """
+    apiWritten = pyqtSignal(str, list)
+    
     def __init__(self,
                  *args,
                  **kwargs):
@@ -156,20 +221,77 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         self.lily_mood_model = None
         self.lily_diet_model = None
         self.btn_times = None
-        self.sleep_quality_model = None
-        self.woke_up_like_model = None
-        self.sleep_model = None
-        self.total_hours_slept_model = None
+        self.sleep_sessions_model = None
         self.total_hrs_slept = None
         self.basics_model = None
+        self.search_page = None
+        self.actionSearch = None
+        self.charts_page = None
+        self.actionCharts = None
+        self.food_catalog = None
+        self.form_bindings = None
+        self.trend_stats = None
+        self.actionShowTrends = None
+        self.actionGenerateReport = None
+        self.report_cache = SectionCache()
+        self.actionRecomputeSleep = None
+        self.backup_timer = None
+        self.backup_running = False
+        self.actionBackupNow = None
+        self.actionRestoreBackup = None
+        self.idle_monitor = None
+        self.maintenance = None
+        self.actionRunMaintenance = None
+        self.profile_models = {}
+        self.food_catalogs = {}
+        self.menuProfiles = None
+        self.profile_actions = None
+        self.actionNewProfile = None
+        self.pet_id = DEFAULT_PET_ID
+        self.menuPets = None
+        self.pet_actions = None
+        self.actionAddPet = None
+        self.mind_page = None
+        self.actionMindPage = None
+        self.mental_mental_model = None
+        self.cspr_model = None
+        self.wefe_model = None
+        self.reminders = None
+        self.menuReminders = None
+        self.tray_icon = None
+        self.day_clock = shared_clock()
+        self.date_highlighter = None
+        self.theme = None
+        self.menuThemes = None
+        self.theme_actions = None
+        self.actionSync = None
+        self.sync_running = False
+        self.api_server = None
+        self.actionLocalApi = None
+        self.undo_group = None
+        self.undo_histories = {}
+        self.undo_history = None
+        self.actionUndo = None
+        self.actionRedo = None
         self.ui = Ui_MainWindow()
         self.setupUi(self)
         # Database init
         self.settings = QSettings(tkc.ORGANIZATION_NAME, tkc.APPLICATION_NAME)
+        self.setup_theme()
         self.window_controller = WindowController()
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
-        self.db_manager = DataManager()
+        self.connections = ConnectionRegistry()
+        self.profile = self.settings.value("currentProfile", tkc.DEFAULT_PROFILE, type=str)
+        if self.profile not in self.connections.available_profiles():
+            self.profile = tkc.DEFAULT_PROFILE
+        self.db_manager = self.connections.get(self.profile)
+        self.pet_id = self.saved_pet_id()
         self.setup_models()
+        self.setup_search_page()
+        self.setup_charts_page()
+        self.setup_mind_page()
+        self.setup_food_catalog()
+        self.form_bindings = FormBindings(self)
         # QSettings settings_manager setup
         self.restore_state()
         self.app_operations()
@@ -182,28 +304,132 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         
     def commits_setup(self):
         """
-        Sets up the commits for various activities.
-
-        This method calls several other methods to set up commits for different activities,
-        such as sleep, total hours, woke up like, sleep quality, diet data, shower, exercise,
-        teethbrush, lily diet data, lily mood data, lily walk, lily in room, lily notes data,
-        lily walk notes data, mental mental table, cspr, wefe, and slider set spinbox.
-        """
-        self.sleep_commit()
-        self.total_hours_commit()
-        self.woke_up_like_commit()
-        self.sleep_quality_commit()
-        self.diet_data_commit()
-        self.shower_commit()
-        self.exercise_commit()
-        self.teethbrush_commit()
-        self.lily_diet_data_commit()
-        self.add_lily_mood_data()
-        self.lily_walk_commit()
-        self.lily_in_room_commit()
-        self.add_lily_notes_data()
-        self.add_lily_walk_notes_data()
-        
+        Connects every form's commit button or action to commit_form.
+
+        Each form's insert method is looked up when it commits, so it follows the active profile's
+        DataManager and, for the pet tables, the current pet. The four sleep forms commit together
+        from the Commit Sleep action, and the mind page's three forms from its commit button (see
+        commit_forms).
+        """
+        try:
+            self.form_inserts = {
+                'sleep_table': lambda: self.db_manager.insert_into_sleep_table,
+                'total_hours_slept_table': lambda: self.db_manager.insert_into_total_hours_slept_table,
+                'woke_up_like_table': lambda: self.db_manager.insert_woke_up_like_table,
+                'sleep_quality_table': lambda: self.db_manager.insert_into_sleep_quality_table,
+                'diet_table': lambda: self.insert_diet_entry,
+                'shower_table': lambda: self.db_manager.insert_into_shower_table,
+                'exercise_table': lambda: self.db_manager.insert_into_exercise_table,
+                'tooth_table': lambda: self.db_manager.insert_into_tooth_table,
+                'lily_diet_table': lambda: partial(self.db_manager.insert_into_lily_diet_table,
+                                                   pet_id=self.pet_id),
+                'lily_mood_table': lambda: partial(self.db_manager.insert_into_lily_mood_table,
+                                                   pet_id=self.pet_id),
+                'lily_walk_table': lambda: partial(self.db_manager.insert_into_wiggles_walks_table,
+                                                   pet_id=self.pet_id),
+                'lily_in_room_table': lambda: partial(self.db_manager.insert_into_time_in_room_table,
+                                                      pet_id=self.pet_id),
+                'lily_notes_table': lambda: partial(self.db_manager.insert_into_lily_notes_table,
+                                                    pet_id=self.pet_id),
+                'lily_walk_notes_table': lambda: partial(self.db_manager.insert_into_lily_walk_notes_table,
+                                                         pet_id=self.pet_id),
+                'mental_mental_table': lambda: self.db_manager.insert_into_mental_mental_table,
+                'cspr_table': lambda: self.db_manager.insert_into_cspr_table,
+                'wefe_table': lambda: self.db_manager.insert_into_wefe_table,
+            }
+            commit_signals = (
+                (self.actionCommitDiet.triggered, 'diet_table'),
+                (self.shower_c.clicked, 'shower_table'),
+                (self.yoga_commit.clicked, 'exercise_table'),
+                (self.teeth_commit.clicked, 'tooth_table'),
+                (self.lily_ate_check.clicked, 'lily_diet_table'),
+                (self.actionCommitLilyMood.triggered, 'lily_mood_table'),
+                (self.lily_walk_btn.clicked, 'lily_walk_table'),
+                (self.actionCommitLilysTimeInRoom.triggered, 'lily_in_room_table'),
+                (self.lily_note_commit_btn.clicked, 'lily_notes_table'),
+                (self.lily_walk_note_commit_btn.clicked, 'lily_walk_notes_table'),
+            )
+            for signal, table_name in commit_signals:
+                signal.connect(lambda _=None, t=table_name: self.commit_form(t))
+            self.actionCommitSleep.triggered.connect(lambda: self.commit_forms(SLEEP_SESSION_TABLES))
+            self.mind_page.commit_button.clicked.connect(lambda: self.commit_forms(MIND_FORMS))
+        except Exception as e:
+            logger.error(f"Error setting up commits: {e}", exc_info=True)
+    
+    def commit_form(self, table_name: str) -> CommitResult:
+        """
+        Commits one form (see commit_forms).
+
+        Args:
+            table_name (str): The form's table, a key of FORMS.
+
+        Returns:
+            CommitResult: What the commit did.
+        """
+        return self.commit_forms((table_name,))
+    
+    def commit_forms(self, table_names: Tuple[str, ...]) -> CommitResult:
+        """
+        Commits forms together: reads their widgets through the form bindings, inserts one row per
+        form in a single transaction, then resets the forms and reselects each affected model once.
+
+        Every form is validated before anything is written. If one fails (a blank required field, a
+        value out of range), nothing is committed; the status bar says what is wrong and the forms
+        keep their values. If an insert fails, the others are rolled back. A commit whose every row
+        repeats one committed moments ago (see commit_guard) is ignored. If only some rows repeat,
+        nothing is committed either, and the status bar names them. Tables with a
+        sleep_session_id column share one new id, which ties a sleep commit's rows together.
+
+        Args:
+            table_names (Tuple[str, ...]): The forms' tables, keys of FORMS.
+
+        Returns:
+            CommitResult: COMMITTED if the rows were inserted, REPEATED if the commit was ignored
+            as a repeat, FAILED otherwise.
+        """
+        guard = self.db_manager.commit_guard
+        try:
+            shown = {table_name: self.form_bindings.values(table_name) for table_name in table_names}
+            if all(guard.is_repeat(table_name, values) for table_name, values in shown.items()):
+                # the second click of a double click, on the forms guard_reset_form remembered
+                for table_name in shown:
+                    self.form_bindings.reset(table_name)
+                return CommitResult.REPEATED
+            rows = {}
+            for table_name, values in shown.items():
+                try:
+                    rows[table_name] = validate_values(table_name, values)
+                except ValidationError as e:
+                    self.statusBar().showMessage(str(e).replace('_', ' '), 5000)
+                    return CommitResult.FAILED
+            repeated = [table_name for table_name, values in rows.items() if guard.is_repeat(table_name, values)]
+            if len(repeated) == len(rows):
+                # the rest of a double click; reset again, as widgets may have reacted to it
+                for table_name in rows:
+                    self.form_bindings.reset(table_name)
+                return CommitResult.REPEATED
+            if repeated:
+                names = ', '.join(TABLE_LABELS.get(table_name, table_name) for table_name in repeated)
+                entries = "entry repeats" if len(repeated) == 1 else "entries repeat"
+                self.statusBar().showMessage(f"Not committed: the {names} {entries} what was committed moments ago", 5000)
+                return CommitResult.REPEATED
+            session = {'sleep_session_id': uuid.uuid4().hex}
+            with self.db_manager.transaction():
+                for table_name, values in rows.items():
+                    shared = session if table_name in SLEEP_SESSION_TABLES else {}
+                    if not self.form_inserts[table_name]()(*values, validated=True, **shared):
+                        raise RuntimeError(f"could not insert into {table_name}")
+        except Exception as e:
+            logger.error(f"Error committing {', '.join(table_names)}: {e}", exc_info=True)
+            return CommitResult.FAILED
+        for table_name, values in rows.items():
+            guard.remember(table_name, values)
+            self.form_bindings.reset(table_name)
+            self.guard_reset_form(table_name)
+        for model_name in dict.fromkeys(FORMS[table_name][1] for table_name in table_names):
+            getattr(self, model_name).select()
+        return CommitResult.COMMITTED
+    
     ##########################################################################################
     # APP-OPERATIONS setup
     ##########################################################################################
@@ -221,7 +447,9 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
 
         """
         try:
+            self.setup_undo()
             self.auto_date_setters()
+            self.setup_day_rollover()
             self.calculate_total_hours_slept()
             self.stack_navigation()
             self.switch_page_view_setup()
@@ -229,6 +457,21 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             self.auto_time_setters()
             self.slider_set_spinbox()
             self.actionTotalHours.triggered.connect(self.calculate_total_hours_slept)
+            self.time_asleep.timeChanged.connect(self.calculate_total_hours_slept)
+            self.time_awake.timeChanged.connect(self.calculate_total_hours_slept)
+            self.actionRecomputeSleep = QAction("Recompute Sleep Durations", self)
+            self.actionRecomputeSleep.setObjectName("actionRecomputeSleep")
+            self.menuData.addAction(self.actionRecomputeSleep)
+            self.actionRecomputeSleep.triggered.connect(self.recompute_sleep_durations)
+            self.setup_trends()
+            self.setup_reports()
+            self.setup_backups()
+            self.setup_maintenance()
+            self.setup_profiles()
+            self.setup_pets()
+            self.setup_reminders()
+            self.setup_sync()
+            self.setup_local_api()
             
         except Exception as e:
             logger.error(f"Error occurred while setting up app_operations : {e}", exc_info=True)
@@ -385,6 +628,110 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         """
         self.mainStack.setCurrentWidget(self.lilys_dataviews)
         self.setFixedSize(860, 456)
+    
+    def switch_to_search_page(self):
+        """
+        Switches to the search page, focuses the search box and adjusts the window size.
+
+        Returns:
+            None
+        """
+        self.mainStack.setCurrentWidget(self.search_page)
+        self.setFixedSize(800, 540)
+        self.search_page.search_box.setFocus()
+    
+    def switch_to_charts_page(self):
+        """
+        Switches to the charts page, loading the chart history the first time, and adjusts the
+        window size.
+
+        Returns:
+            None
+        """
+        self.mainStack.setCurrentWidget(self.charts_page)
+        self.setFixedSize(800, 540)
+        self.charts_page.load()
+    
+    def setup_charts_page(self) -> None:
+        """
+        Adds the charts page to the mainStack and its action to the Views menu, and subscribes the
+        page to new database rows so it can append them as they are committed.
+
+        Raises:
+            Exception: If there is an error setting up the charts page.
+
+        """
+        try:
+            self.charts_page = ChartsPage(self.db_manager, parent=self.mainStack)
+            self.charts_page.pet_id = self.pet_id
+            self.mainStack.addWidget(self.charts_page)
+            self.db_manager.insert_listeners.append(self.charts_page.on_row_inserted)
+            self.actionCharts = QAction("Charts", self)
+            self.actionCharts.setObjectName("actionCharts")
+            self.menuViews.addAction(self.actionCharts)
+        except Exception as e:
+            logger.error(f"Error setting up charts page: {e}", exc_info=True)
+    
+    def switch_to_mind_page(self):
+        """
+        Switches to the mind tracker page and adjusts the window size.
+
+        Returns:
+            None
+        """
+        self.mainStack.setCurrentWidget(self.mind_page)
+        self.setFixedSize(800, 540)
+    
+    def setup_mind_page(self) -> None:
+        """
+        Adds the mind tracker page to the mainStack and its action to the Tracker menu.
+
+        The page's sliders and paged models are also set as attributes of the main window, under the
+        names the form bindings look up.
+
+        Raises:
+            Exception: If there is an error setting up the mind page.
+
+        """
+        try:
+            date_time_edits = {
+                section: (getattr(self, date_column), getattr(self, time_column))
+                for section, (_, _, date_column, time_column, _) in MIND_SECTIONS.items()
+            }
+            self.mind_page = MindPage(self.db_manager.db, date_time_edits, parent=self.mainStack)
+            self.mainStack.addWidget(self.mind_page)
+            for _, _, _, _, sliders in MIND_SECTIONS.values():
+                for attribute, _ in sliders:
+                    setattr(self, attribute, getattr(self.mind_page, attribute))
+            self.summing_box = self.mind_page.summing_box
+            self.mental_mental_model = self.mind_page.models['mental_mental']
+            self.cspr_model = self.mind_page.models['cspr']
+            self.wefe_model = self.mind_page.models['wefe']
+            for model in self.mind_page.models.values():
+                model.select()
+            self.actionMindPage = QAction("Mind", self)
+            self.actionMindPage.setObjectName("actionMindPage")
+            self.menuTracker.addAction(self.actionMindPage)
+        except Exception as e:
+            logger.error(f"Error setting up mind page: {e}", exc_info=True)
+    
+    def setup_search_page(self) -> None:
+        """
+        Adds the notes and food search page to the mainStack and its action to the Views menu.
+
+        Raises:
+            Exception: If there is an error setting up the search page.
+
+        """
+        try:
+            self.search_page = SearchPage(self.db_manager, parent=self.mainStack)
+            self.mainStack.addWidget(self.search_page)
+            self.actionSearch = QAction("Search", self)
+            self.actionSearch.setObjectName("actionSearch")
+            self.actionSearch.setShortcut("Ctrl+F")
+            self.menuViews.addAction(self.actionSearch)
+        except Exception as e:
+            logger.error(f"Error setting up search page: {e}", exc_info=True)
         
     def switch_page_view_setup(self):
         """
@@ -400,6 +747,9 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         self.actionBasicsDataView.triggered.connect(self.switch_to_basics_data_page)
         self.actionLilysPage.triggered.connect(self.switch_lilys_mod)
         self.actionLilyDataView.triggered.connect(self.switch_to_lilys_dataviews)
+        self.actionSearch.triggered.connect(self.switch_to_search_page)
+        self.actionCharts.triggered.connect(self.switch_to_charts_page)
+        self.actionMindPage.triggered.connect(self.switch_to_mind_page)
         
     def auto_date_setters(self) -> None:
         """
@@ -420,13 +770,78 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             None
         """
         try:
-            self.diet_date.setDate(QDate.currentDate())
-            self.sleep_date.setDate(QDate.currentDate())
-            self.basics_date.setDate(QDate.currentDate())
-            self.lily_date.setDate(QDate.currentDate())
+            for date_edit in self.form_date_edits():
+                date_edit.setDate(self.day_clock.today())
         except Exception as e:
             logger.error(f"Probs with auto dates, {e}", exc_info=True)
     
+    def form_date_edits(self) -> list:
+        """
+        Returns:
+            list: The date edits of the entry forms, which default to today.
+        """
+        return [self.diet_date, self.sleep_date, self.basics_date, self.mental_mental_date,
+                self.wefe_date, self.cspr_date, self.lily_date]
+    
+    def setup_theme(self) -> None:
+        """
+        Compiles the generated UI's stylesheets into one application stylesheet, applies the saved
+        theme and adds the Theme submenu to the Views menu for switching themes at runtime.
+
+        Returns:
+            None
+        """
+        try:
+            self.theme = ThemeManager(self)
+            name = self.settings.value("theme", tkc.THEME, type=str)
+            if not self.theme.apply(name):
+                self.theme.apply(tkc.THEME)
+            self.menuThemes = self.menuViews.addMenu("Theme")
+            self.theme_actions = QActionGroup(self)
+            self.theme_actions.setExclusive(True)
+            self.theme_actions.triggered.connect(lambda action: self.switch_theme(action.data()))
+            for theme_name in self.theme.available():
+                action = QAction(theme_name.title(), self)
+                action.setData(theme_name)
+                action.setCheckable(True)
+                action.setChecked(theme_name == self.theme.current)
+                self.theme_actions.addAction(action)
+                self.menuThemes.addAction(action)
+        except Exception as e:
+            logger.error(f"Error setting up the theme: {e}", exc_info=True)
+    
+    def switch_theme(self, name: str) -> None:
+        if self.theme.apply(name):
+            self.settings.setValue("theme", name)
+    
+    def setup_day_rollover(self) -> None:
+        """
+        Follows the day clock: highlights the form dates showing today and moves them on at midnight.
+
+        Returns:
+            None
+        """
+        self.date_highlighter = DateHighlighter({date_edit.objectName(): date_edit
+                                                 for date_edit in self.form_date_edits()},
+                                                self.day_clock)
+        self.day_clock.dayChanged.connect(self.on_day_changed)
+    
+    def on_day_changed(self, new_day: QDate, previous_day: QDate) -> None:
+        """
+        Moves the form dates still on the previous day to the new one; dates the user picked are
+        left alone.
+
+        Args:
+            new_day (QDate): Today.
+            previous_day (QDate): The day that just ended.
+        """
+        try:
+            for date_edit in self.form_date_edits():
+                if date_edit.date() == previous_day:
+                    date_edit.setDate(new_day)
+        except Exception as e:
+            logger.error(f"Error rolling the form dates over: {e}", exc_info=True)
+    
     def auto_time_setters(self) -> None:
         """
         Sets the time for various components in the UI to the current system time.
@@ -449,6 +864,9 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             self.diet_time.setTime(QTime.currentTime())
             self.sleep_time.setTime(QTime.currentTime())
             self.basics_time.setTime(QTime.currentTime())
+            self.mental_mental_time.setTime(QTime.currentTime())
+            self.wefe_time.setTime(QTime.currentTime())
+            self.cspr_time.setTime(QTime.currentTime())
             self.lily_time.setTime(QTime.currentTime())
         except Exception as e:
             logger.error(f"Probs with auto time, {e}", exc_info=True)
@@ -482,630 +900,952 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         for app_btns, times_edit in self.btn_times.items():
             btn_times(app_btns, times_edit)
     
-    def on_page_changed(self, index):
+    def setup_trends(self) -> None:
         """
-        Callback method triggered when the page is changed in the UI.
+        Adds the 'Trends' action to the Data menu.
 
-        Args:
-            index (int): The index of the new page.
+        Returns:
+            None
         """
-        self.settings.setValue("lastPageIndex", index)
+        self.actionShowTrends = QAction("Trends", self)
+        self.actionShowTrends.setObjectName("actionShowTrends")
+        self.menuData.addAction(self.actionShowTrends)
+        self.actionShowTrends.triggered.connect(self.show_trends)
     
-    def calculate_total_hours_slept(self) -> None:
+    def show_trends(self) -> None:
         """
-        Calculates the total hours slept based on the awake time and asleep time.
-
-        This method calculates the total hours slept by subtracting the awake time from the
-        asleep time.
-        If the time spans past midnight, it adds 24 hours worth of minutes to the total.
-        The result is then converted to hours and minutes and displayed in the
-        total_hours_slept_lineedit.
-
-        Raises:
-            Exception: If an error occurs while calculating the total hours slept.
+        Computes the trend statistics for the last tkc.TRENDS_DAYS days in a worker thread and shows
+        a summary when they are ready.
 
+        Returns:
+            None
         """
-        
         try:
-            time_asleep = self.time_awake.time()
-            time_awake = self.time_asleep.time()
-            
-            # Convert time to total minutes since the start of the day
-            minutes_asleep = (time_asleep.hour() * 60 + time_asleep.minute())
-            minutes_awake = (time_awake.hour() * 60 + time_awake.minute())
-            
-            # Calculate the difference in minutes
-            total_minutes = minutes_asleep - minutes_awake
-            
-            # Handle case where the time spans past midnight
-            if total_minutes < 0:
-                total_minutes += (24 * 60)  # Add 24 hours worth of minutes
-            
-            # Convert back to hours and minutes
-            hours = total_minutes // 60
-            minutes = total_minutes % 60
-            
-            # Create the total_hours_slept string in HH:mm format
-            self.total_hrs_slept = f"{hours:02}:{minutes:02}"
-            
-            # Update the lineEdit with the total hours slept
-            self.total_hours_slept.setText(self.total_hrs_slept)
-        
+            end = self.day_clock.today()
+            start = end.addDays(-(tkc.TRENDS_DAYS - 1))
+            run_in_background(compute_trends,
+                              self.db_manager.db_path,
+                              start.toString("yyyy-MM-dd"),
+                              end.toString("yyyy-MM-dd"),
+                              pet_id=self.pet_id,
+                              on_result=self.on_trends_ready,
+                              on_error=lambda message: QMessageBox.warning(self, "Trends", message))
         except Exception as e:
-            logger.error(f"Error occurred while calculating total hours slept {e}", exc_info=True)
+            logger.error(f"Error starting trends computation: {e}", exc_info=True)
     
-    #############################################################################################
-    # Agenda Journal Navigation
-    #############################################################################################
-    def stack_navigation(self):
+    def on_trends_ready(self, stats) -> None:
         """
-        Handles the stack navigation for the main window.
-
-        This method maps actions and buttons to stack page indices for the agenda journal.
-        It connects the actions to the corresponding pages in the stack.
-
-        Raises:
-            Exception: If an error occurs during the stack navigation.
+        Keeps the computed trend statistics and shows their summary.
 
+        Args:
+            stats (dict): The result of compute_trends.
         """
-        try:
-            # Mapping actions and buttons to stack page indices for the agenda journal
-            mainStackNavvy = {
-                self.actionBDSInput: 0, self.actionSleepDataView: 1,
-                self.actionDietDataView: 2, self.actionBasicsDataView: 3,
-                self.actionLilysPage: 4, self.actionLilyDataView: 5,
-            }
-            
-            # Main Stack Navigation
-            for action, page in mainStackNavvy.items():
-                action.triggered.connect(
-                    lambda _, p=page: change_mainStack(self.mainStack, p))
-        
-        except Exception as e:
-            logger.error(f"An error has occurred: {e}", exc_info=True)
+        self.trend_stats = stats
+        QMessageBox.information(self, "Trends", format_trends(stats))
     
-    # SLEEP COMMIT
-    #######################################################################################
-    def sleep_commit(self):
+    def setup_reports(self) -> None:
         """
-        Connects the 'Commit Sleep' action to the 'add_sleep_data' function and inserts the sleep data into the sleep table.
+        Adds the 'Generate Report...' action to the Data menu.
 
-        Raises:
-            Exception: If an error occurs during the connection or insertion process.
+        Returns:
+            None
         """
-        try:
-            self.actionCommitSleep.triggered.connect(lambda: add_sleep_data(self, {
-                "sleep_date": "sleep_date", "time_asleep": "time_asleep", "time_awake":
-                    "time_awake", "model": "sleep_model",
-            },
-                                                                            self.db_manager.insert_into_sleep_table, ))
-        except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+        self.actionGenerateReport = QAction("Generate Report...", self)
+        self.actionGenerateReport.setObjectName("actionGenerateReport")
+        self.menuData.addAction(self.actionGenerateReport)
+        self.actionGenerateReport.triggered.connect(self.generate_report)
     
-    def total_hours_commit(self):
+    def generate_report(self) -> None:
         """
-        Connects the 'CommitSleep' action to the 'add_total_hours_slept_data' function and inserts data into the 
-        'total_hours_slept_table' in the database.
-
-        Raises:
-            Exception: If an error occurs during the execution of the method.
+        Asks for a period and a file, then builds the report up to today and writes it in a worker
+        thread. Sections whose data hasn't changed since an earlier report are reused from
+        report_cache.
 
+        Returns:
+            None
         """
         try:
-            self.actionCommitSleep.triggered.connect(lambda: add_total_hours_slept_data(self, {
-                "sleep_date": "sleep_date", "total_hours_slept": "total_hours_slept", "model":
-                    "total_hours_slept_model",
-            },
-                                                                                        self.db_manager.insert_into_total_hours_slept_table, ))
+            period, ok = QInputDialog.getItem(self, "Generate Report", "Report on this:",
+                                              [p.capitalize() for p in PERIODS], 0, False)
+            if not ok:
+                return
+            period = period.lower()
+            today = self.day_clock.today().toPyDate()
+            filename, _ = QFileDialog.getSaveFileName(
+                self, "Generate Report", f"{period}-report-{today.isoformat()}.pdf",
+                "PDF Files (*.pdf);;HTML Files (*.html);;Markdown Files (*.md)")
+            if not filename:
+                return
+            if os.path.splitext(filename)[1].lower() not in ('.pdf', '.html', '.md'):
+                filename += '.pdf'
+            self.statusBar().showMessage(f"Generating the {period} report...")
+            run_in_background(generate_report,
+                              self.db_manager.db_path,
+                              period,
+                              today,
+                              filename,
+                              self.report_cache,
+                              self.pet_id,
+                              on_result=self.on_report_ready,
+                              on_error=lambda message: QMessageBox.warning(self, "Generate Report", message))
         except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+            logger.error(f"Error starting the report: {e}", exc_info=True)
     
-    def woke_up_like_commit(self):
+    def on_report_ready(self, report: dict) -> None:
         """
-        Connects the 'Commit Sleep' action to the 'add_woke_up_like_data' function.
-
-        This method connects the 'triggered' signal of the 'actionCommitSleep' QAction to the 'add_woke_up_like_data'
-        function. It passes the necessary parameters to the function and inserts the data into the 'woke_up_like' table
-        using the 'db_manager' object.
-
-        Raises:
-            Exception: If an error occurs during the connection or data insertion, an exception is raised.
+        Says where the report was written.
 
+        Args:
+            report (dict): The result of generate_report.
         """
-        try:
-            self.actionCommitSleep.triggered.connect(lambda: add_woke_up_like_data(self, {
-                "sleep_date": "sleep_date", "woke_up_like": "woke_up_like", "model": "woke_up_like_model",
-            },
-                                                                                   self.db_manager.insert_woke_up_like_table, ))
-        except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+        logger.info(f"Wrote {report['filename']}: {report['sections_built']} sections rendered, "
+                    f"{report['sections_reused']} reused, {report['elapsed_ms']:.0f} ms")
+        self.statusBar().showMessage(f"Saved {os.path.basename(report['filename'])}", 5000)
     
-    def sleep_quality_commit(self):
+    def setup_backups(self) -> None:
         """
-        Connects the 'Commit Sleep' action to the 'add_sleep_quality_data' function and inserts the sleep quality data
-        into the sleep quality table in the database.
-
-        Raises:
-            Exception: If an error occurs during the execution of the method.
+        Adds the backup actions to the Data menu and starts the hourly check for a due backup.
 
+        Returns:
+            None
         """
-        try:
-            self.actionCommitSleep.triggered.connect(lambda: add_sleep_quality_data(self, {
-                "sleep_date": "sleep_date", "sleep_quality": "sleep_quality", "model":
-                    "sleep_quality_model",
-            },
-                                                                                    self.db_manager.insert_into_sleep_quality_table, ))
-        except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+        self.actionBackupNow = QAction("Back Up Now", self)
+        self.actionBackupNow.setObjectName("actionBackupNow")
+        self.menuData.addAction(self.actionBackupNow)
+        self.actionBackupNow.triggered.connect(self.start_backup)
+        
+        self.actionRestoreBackup = QAction("Restore Backup...", self)
+        self.actionRestoreBackup.setObjectName("actionRestoreBackup")
+        self.menuData.addAction(self.actionRestoreBackup)
+        self.actionRestoreBackup.triggered.connect(self.restore_from_backup)
+        
+        self.backup_timer = QTimer(self)
+        self.backup_timer.setInterval(60 * 60 * 1000)
+        self.backup_timer.timeout.connect(self.backup_if_due)
+        self.backup_timer.start()
+        QTimer.singleShot(0, self.backup_if_due)
     
-    # MY DIET Commit Method
-    #########################################################################
-    def diet_data_commit(self):
+    def backup_if_due(self) -> None:
         """
-        Connects the 'Commit Diet' action to the 'add_diet_data' function and inserts the diet data into the database.
-
-        Raises:
-            Exception: If an error occurs during the process.
+        Starts a backup when the newest one is older than tkc.BACKUP_INTERVAL_HOURS.
 
+        Returns:
+            None
         """
         try:
-            self.actionCommitDiet.triggered.connect(lambda: add_diet_data(self, {
-                "diet_date": "diet_date", "diet_time": "diet_time", "food_eaten": "food_eaten",
-                "calories": "calories", "model": "diet_model",
-            }, self.db_manager.insert_into_diet_table, ))
+            latest = latest_backup_time(self.db_manager.db_path)
+            due = datetime.timedelta(hours=tkc.BACKUP_INTERVAL_HOURS)
+            if latest is None or datetime.datetime.now() - latest >= due:
+                self.start_backup()
         except Exception as e:
-            logger.error(f"An error has occurred: {e}", exc_info=True)
+            logger.error(f"Error checking for a due backup: {e}", exc_info=True)
     
-    def commit_hydration(self, amount):
+    def start_backup(self) -> None:
         """
-        Commits the hydration data to the database.
-
-        Args:
-            amount (int): The amount of water in ounces.
-
-        Raises:
-            Exception: If an error occurs while committing the hydration data.
+        Takes an online backup in a worker thread, unless one is already running.
 
         Returns:
             None
         """
-        try:
-            date = QDate.currentDate().toString("yyyy-MM-dd")
-            time = QTime.currentTime().toString("hh:mm:ss")
-            self.db_manager.insert_into_hydration_table(date, time, amount)
-            logger.info(f"Committed {amount} oz of water at {date} {time}")
-            self.hydro_model.select()
-        except Exception as e:
-            logger.error(f"Error committing hydration data: {e}", exc_info=True)
+        if self.backup_running:
+            return
+        self.backup_running = True
+        run_in_background(create_backup,
+                          self.db_manager.db_path,
+                          on_result=self.on_backup_done,
+                          on_error=self.on_backup_failed)
     
-    def shower_commit(self):
+    def on_backup_done(self, archive_path: str) -> None:
+        self.backup_running = False
+        logger.info(f"Backup written to {archive_path}")
+    
+    def on_backup_failed(self, message: str) -> None:
+        self.backup_running = False
+        QMessageBox.warning(self, "Backup", f"Backup failed: {message}")
+    
+    def restore_from_backup(self) -> None:
         """
-        Connects the 'clicked' signal of the 'shower_c' button to the 'add_shower_data' function,
-        passing the necessary parameters and calling the 'insert_into_shower_table' method of the 'db_manager' object.
-
-        Raises:
-            Exception: If an error occurs during the process.
+        Asks for a backup archive and restores it over the current database in a worker thread.
 
+        Returns:
+            None
         """
         try:
-            self.shower_c.clicked.connect(lambda: add_shower_data(self, {
-                "basics_date": "basics_date", "basics_time": "basics_time",
-                "shower_check": "shower_check", "model": "shower_model",
-            },
-                                                                  self.db_manager.insert_into_shower_table, ))
+            archive_path, _ = QFileDialog.getOpenFileName(
+                self, "Restore Backup", default_backup_dir,
+                "Backups (*" + " *".join(ARCHIVE_SUFFIXES) + ")")
+            if not archive_path:
+                return
+            answer = QMessageBox.question(
+                self, "Restore Backup",
+                f"Replace all current data with {os.path.basename(archive_path)}?")
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+            run_in_background(restore_backup,
+                              archive_path,
+                              self.db_manager.db_path,
+                              on_result=self.on_restore_done,
+                              on_error=lambda message: QMessageBox.warning(self, "Restore Backup", message))
         except Exception as e:
-            logger.error(f"An error occurred: {e}", exc_info=True)
+            logger.error(f"Error restoring backup: {e}", exc_info=True)
     
-    def exercise_commit(self):
+    def on_restore_done(self, archive_path: str) -> None:
         """
-        Connects the `yoga_commit` button to the `add_exercise_data` function with the specified arguments.
-
-        This method is responsible for setting up the connection between the `yoga_commit` button and the `add_exercise_data` function.
-        It passes the necessary arguments to the `add_exercise_data` function, which is responsible for inserting exercise data into the exercise table.
+        Reloads every table model after a restore, and drops what was read from the replaced
+        database: its undo history, food catalog, chart history and rendered report sections.
 
         Args:
-            self: The instance of the class.
+            archive_path (str): The archive that was restored.
+        """
+        self.refresh_models()
+        if self.undo_history is not None:
+            self.undo_history.clear()
+        self.reload_food_catalog()
+        self.charts_page.reload()
+        self.report_cache.clear()
+        QMessageBox.information(self, "Restore Backup", f"Restored {os.path.basename(archive_path)}")
+    
+    def refresh_models(self) -> None:
+        """
+        Re-selects every table model so the views show the database's current contents.
 
         Returns:
             None
         """
-        self.yoga_commit.clicked.connect(lambda: add_exercise_data(self, {
-            "basics_date": "basics_date", "basics_time": "basics_time",
-            "exerc_check": "exerc_check", "model": "exercise_model",
-        }, self.db_manager.insert_into_exercise_table, ))
+        for name, value in vars(self).items():
+            if name.endswith('_model') and hasattr(value, 'select'):
+                value.select()
     
-    def teethbrush_commit(self):
+    def setup_sync(self) -> None:
         """
-        Connects the `clicked` signal of the `teeth_commit` button to the `add_teethbrush_data` function.
-
-        The `add_teethbrush_data` function is called with the following parameters:
-        - `self`: The instance of the main window class.
-        - A dictionary containing the data to be passed to the `add_teethbrush_data` function.
-        - `self.db_manager.insert_into_tooth_table`: The method to be called when inserting data into the tooth table.
+        Adds 'Sync With Database...' to the Data menu.
 
-        This method is responsible for handling the commit action when the `teeth_commit` button is clicked.
+        Returns:
+            None
         """
-        self.teeth_commit.clicked.connect(lambda: add_teethbrush_data(self, {
-            "basics_date": "basics_date", "basics_time": "basics_time",
-            "tooth_check": "tooth_check", "model": "tooth_model",
-        }, self.db_manager.insert_into_tooth_table, ))
+        self.actionSync = QAction("Sync With Database...", self)
+        self.actionSync.setObjectName("actionSync")
+        self.menuData.addAction(self.actionSync)
+        self.actionSync.triggered.connect(self.sync_with_database)
     
-    def lily_diet_data_commit(self):
+    def sync_with_database(self) -> None:
         """
-        Connects the `lily_ate_check` button click event to the `add_lily_diet_data` function.
-
-        The `add_lily_diet_data` function is called with the following parameters:
-        - `self`: The current instance of the class.
-        - A dictionary containing the data to be passed to the `add_lily_diet_data` function:
-            - "lily_date": The value of the "lily_date" attribute.
-            - "lily_time": The value of the "lily_time" attribute.
-            - "model": The value of the "lily_diet_model" attribute.
-        - `self.db_manager.insert_into_lily_diet_table`: The function to be called when the button is clicked.
-
-        Raises:
-            Exception: If an error occurs during the execution of the method.
+        Asks for another tracker database (another device's, or a shared file used as a sync server)
+        and exchanges the changes made since the last sync with it in a worker thread.
 
+        Returns:
+            None
         """
+        if self.sync_running:
+            return
         try:
-            self.lily_ate_check.clicked.connect(lambda: add_lily_diet_data(self, {
-                "lily_date": "lily_date", "lily_time": "lily_time",
-                "model": "lily_diet_model",
-            }, self.db_manager.insert_into_lily_diet_table, ))
+            peer_path, _ = QFileDialog.getSaveFileName(
+                self, "Sync With Database", self.settings.value("lastSyncPeer", "", type=str),
+                "Databases (*.db)", options=QFileDialog.Option.DontConfirmOverwrite)
+            if not peer_path or os.path.abspath(peer_path) == os.path.abspath(self.db_manager.db_path):
+                return
+            self.settings.setValue("lastSyncPeer", peer_path)
+            self.sync_running = True
+            run_in_background(sync_databases,
+                              self.db_manager.db_path,
+                              peer_path,
+                              on_result=self.on_sync_done,
+                              on_error=self.on_sync_failed)
         except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+            self.sync_running = False
+            logger.error(f"Error starting sync: {e}", exc_info=True)
+    
+    def on_sync_done(self, counts: dict) -> None:
+        self.sync_running = False
+        if counts['pulled']:
+            self.refresh_models()
+        QMessageBox.information(self, "Sync",
+                                f"Received {counts['pulled']} changes, sent {counts['pushed']} changes.")
     
-    def add_lily_mood_data(self):
+    def on_sync_failed(self, message: str) -> None:
+        self.sync_running = False
+        QMessageBox.warning(self, "Sync", f"Sync failed: {message}")
+    
+    def setup_undo(self) -> None:
         """
-        Connects the 'commit_mood' action to the 'add_lily_mood_data' function and passes the necessary data to it.
-
-        This method connects the 'commit_mood' action to the 'add_lily_mood_data' function, which is responsible for inserting
-        Lily's mood data into the database. It sets up the necessary data and connects the action to the function using a lambda
-        function. The lambda function passes the required data and the function to be called when the action is triggered.
-
-        Parameters:
-            self (MainWindow): The instance of the main window.
+        Adds Undo and Redo to the Data menu, above Delete. Each profile has its own undo stack in
+        undo_group; the actions follow the active one.
 
         Returns:
             None
         """
-        try:
-            self.actionCommitLilyMood.triggered.connect(lambda: add_lily_mood_data(self, {
-                "lily_date": "lily_date",
-                "lily_time": "lily_time",
-                "lily_mood_slider": "lily_mood_slider",
-                "lily_energy_slider": "lily_energy_slider",
-                "lily_mood_activity_slider": "lily_mood_activity_slider",
-                "model": "lily_mood_model",
-            }, self.db_manager.insert_into_lily_mood_table, ))
-        except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+        self.undo_group = QUndoGroup(self)
+        self.actionUndo = self.undo_group.createUndoAction(self, "Undo")
+        self.actionUndo.setObjectName("actionUndo")
+        self.actionUndo.setShortcut(QKeySequence.StandardKey.Undo)
+        self.actionRedo = self.undo_group.createRedoAction(self, "Redo")
+        self.actionRedo.setObjectName("actionRedo")
+        self.actionRedo.setShortcut(QKeySequence.StandardKey.Redo)
+        self.menuData.insertActions(self.actionDelete, [self.actionUndo, self.actionRedo])
+        self.activate_undo_history()
     
-    def add_lily_notes_data(self):
+    def activate_undo_history(self) -> None:
         """
-        Connects the 'commit_lily_notes' action to the 'add_lily_note_data' function.
-
-        This method connects the 'commit_lily_notes' action to the 'add_lily_note_data' function,
-        passing the necessary parameters. It handles any exceptions that occur and logs an error message.
-
-        Parameters:
-        - self: The instance of the main window.
+        Makes the active profile's undo history current, creating it on first use.
 
         Returns:
-        - None
+            None
         """
-        try:
-            self.lily_note_commit_btn.clicked.connect(lambda: add_lily_note_data(self, {
-                "lily_date": "lily_date", "lily_time": "lily_time",
-                "lily_notes": "lily_notes",
-                "model": "lily_note_model",
-            }, self.db_manager.insert_into_lily_notes_table, ))
-        except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+        history = self.undo_histories.get(self.profile)
+        if history is None:
+            history = UndoHistory(self.db_manager, self)
+            history.rowsChanged.connect(self.on_undo_rows_changed)
+            history.rowEdited.connect(self.on_undo_row_edited)
+            self.undo_group.addStack(history.stack)
+            self.undo_histories[self.profile] = history
+        self.undo_history = history
+        self.undo_group.setActiveStack(history.stack)
     
-    def lily_walk_commit(self):
+    def record_edit(self, table: str, row_id: int, column: str, old, new) -> None:
+        if self.undo_history is not None:
+            self.undo_history.record_edit(table, row_id, column, old, new)
+    
+    def on_undo_rows_changed(self, table: str) -> None:
         """
-        Connects the `lily_walk_btn` button to the `add_lily_walk_data` function with specified arguments.
-
-        This method is responsible for setting up the connection between the `lily_walk_btn` button and the `add_lily_walk_data` function.
-        It passes a dictionary of data and a callback function to the `add_lily_walk_data` function.
+        Reselects the models of a table whose rows undo or redo added or removed, and lets the
+        charts reload if they read it.
 
         Args:
-            self: The instance of the class.
+            table (str): The table.
 
         Returns:
             None
+        """
+        self.refresh_table_model(table)
+        self.charts_page.on_rows_changed(table)
+    
+    def on_undo_row_edited(self, table: str, row_id: int) -> None:
+        """
+        Refreshes just the edited row in the table's model, if the model has it loaded.
 
-        Raises:
-            Exception: If an error occurs during the connection setup.
+        Args:
+            table (str): The table.
+            row_id (int): The row's id.
 
+        Returns:
+            None
         """
-        try:
-            self.lily_walk_btn.clicked.connect(lambda: add_lily_walk_data(self, {
-                "lily_date": "lily_date", "lily_time": "lily_time",
-                "lily_behavior_slider": "lily_behavior_slider",
-                "lily_gait_slider": "lily_gait_slider",
-                "model": "lily_walk_model"
-            }, self.db_manager.insert_into_wiggles_walks_table, ))
-        except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+        self.refresh_table_model(table, row_id)
+        self.charts_page.on_rows_changed(table)
     
-    def lily_in_room_commit(self):
+    def refresh_table_model(self, table: str, row_id: int = None) -> None:
         """
-        Connects the 'commit_room_time' action to the 'add_time_in_room_data' function,
-        passing the necessary parameters and inserting the data into the time in room table.
+        Refreshes the model showing a table (see TABLE_MODELS). A table model with the edited row
+        loaded refreshes just that row; the query models (the sleep sessions, the mind page's pages)
+        are reselected. A change to diet_table also reloads the food catalog.
 
-        Raises:
-            Exception: If an error occurs during the commit process.
+        Args:
+            table (str): The table.
+            row_id (int): The edited row's id, or None to reselect the whole model.
 
+        Returns:
+            None
         """
-        try:
-            self.actionCommitLilysTimeInRoom.triggered.connect(lambda: add_time_in_room_data(self, {
-                "lily_date": "lily_date", "lily_time": "lily_time", "lily_time_in_room_slider":
-                    "lily_time_in_room_slider", "model": "lily_room_model"
-            }, self.db_manager.insert_into_time_in_room_table))
-        except Exception as e:
-            logger.error(f"Error occurring during in_room commit main_window.py loc. {e}",
-                         exc_info=True)
+        if table == 'diet_table':
+            self.reload_food_catalog()
+        model = getattr(self, TABLE_MODELS.get(table, ''), None)
+        if model is None:
+            return
+        if row_id is not None and hasattr(model, 'selectRow'):
+            id_column = model.fieldIndex('id')
+            for row in range(model.rowCount()):
+                if model.data(model.index(row, id_column)) == row_id:
+                    model.selectRow(row)
+                    return
+            return
+        model.select()
     
-    def add_lily_walk_notes_data(self):
+    def setup_local_api(self) -> None:
         """
-        Connects the `lily_walk_btn` button to the `add_lily_walk_notes` function with specified arguments.
+        Adds the checkable 'Local API Server' action to the Data menu and starts the server if it
+        was on when the app last closed (tkc.API_ENABLED the first time).
 
-        This method sets up the connection between the `lily_walk_btn` button and the `add_lily_walk_notes` function.
-        When the button is clicked, it calls the `add_lily_walk_notes` function with the provided arguments.
+        Returns:
+            None
+        """
+        self.actionLocalApi = QAction("Local API Server", self)
+        self.actionLocalApi.setObjectName("actionLocalApi")
+        self.actionLocalApi.setCheckable(True)
+        self.menuData.addAction(self.actionLocalApi)
+        self.apiWritten.connect(self.on_api_written)
+        if self.settings.value("localApi", tkc.API_ENABLED, type=bool):
+            self.start_local_api()
+        self.actionLocalApi.setChecked(self.api_server is not None)
+        self.actionLocalApi.toggled.connect(self.toggle_local_api)
+    
+    def toggle_local_api(self, enabled: bool) -> None:
+        if enabled and self.api_server is None:
+            if not self.start_local_api():
+                self.actionLocalApi.setChecked(False)
+                QMessageBox.warning(self, "Local API",
+                                    f"Could not listen on {tkc.API_HOST}:{tkc.API_PORT}; see the log.")
+                return
+        elif not enabled and self.api_server is not None:
+            self.stop_local_api()
+        self.settings.setValue("localApi", enabled)
+    
+    def start_local_api(self) -> bool:
+        """
+        Serves the active profile's database on tkc.API_HOST:tkc.API_PORT.
 
-        Args:
-            self: The instance of the main window class.
+        Returns:
+            bool: True if the server is listening.
+        """
+        server = LocalApiServer(self.db_manager.db_path, tkc.API_PORT, on_written=self.apiWritten.emit)
+        if not server.start():
+            return False
+        self.api_server = server
+        self.statusBar().showMessage(f"Local API on http://{tkc.API_HOST}:{server.port}", 5000)
+        return True
+    
+    def stop_local_api(self) -> None:
+        """
+        Stops the server once its queued writes are committed.
 
         Returns:
             None
+        """
+        if self.api_server is not None:
+            self.api_server.stop()
+            self.api_server = None
+    
+    def on_api_written(self, table: str, ids: list) -> None:
+        """
+        Shows rows the local API committed: the insert listeners (charts) get each row and the
+        table's model is reselected.
 
-        Raises:
-            Exception: If an error occurs during the connection setup.
+        Args:
+            table (str): The table written to.
+            ids (list): The new rows' ids.
 
+        Returns:
+            None
         """
         try:
-            self.lily_walk_note_commit_btn.clicked.connect(lambda: add_lily_walk_notes(self, {
-                "lily_date": "lily_date", "lily_time": "lily_time",
-                "lily_walk_note": "lily_walk_note", "model": "lily_walk_note_model"
-            }, self.db_manager.insert_into_lily_walk_notes_table, ))
+            for row_id in ids:
+                self.db_manager.notify_inserted(table, row_id)
+            self.refresh_table_model(table)
         except Exception as e:
-            logger.error(f"An Error has occurred {e}", exc_info=True)
+            logger.error(f"Error showing rows from the local API: {e}", exc_info=True)
     
-    def delete_actions(self):
+    def setup_maintenance(self) -> None:
         """
-        Connects the `actionDelete` trigger to multiple `delete_selected_rows` functions for different tables and models.
+        Starts the idle-time database maintenance scheduler and adds 'Run Maintenance' to the Data menu.
+
+        Returns:
+            None
+        """
+        self.idle_monitor = IdleMonitor(self)
+        QApplication.instance().installEventFilter(self.idle_monitor)
+        self.maintenance = MaintenanceScheduler(self.db_manager.db_path, self.settings, self.idle_monitor, self)
+        self.maintenance.start()
+        
+        self.actionRunMaintenance = QAction("Run Maintenance", self)
+        self.actionRunMaintenance.setObjectName("actionRunMaintenance")
+        self.menuData.addAction(self.actionRunMaintenance)
+        self.actionRunMaintenance.triggered.connect(self.maintenance.run_now)
+    
+    def setup_profiles(self) -> None:
+        """
+        Adds the Profile submenu to the Data menu, with one checkable action per profile and
+        'New Profile...'.
+
+        Returns:
+            None
+        """
+        self.menuProfiles = self.menuData.addMenu("Profile")
+        self.profile_actions = QActionGroup(self)
+        self.profile_actions.setExclusive(True)
+        self.profile_actions.triggered.connect(lambda action: self.switch_profile(action.data()))
+        for profile in self.connections.available_profiles():
+            self.add_profile_action(profile)
+        self.menuProfiles.addSeparator()
+        self.actionNewProfile = QAction("New Profile...", self)
+        self.actionNewProfile.setObjectName("actionNewProfile")
+        self.menuProfiles.addAction(self.actionNewProfile)
+        self.actionNewProfile.triggered.connect(self.new_profile)
+    
+    def add_profile_action(self, profile: str) -> QAction:
+        action = QAction(profile, self)
+        action.setData(profile)
+        action.setCheckable(True)
+        action.setChecked(profile == self.profile)
+        self.profile_actions.addAction(action)
+        separator = next((a for a in self.menuProfiles.actions() if a.isSeparator()), None)
+        self.menuProfiles.insertAction(separator, action)
+        return action
+    
+    def new_profile(self) -> None:
+        """
+        Asks for a profile name, creates the profile's database and switches to it.
+
+        Returns:
+            None
         """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'sleep_tableview',
-                    'sleep_model'
-                )
-            )
-        except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
-        try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'total_hours_slept_tableview',
-                    'total_hours_slept_model'
-                )
-            )
-        except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
-        try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'woke_up_like_tableview',
-                    'woke_up_like_model'
-                )
-            )
-        except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
-        try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'sleep_quality_tableview',
-                    'sleep_quality_model'
-                )
-            )
-        except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
-        try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'shower_table',
-                    'shower_model'
-                )
-            )
-        except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
-        try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'teethbrushed_table',
-                    'tooth_model'
-                )
-            )
+            name, ok = QInputDialog.getText(self, "New Profile", "Profile name:")
+            profile = profile_key(name)
+            if not ok or not profile:
+                return
+            if profile not in self.connections.available_profiles():
+                self.connections.get(profile)
+                self.add_profile_action(profile)
+            self.switch_profile(profile)
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"Error creating profile: {e}", exc_info=True)
+    
+    def switch_profile(self, profile: str) -> None:
+        """
+        Makes another profile active without restarting.
+
+        The profile's connection stays open in the registry and its models, food catalog and
+        chart series are cached, so switching back to a profile used before reloads nothing.
+
+        Args:
+            profile (str): The profile to switch to.
+        """
+        if profile == self.profile:
+            return
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'yoga_table',
-                    'exercise_model'
-                )
-            )
+            self.profile = profile
+            self.db_manager = self.connections.get(profile)
+            self.pet_id = self.saved_pet_id()
+            if self.charts_page.on_row_inserted not in self.db_manager.insert_listeners:
+                self.db_manager.insert_listeners.append(self.charts_page.on_row_inserted)
+            self.setup_models()
+            self.load_food_catalog()
+            self.search_page.set_db_manager(self.db_manager)
+            self.mind_page.set_database(self.db_manager.db)
+            self.charts_page.pet_id = self.pet_id
+            self.charts_page.set_db_manager(self.db_manager)
+            self.maintenance.db_path = self.db_manager.db_path
+            for action in self.profile_actions.actions():
+                action.setChecked(action.data() == profile)
+            self.populate_pet_menu()
+            self.reminders.db_manager = self.db_manager
+            self.reminders.pet_id = self.pet_id
+            self.reminders.reload()
+            self.populate_reminder_menu()
+            self.activate_undo_history()
+            if self.api_server is not None:
+                self.stop_local_api()
+                self.start_local_api()
+            self.settings.setValue("currentProfile", profile)
+            logger.info(f"Switched to profile {profile} ({profile_db_path(profile)})")
+            self.backup_if_due()
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"Error switching to profile {profile}: {e}", exc_info=True)
+    
+    def saved_pet_id(self) -> int:
+        """
+        Returns:
+            int: The pet last chosen in the active profile, if it still exists, else Lily.
+        """
+        pet_id = self.settings.value(f"currentPet/{self.profile}", DEFAULT_PET_ID, type=int)
+        if pet_id not in dict(self.db_manager.fetch_pets()):
+            pet_id = DEFAULT_PET_ID
+        return pet_id
+    
+    def setup_pets(self) -> None:
+        """
+        Adds the Pet submenu to the Tracker menu for choosing which pet the Lily pages log and show.
+
+        Returns:
+            None
+        """
+        self.menuPets = self.menuTracker.addMenu("Pet")
+        self.pet_actions = QActionGroup(self)
+        self.pet_actions.setExclusive(True)
+        self.pet_actions.triggered.connect(lambda action: self.switch_pet(action.data()))
+        self.actionAddPet = QAction("Add Pet...", self)
+        self.actionAddPet.setObjectName("actionAddPet")
+        self.actionAddPet.triggered.connect(self.add_pet)
+        self.populate_pet_menu()
+    
+    def populate_pet_menu(self) -> None:
+        """
+        Fills the Pet submenu with the active profile's pets.
+
+        Returns:
+            None
+        """
+        self.menuPets.clear()
+        for action in self.pet_actions.actions():
+            self.pet_actions.removeAction(action)
+        for pet_id, pet_name in self.db_manager.fetch_pets():
+            action = QAction(pet_name, self)
+            action.setData(pet_id)
+            action.setCheckable(True)
+            action.setChecked(pet_id == self.pet_id)
+            self.pet_actions.addAction(action)
+            self.menuPets.addAction(action)
+        self.menuPets.addSeparator()
+        self.menuPets.addAction(self.actionAddPet)
+    
+    def add_pet(self) -> None:
+        """
+        Asks for a pet's name, adds the pet and switches to it.
+
+        Returns:
+            None
+        """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'diet_table',
-                    'diet_model'
-                )
-            )
+            name, ok = QInputDialog.getText(self, "Add Pet", "Pet name:")
+            if not ok or not name.strip():
+                return
+            pet_id = self.db_manager.add_pet(name)
+            if pet_id < 0:
+                return
+            self.switch_pet(pet_id)
+            self.populate_pet_menu()
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"Error adding pet: {e}", exc_info=True)
+    
+    def switch_pet(self, pet_id: int) -> None:
+        """
+        Makes the Lily pages log and show another pet's rows.
+
+        Args:
+            pet_id (int): The pet to switch to.
+        """
+        self.pet_id = pet_id
+        self.settings.setValue(f"currentPet/{self.profile}", pet_id)
+        self.apply_pet_filter()
+        self.charts_page.set_pet(pet_id)
+        self.reminders.pet_id = pet_id
+        for action in self.pet_actions.actions():
+            action.setChecked(action.data() == pet_id)
+    
+    def setup_reminders(self) -> None:
+        """
+        Starts the reminder scheduler and adds the Reminders submenu to the Tracker menu, with a
+        checkable action per reminder to turn it on or off.
+
+        Reminders show as tray notifications where there is a system tray, otherwise in the status
+        bar with the window flagged for attention.
+
+        Returns:
+            None
+        """
+        self.reminders = ReminderScheduler(self.db_manager, self)
+        self.reminders.pet_id = self.pet_id
+        self.reminders.reminderDue.connect(self.show_reminder)
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(QApplication.windowIcon(), self)
+            self.tray_icon.show()
+        self.menuReminders = self.menuTracker.addMenu("Reminders")
+        self.menuReminders.triggered.connect(
+            lambda action: self.reminders.set_enabled(action.data(), action.isChecked()))
+        self.reminders.reload()
+        self.populate_reminder_menu()
+    
+    def populate_reminder_menu(self) -> None:
+        """
+        Fills the Reminders submenu with the active profile's reminders.
+
+        Returns:
+            None
+        """
+        self.menuReminders.clear()
+        for reminder_id, reminder in self.reminders.reminders.items():
+            action = QAction(reminder['title'], self.menuReminders)
+            action.setData(reminder_id)
+            action.setCheckable(True)
+            action.setChecked(bool(reminder['enabled']))
+            self.menuReminders.addAction(action)
+    
+    def show_reminder(self, reminder: dict) -> None:
+        if self.tray_icon is not None:
+            self.tray_icon.showMessage(tkc.APPLICATION_NAME, reminder['title'])
+        else:
+            self.statusBar().showMessage(reminder['title'], 10 * 60 * 1000)
+            QApplication.alert(self)
+        logger.info(f"Reminder: {reminder['title']}")
+    
+    def apply_pet_filter(self) -> None:
+        """
+        Filters the pet table models to the current pet's rows and hides their pet_id column.
+
+        Returns:
+            None
+        """
+        for model_name, table_name, view_name in MODEL_BINDINGS:
+            if table_name in PET_TABLES:
+                model = getattr(self, model_name)
+                model.setFilter(f"pet_id = {int(self.pet_id)} AND {LIVE_ROWS}")
+                getattr(self, view_name).hideColumn(model.fieldIndex('pet_id'))
+
+    def on_page_changed(self, index):
+        """
+        Callback method triggered when the page is changed in the UI.
+
+        Args:
+            index (int): The index of the new page.
+        """
+        self.settings.setValue("lastPageIndex", index)
+    
+    def calculate_total_hours_slept(self) -> None:
+        """
+        Calculates the total hours slept from the asleep and awake times.
+
+        The duration is worked out in whole minutes by sleep_duration_minutes, which wraps
+        past midnight, and shown in the total_hours_slept lineEdit in HH:mm format.
+
+        Raises:
+            Exception: If an error occurs while calculating the total hours slept.
+
+        """
+        
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'hydration_table',
-                    'hydro_model'
-                )
-            )
+            total_minutes = sleep_duration_minutes(self.time_asleep.time(), self.time_awake.time())
+            self.total_hrs_slept = format_minutes(total_minutes)
+            self.total_hours_slept.setText(self.total_hrs_slept)
+        
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"Error occurred while calculating total hours slept {e}", exc_info=True)
+    
+    def recompute_sleep_durations(self) -> None:
+        """
+        Recomputes sleep_minutes for every sleep_table row in one pass and refreshes the sleep views.
+
+        Returns:
+            None
+        """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'lily_walk_table',
-                    'lily_walk_model'
-                )
-            )
+            updated = self.db_manager.backfill_sleep_minutes(recompute_all=True)
+            logger.info(f"Recomputed sleep_minutes for {updated} sleep_table rows")
+            self.sleep_sessions_model.select()
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"Error recomputing sleep durations {e}", exc_info=True)
+    
+    #############################################################################################
+    # Agenda Journal Navigation
+    #############################################################################################
+    def stack_navigation(self):
+        """
+        Handles the stack navigation for the main window.
+
+        This method maps actions and buttons to stack page indices for the agenda journal.
+        It connects the actions to the corresponding pages in the stack.
+
+        Raises:
+            Exception: If an error occurs during the stack navigation.
+
+        """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'lily_diet_table',
-                    'lily_diet_model'
-                )
-            )
+            # Mapping actions and buttons to stack page indices for the agenda journal
+            mainStackNavvy = {
+                self.actionBDSInput: 0, self.actionSleepDataView: 1,
+                self.actionDietDataView: 2, self.actionBasicsDataView: 3,
+                self.actionLilysPage: 4, self.actionLilyDataView: 5,
+            }
+            
+            # Main Stack Navigation
+            for action, page in mainStackNavvy.items():
+                action.triggered.connect(
+                    lambda _, p=page: change_mainStack(self.mainStack, p))
+        
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"An error has occurred: {e}", exc_info=True)
+    
+    def setup_food_catalog(self) -> None:
+        """
+        Loads the food catalog into memory and attaches its completer to the food_eaten field.
+
+        Raises:
+            Exception: If there is an error setting up the food catalog.
+
+        """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'lily_mood_table',
-                    'lily_mood_model'
-                )
-            )
+            self.load_food_catalog()
+            connect_food_completer(self.food_eaten, self.calories, lambda: self.food_catalog,
+                                   self.correct_food_calories)
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"Error setting up food catalog: {e}", exc_info=True)
+    
+    def load_food_catalog(self) -> None:
+        """
+        Makes the active profile's food catalog current, loading it from the database the first time.
+
+        Returns:
+            None
+        """
+        self.food_catalog = self.food_catalogs.get(self.profile)
+        if self.food_catalog is None:
+            self.food_catalog = FoodCatalog(self.db_manager.fetch_food_catalog())
+            self.food_catalogs[self.profile] = self.food_catalog
+    
+    def reload_food_catalog(self) -> None:
+        """
+        Reads the active profile's food catalog again, after its diet rows changed other than by
+        insert_diet_entry (undo, redo, the local API, a restore).
+
+        Returns:
+            None
+        """
+        self.food_catalogs.pop(self.profile, None)
+        self.load_food_catalog()
+    
+    def correct_food_calories(self, food_name: str, calories: int) -> None:
+        """
+        Saves calories the user typed over the ones filled in for a food, so the food is filled
+        with them from now on.
+
+        Args:
+            food_name (str): The food.
+            calories (int): Its corrected calories.
+
+        Returns:
+            None
+        """
+        if self.db_manager.upsert_food_catalog(food_name, calories) and self.food_catalog is not None:
+            self.food_catalog.set_calories(food_name, calories)
+    
+    def insert_diet_entry(self, diet_date, diet_time, food_eaten, calories, validated: bool = False) -> bool:
+        """
+        Inserts a diet entry and records the food in the in-memory food catalog.
+
+        The food_catalog table is updated by its trigger; this keeps the completer in step
+        without reloading the catalog.
+
+        Args:
+            diet_date (str): The date of the entry.
+            diet_time (str): The time of the entry.
+            food_eaten (str): The food eaten.
+            calories (int): The calories eaten.
+            validated (bool): True if the values were already checked by validate_values.
+
+        Returns:
+            bool: True if the entry was inserted.
+        """
+        if not self.db_manager.insert_into_diet_table(diet_date, diet_time, food_eaten, calories,
+                                                      validated=validated):
+            return False
+        if self.food_catalog is not None:
+            self.food_catalog.record(food_eaten, calories)
+        return True
+    
+    def commit_hydration(self, amount) -> CommitResult:
+        """
+        Commits the hydration data to the database. A second click of the same cup within
+        tkc.COMMIT_REPEAT_WINDOW_SECONDS is ignored (see commit_guard).
+
+        Args:
+            amount (int): The amount of water in ounces.
+
+        Raises:
+            Exception: If an error occurs while committing the hydration data.
+
+        Returns:
+            CommitResult: What the commit did.
+        """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'time_in_room_table',
-                    'lily_room_model'
-                )
-            )
+            date = self.day_clock.today().toString("yyyy-MM-dd")
+            time = QTime.currentTime().toString("hh:mm:ss")
+            values = [date, time, amount]
+            if self.db_manager.commit_guard.is_repeat('hydration_table', values):
+                return CommitResult.REPEATED
+            if not self.db_manager.insert_into_hydration_table(*values):
+                return CommitResult.FAILED
+            self.db_manager.commit_guard.remember('hydration_table', values)
+            logger.info(f"Committed {amount} oz of water at {date} {time}")
+            self.hydro_model.select()
+            return CommitResult.COMMITTED
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"Error committing hydration data: {e}", exc_info=True)
+            return CommitResult.FAILED
+    
+    def guard_reset_form(self, table_name: str) -> None:
+        """
+        Marks a form's reset values as just committed, so the second click of a double click, which
+        finds the form already reset, is ignored like any other repeated commit.
+
+        The values are remembered as the widgets show them. commit_forms checks what the forms
+        show before it validates anything, so a second click is recognized without validating
+        the reset forms at all.
+
+        Args:
+            table_name (str): The form's table, a key of FORMS.
+        """
+        self.db_manager.commit_guard.remember(table_name, self.form_bindings.values(table_name))
+    
+    def delete_actions(self):
+        """
+        Connects the `actionDelete` trigger to delete_selection.
+        """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'lily_notes_table',
-                    'lily_note_model'
-                )
-            )
+            self.actionDelete.triggered.connect(self.delete_selection)
         except Exception as e:
             logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+    
+    def delete_selection(self) -> None:
+        """
+        Deletes the rows selected in every data view as one undoable step.
+
+        Returns:
+            None
+        """
         try:
-            self.actionDelete.triggered.connect(
-                lambda: delete_selected_rows(
-                    self,
-                    'lily_walk_note_table',
-                    'lily_walk_note_model'
-                )
-            )
+            row_ids = {}
+            for model_name, table_name, view_name in MODEL_BINDINGS:
+                ids = selected_row_ids(getattr(self, view_name), getattr(self, model_name))
+                if ids:
+                    row_ids[table_name] = ids
+            for view_name, table_name, _ in SLEEP_VIEWS:
+                # a night selected in a sleep view deletes that view's entry of the night
+                ids = selected_row_ids(getattr(self, view_name), self.sleep_sessions_model,
+                                       ROW_ID_COLUMNS[table_name])
+                if ids:
+                    row_ids[table_name] = ids
+            if row_ids:
+                self.undo_history.delete_rows(row_ids)
         except Exception as e:
-            logger.error(f"Error setting up delete actions: {e}", exc_info=True)
+            logger.error(f"An error occurred while deleting records: {e}", exc_info=True)
     
     def setup_models(self) -> None:
         """
         Set up models for various tables in the main window.
 
-        This method creates and sets models for different tables in the main window.
-        It uses the `create_and_set_model` function to create and set the models.
+        The models of each profile are created once, on that profile's connection, and cached in
+        profile_models; later calls for the same profile only put the cached models back on the
+        views. Attribute names stay the same (e.g. self.diet_model), so everything that looks a
+        model up by name follows the active profile. The sleep views share sleep_sessions_model,
+        each showing only its SLEEP_VIEWS columns.
 
         Raises:
             Exception: If there is an error setting up the models.
 
         """
         try:
-            self.sleep_model = create_and_set_model(
-                "sleep_table",
-                self.sleep_tableview
-            )
-            
-            self.total_hours_slept_model = create_and_set_model(
-                "total_hours_slept_table",
-                self.total_hours_slept_tableview
-            )
-            
-            self.woke_up_like_model = create_and_set_model(
-                "woke_up_like_table",
-                self.woke_up_like_tableview)
-            
-            self.sleep_quality_model = create_and_set_model(
-                "sleep_quality_table",
-                self.sleep_quality_tableview)
-            
-            self.shower_model = create_and_set_model(
-                "shower_table",
-                self.shower_table
-            )
-            # SLEEP: model creates and set
-            
-            self.tooth_model = create_and_set_model(
-                "tooth_table",
-                self.teethbrushed_table
-            )
-            
-            self.exercise_model = create_and_set_model(
-                "exercise_table",
-                self.yoga_table
-            )
-            
-            self.diet_model = create_and_set_model(
-                "diet_table",
-                self.diet_table
-            )
-            
-            self.hydro_model = create_and_set_model(
-                "hydration_table",
-                self.hydration_table
-            )
-            
-            self.lily_diet_model = create_and_set_model(
-                "lily_diet_table",
-                self.lily_diet_table)
-            
-            self.lily_mood_model = create_and_set_model(
-                "lily_mood_table",
-                self.lily_mood_table)
-            
-            self.lily_walk_model = create_and_set_model(
-                "lily_walk_table",
-                self.lily_walk_table)
-            
-            self.lily_room_model = create_and_set_model(
-                "lily_in_room_table",
-                self.time_in_room_table)
-            
-            self.lily_note_model = create_and_set_model(
-                "lily_notes_table",
-                self.lily_notes_table)
-            
-            self.lily_walk_note_model = create_and_set_model(
-                "lily_walk_notes_table",
-                self.lily_walk_note_table)
+            models = self.profile_models.get(self.profile)
+            if models is None:
+                models = {
+                    model_name: create_and_set_model(table_name, getattr(self, view_name), self.db_manager.db)
+                    for model_name, table_name, view_name in MODEL_BINDINGS
+                }
+                models['sleep_sessions_model'] = SleepSessionsModel(self.db_manager.db, self)
+                if not models['sleep_sessions_model'].select():
+                    raise RuntimeError("could not select sleep_sessions")
+                self.profile_models[self.profile] = models
+                for model in models.values():
+                    model.cellEdited.connect(self.record_edit)
+            else:
+                for model_name, _, view_name in MODEL_BINDINGS:
+                    getattr(self, view_name).setModel(models[model_name])
+            for model_name, model in models.items():
+                setattr(self, model_name, model)
+            for view_name, _, columns in SLEEP_VIEWS:
+                view = getattr(self, view_name)
+                view.setModel(self.sleep_sessions_model)
+                record = self.sleep_sessions_model.record()
+                for column in range(record.count()):
+                    view.setColumnHidden(column, record.fieldName(column) not in columns)
+            self.apply_pet_filter()
         except Exception as e:
             logger.error(f"Error setting up models: {e}", exc_info=True)
     
@@ -1113,63 +1853,15 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         """
         Saves the state of the main window.
 
-        This method saves the values of various sliders, inputs, and other UI elements
-        as well as the window geometry and state to the application settings.
+        The persisted form widgets are saved through the form bindings, followed by the window
+        geometry and state.
 
         Raises:
             Exception: If there is an error while saving the state.
 
         """
-        try:
-            self.settings.setValue(
-                'lily_time_in_room_slider',
-                self.lily_time_in_room_slider.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue(
-                'lily_mood_slider',
-                self.lily_mood_slider.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue(
-                'lily_mood_activity_slider',
-                self.lily_mood_activity_slider.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue('lily_energy_slider', self.lily_energy_slider.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue('lily_time_in_room', self.lily_time_in_room.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue('lily_mood', self.lily_mood.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue('lily_activity', self.lily_activity.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue('lily_energy', self.lily_energy.value())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.settings.setValue('lily_notes', self.lily_notes.toHtml())
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
+        if self.form_bindings is not None:
+            self.form_bindings.save_state(self.settings)
         
         try:
             self.settings.setValue("geometry", self.saveGeometry())
@@ -1185,69 +1877,14 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         """
         Restores the state of the main window by retrieving values from the settings.
 
-        This method restores the values of various sliders, text fields, and window geometry
-        from the settings. If an error occurs during the restoration process, it is logged
-        with the corresponding exception.
+        The persisted form widgets are restored through the form bindings, then the window
+        geometry and state. Errors are logged per widget, so one bad value doesn't stop the rest.
 
         Returns:
             None
         """
-        try:
-            self.lily_time_in_room_slider.setValue(
-                self.settings.value(
-                    'lily_time_in_room_slider',
-                    0,
-                    type=int
-                )
-            )
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_mood_slider.setValue(self.settings.value('lily_mood_slider', 0, type=int))
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_mood_activity_slider.setValue(
-                self.settings.value(
-                    'lily_mood_activity_slider',
-                    0,
-                    type=int
-                )
-            )
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_energy_slider.setValue(self.settings.value('lily_energy_slider', 0, type=int))
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_time_in_room.setValue(self.settings.value('lily_time_in_room', 0, type=int))
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_mood.setValue(self.settings.value('lily_mood', 0, type=int))
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_activity.setValue(self.settings.value('lily_activity', 0, type=int))
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_energy.setValue(self.settings.value('lily_energy', 0, type=int))
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
-        
-        try:
-            self.lily_notes.setHtml(self.settings.value('lily_notes', "", type=str))
-        except Exception as e:
-            logger.error(f'{e}', exc_info=True)
+        if self.form_bindings is not None:
+            self.form_bindings.restore_state(self.settings)
         
         try:
             # restore window geometry state
@@ -1265,7 +1902,8 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
         Event handler for the close event of the main window.
 
         This method is called when the user tries to close the main window.
-        It saves the state of the application before closing.
+        It saves the state of the application, stops the timers and the local API, and then closes
+        the database connection of every opened profile.
 
         Args:
             event (QCloseEvent): The close event object.
@@ -1277,3 +1915,11 @@ class MainWindow(FramelessWindow, QtWidgets.QMainWindow, Ui_MainWindow):
             self.save_state()
         except Exception as e:
             logger.error(f"error saving state during closure: {e}", exc_info=True)
+        for scheduler in (self.reminders, self.maintenance, self.backup_timer):
+            if scheduler is not None:
+                scheduler.stop()
+        self.stop_local_api()
+        try:
+            self.connections.close_all()
+        except Exception as e:
+            logger.error(f"error closing the database connections: {e}", exc_info=True)
@@ -0,0 +1,214 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PyQt6.QtSql import QSqlQuery
+from PyQt6.QtWidgets import QComboBox, QLabel, QVBoxLayout, QWidget
+
+from database.table_specs import PET_TABLES
+from logger_setup import logger
+from ui.pages.series_plot import SeriesBuffer, SeriesPlot
+from utility.app_operations.analytics import METRICS, load_metrics
+from utility.app_operations.background_worker import run_in_background
+
+# Series offered on the charts page: metric name -> label
+CHART_SERIES = {
+    'lily_mood': "Lily Mood",
+    'lily_energy': "Lily Energy",
+    'lily_activity': "Lily Activity",
+    'hydration': "Hydration (oz)",
+    'hours_slept': "Hours Slept",
+    'calories': "Calories",
+}
+
+
+def load_chart_series(db_path: str, pet_id: Optional[int] = None) -> Dict[str, SeriesBuffer]:
+    """
+    Loads the full history of every chart series; runs in a worker thread.
+
+    :param db_path: The path of the database file.
+    :param pet_id: The pet the pet series are of (see load_metrics).
+    :return: metric name -> SeriesBuffer with x in days since 1970-01-01.
+    """
+    loaded = load_metrics(db_path, list(CHART_SERIES), '0000-01-01', '9999-12-31', pet_id)
+    return {name: SeriesBuffer(days.astype(np.int64).astype(np.float64), values)
+            for name, (days, values) in loaded.items()}
+
+
+class ChartsPage(QWidget):
+    """
+    A mainStack page plotting one tracker series at a time.
+
+    The history is loaded once in the background. After that, each committed row is appended
+    to its series through on_row_inserted, which DataManager calls after every insert.
+    """
+
+    def __init__(self, db_manager, parent=None) -> None:
+        super().__init__(parent)
+        self.db_manager = db_manager
+        # The pet whose rows the pet series show, None for every pet's
+        self.pet_id: Optional[int] = None
+        self.setObjectName("charts_page")
+        self.series: Dict[str, SeriesBuffer] = {}
+        # (db path, pet id) -> loaded series, for the profiles and pets shown before
+        self.series_cache: Dict[Tuple[str, Optional[int]], Dict[str, SeriesBuffer]] = {}
+        self.loading = False
+
+        self.series_picker = QComboBox(parent=self)
+        self.series_picker.setObjectName("chart_series_picker")
+        for name, label in CHART_SERIES.items():
+            self.series_picker.addItem(label, name)
+        self.plot = SeriesPlot(parent=self)
+        self.plot.setObjectName("chart_plot")
+        self.status_label = QLabel(parent=self)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.series_picker)
+        layout.addWidget(self.plot, 1)
+        layout.addWidget(self.status_label)
+
+        self.series_picker.currentIndexChanged.connect(self.show_current_series)
+
+    def load(self) -> None:
+        """
+        Loads the chart history in the background, once.
+
+        Returns:
+            None
+        """
+        if self.series or self.loading:
+            return
+        self.loading = True
+        self.status_label.setText("Loading...")
+        key = self.cache_key()
+        run_in_background(load_chart_series, *key,
+                          on_result=lambda series: self.on_series_loaded(series, key),
+                          on_error=self.on_load_error)
+
+    def cache_key(self) -> Tuple[str, Optional[int]]:
+        return self.db_manager.db_path, self.pet_id
+
+    def on_series_loaded(self, series: Dict[str, SeriesBuffer], key: Tuple[str, Optional[int]]) -> None:
+        self.loading = False
+        self.series_cache[key] = series
+        if key == self.cache_key():
+            self.series = series
+            self.show_current_series()
+        elif self.isVisible():
+            self.show_cached()  # the profile or pet changed while loading
+
+    def set_db_manager(self, db_manager) -> None:
+        """
+        Shows another profile's database, reusing its series if they were loaded before.
+
+        Args:
+            db_manager: The DataManager of the active profile.
+        """
+        self.db_manager = db_manager
+        self.show_cached()
+
+    def set_pet(self, pet_id: Optional[int]) -> None:
+        """
+        Shows another pet's rows in the pet series, reusing them if they were loaded before.
+
+        Args:
+            pet_id (Optional[int]): The pet, or None for every pet's rows.
+        """
+        self.pet_id = pet_id
+        self.show_cached()
+
+    def show_cached(self) -> None:
+        """
+        Shows the series of the active database and pet if they were loaded before, otherwise
+        loads them if the page is showing.
+
+        Returns:
+            None
+        """
+        self.series = self.series_cache.get(self.cache_key(), {})
+        if self.series:
+            self.show_current_series()
+        else:
+            self.plot.set_series(SeriesBuffer())
+            self.status_label.clear()
+            if self.isVisible():
+                self.load()
+
+    def on_load_error(self, message: str) -> None:
+        self.loading = False
+        self.status_label.setText(f"Could not load charts: {message}")
+
+    def show_current_series(self) -> None:
+        """
+        Shows the series chosen in the picker.
+
+        Returns:
+            None
+        """
+        name = self.series_picker.currentData()
+        series = self.series.get(name)
+        if series is None:
+            return
+        self.plot.set_series(series)
+        self.status_label.setText(f"{len(series)} points")
+
+    def on_rows_changed(self, table: str) -> None:
+        """
+        Drops the loaded history if a chart reads a table whose rows were removed or rewritten (by
+        undo or redo); it is loaded again the next time the page is shown, or now if it is showing.
+
+        Args:
+            table (str): The table that changed.
+        """
+        if not self.series or all(METRICS[name][0] != table for name in CHART_SERIES):
+            return
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Drops the loaded history of the active database and pet; it is loaded again the next time the page is
+        shown, or now if it is showing.
+
+        Returns:
+            None
+        """
+        self.series = {}
+        self.series_cache.pop(self.cache_key(), None)
+        self.plot.set_series(SeriesBuffer())
+        if self.isVisible():
+            self.load()
+
+    def on_row_inserted(self, table: str, row_id: int) -> None:
+        """
+        Appends a newly committed row to every loaded series it feeds.
+
+        The row is read back by primary key using the same SQL expressions as the history load.
+
+        Args:
+            table (str): The table the row was inserted into.
+            row_id (int): The id of the new row.
+        """
+        if not self.series:
+            return
+        try:
+            for name in CHART_SERIES:
+                metric_table, date_column, expression, _ = METRICS[name]
+                if metric_table != table:
+                    continue
+                pet_filter = " AND pet_id = ?" if self.pet_id is not None and table in PET_TABLES else ""
+                query = QSqlQuery(self.db_manager.db)
+                query.prepare(f"SELECT {date_column}, CAST({expression} AS REAL) FROM {table} "
+                              f"WHERE id = ?{pet_filter}")
+                query.addBindValue(row_id)
+                if pet_filter:
+                    query.addBindValue(self.pet_id)
+                if not query.exec() or not query.next() or query.isNull(1):
+                    continue
+                x = float(np.datetime64(query.value(0), 'D').astype(np.int64))
+                y = float(query.value(1))
+                if name == self.series_picker.currentData():
+                    self.plot.append_point(x, y)
+                    self.status_label.setText(f"{len(self.series[name])} points")
+                else:
+                    self.series[name].append(x, y)
+        except Exception as e:
+            logger.error(f"Error adding row to charts: {e}", exc_info=True)
@@ -0,0 +1,114 @@
+from typing import Dict, Tuple
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtSql import QSqlDatabase
+from PyQt6.QtWidgets import (QAbstractSpinBox, QDateEdit, QFormLayout, QGroupBox, QHBoxLayout, QPushButton,
+                             QSlider, QSpinBox, QTabWidget, QTimeEdit, QVBoxLayout, QWidget)
+
+import tracker_config as tkc
+from ui.pages.paged_table import PagedQueryModel, PagedTableView
+
+# section: (title, table, date column, time column, (slider attribute, label) pairs)
+MIND_SECTIONS = {
+    'mental_mental': ("Mood", 'mental_mental_table', 'mental_mental_date', 'mental_mental_time', (
+        ('mood_slider', "Mood"),
+        ('mania_slider', "Mania"),
+        ('depression_slider', "Depression"),
+        ('mixed_risk_slider', "Mixed risk"),
+    )),
+    'cspr': ("Calm / Stress / Pain / Rage", 'cspr_table', 'cspr_date', 'cspr_time', (
+        ('calm_slider', "Calm"),
+        ('stress_slider', "Stress"),
+        ('pain_slider', "Pain"),
+        ('rage_slider', "Rage"),
+    )),
+    'wefe': ("Wellbeing / Excitement / Focus / Energy", 'wefe_table', 'wefe_date', 'wefe_time', (
+        ('wellbeing_slider', "Wellbeing"),
+        ('excite_slider', "Excitement"),
+        ('focus_slider', "Focus"),
+        ('energy_slider', "Energy"),
+    )),
+}
+
+
+class MindPage(QWidget):
+    """
+    A mainStack page for the mind tracker: one form per mind table and a paged view of each.
+
+    The sliders are attributes named after their table columns (mood_slider, calm_slider, ...), which
+    match the FORMS bindings in utility/app_operations/form_bindings.py. The date and time edits come from the generated UI, which
+    defines them on its datetimes page, and are moved into their forms here.
+
+    Attributes:
+        commit_button (QPushButton): Commits all three forms.
+        models (Dict[str, PagedQueryModel]): section -> paged model of its table.
+        summing_box (QSpinBox): The sum of the wefe sliders.
+    """
+
+    def __init__(self,
+                 db: QSqlDatabase,
+                 date_time_edits: Dict[str, Tuple[QDateEdit, QTimeEdit]],
+                 parent=None) -> None:
+        """
+        Args:
+            db (QSqlDatabase): The connection the data views read from.
+            date_time_edits (dict): section -> (date edit, time edit) from the generated UI.
+            parent: The parent widget.
+        """
+        super().__init__(parent)
+        self.setObjectName("mind_page")
+        self.models: Dict[str, PagedQueryModel] = {}
+
+        forms = QHBoxLayout()
+        data_tabs = QTabWidget(parent=self)
+        for section, (title, table, date_column, time_column, sliders) in MIND_SECTIONS.items():
+            group = QGroupBox(title, parent=self)
+            form = QFormLayout(group)
+            date_edit, time_edit = date_time_edits[section]
+            date_edit.setParent(group)
+            time_edit.setParent(group)
+            form.addRow("Date", date_edit)
+            form.addRow("Time", time_edit)
+            for attribute, label in sliders:
+                slider = QSlider(Qt.Orientation.Horizontal, parent=group)
+                slider.setObjectName(attribute)
+                slider.setRange(0, tkc.MIND_SLIDER_MAX)
+                slider.setTickPosition(QSlider.TickPosition.TicksBelow)
+                setattr(self, attribute, slider)
+                form.addRow(label, slider)
+            if section == 'wefe':
+                self.summing_box = QSpinBox(parent=group)
+                self.summing_box.setObjectName("summing_box")
+                self.summing_box.setRange(0, tkc.MIND_SLIDER_MAX * len(sliders))
+                self.summing_box.setReadOnly(True)
+                self.summing_box.setButtonSymbols(QAbstractSpinBox.ButtonSymbols.NoButtons)
+                form.addRow("Total", self.summing_box)
+                for attribute, _ in sliders:
+                    getattr(self, attribute).valueChanged.connect(self.update_wefe_sum)
+            forms.addWidget(group)
+
+            model = PagedQueryModel(table, date_column, time_column, db, tkc.MIND_PAGE_SIZE, parent=self)
+            self.models[section] = model
+            data_tabs.addTab(PagedTableView(model, parent=data_tabs), title.split(' /')[0])
+
+        self.commit_button = QPushButton("Commit", parent=self)
+        self.commit_button.setObjectName("mind_commit_button")
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(forms)
+        layout.addWidget(self.commit_button)
+        layout.addWidget(data_tabs, 1)
+
+    def update_wefe_sum(self) -> None:
+        self.summing_box.setValue(sum(getattr(self, attribute).value()
+                                      for attribute, _ in MIND_SECTIONS['wefe'][4]))
+
+    def set_database(self, db: QSqlDatabase) -> None:
+        """
+        Shows another profile's mind tables.
+
+        Args:
+            db (QSqlDatabase): The active profile's connection.
+        """
+        for model in self.models.values():
+            model.set_database(db)
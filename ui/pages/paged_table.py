@@ -0,0 +1,139 @@
+from typing import List, Optional, Tuple
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtSql import QSqlDatabase, QSqlQuery, QSqlQueryModel
+from PyQt6.QtWidgets import QAbstractItemView, QHBoxLayout, QLabel, QPushButton, QTableView, QVBoxLayout, QWidget
+
+from database.table_specs import LIVE_ROWS
+from logger_setup import logger
+
+
+class PagedQueryModel(QSqlQueryModel):
+    """
+    A read-only model showing one page of a table's live rows, newest first.
+
+    Pages are found by keyset rather than OFFSET: each page starts below the (date, time, id) of the
+    last row of the page before it, so with a (date, time) index every page costs the same however
+    deep it is. select() reloads the first page, so the model can stand in for a QSqlTableModel in
+    the commit helpers that refresh it.
+
+    Attributes:
+        pageChanged: Emitted after a page has been loaded.
+    """
+
+    pageChanged = pyqtSignal()
+
+    def __init__(self,
+                 table_name: str,
+                 date_column: str,
+                 time_column: str,
+                 db: QSqlDatabase,
+                 page_size: int = 50,
+                 parent=None) -> None:
+        super().__init__(parent)
+        self.table_name = table_name
+        self.date_column = date_column
+        self.time_column = time_column
+        self.db = db
+        self.page_size = page_size
+        # Keyset each page shown so far starts after (None for the first); the last is the current page
+        self._page_starts: List[Optional[Tuple[str, str, int]]] = [None]
+        self._has_next = False
+
+    @property
+    def page_number(self) -> int:
+        return len(self._page_starts)
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return len(self._page_starts) > 1
+
+    def set_database(self, db: QSqlDatabase) -> None:
+        self.db = db
+        self.select()
+
+    def select(self) -> bool:
+        self._page_starts = [None]
+        return self._load()
+
+    def next_page(self) -> None:
+        if self._has_next:
+            self._page_starts.append(self._last_keyset())
+            if not self._load():
+                self._page_starts.pop()
+
+    def previous_page(self) -> None:
+        if self.has_previous():
+            self._page_starts.pop()
+            self._load()
+
+    def _last_keyset(self) -> Tuple[str, str, int]:
+        last = self.record(self.rowCount() - 1)
+        return last.value(self.date_column), last.value(self.time_column), last.value('id')
+
+    def _page_query(self, columns: str, after: Optional[Tuple[str, str, int]], limit: int) -> QSqlQuery:
+        keyset = f"{self.date_column}, {self.time_column}, id"
+        where = f"WHERE {LIVE_ROWS} " + (f"AND ({keyset}) < (?, ?, ?) " if after is not None else "")
+        query = QSqlQuery(self.db)
+        query.prepare(f"SELECT {columns} FROM {self.table_name} {where}"
+                      f"ORDER BY {self.date_column} DESC, {self.time_column} DESC, id DESC LIMIT ?")
+        for value in (after or ()):
+            query.addBindValue(value)
+        query.addBindValue(limit)
+        return query
+
+    def _load(self) -> bool:
+        query = self._page_query("*", self._page_starts[-1], self.page_size)
+        if not query.exec():
+            logger.error(f"Error paging {self.table_name} - {query.lastError().text()}")
+            return False
+        self.setQuery(query)
+        while self.canFetchMore():
+            self.fetchMore()
+        self._has_next = False
+        if self.rowCount() == self.page_size:
+            probe = self._page_query("1", self._last_keyset(), 1)
+            self._has_next = probe.exec() and probe.next()
+        self.pageChanged.emit()
+        return True
+
+
+class PagedTableView(QWidget):
+    """
+    A table view over a PagedQueryModel with Newer/Older buttons.
+    """
+
+    def __init__(self, model: PagedQueryModel, parent=None) -> None:
+        super().__init__(parent)
+        self.model = model
+        self.table_view = QTableView(parent=self)
+        self.table_view.setModel(model)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.verticalHeader().setVisible(False)
+        self.newer_button = QPushButton("Newer", parent=self)
+        self.older_button = QPushButton("Older", parent=self)
+        self.page_label = QLabel(parent=self)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.newer_button)
+        buttons.addStretch(1)
+        buttons.addWidget(self.page_label)
+        buttons.addStretch(1)
+        buttons.addWidget(self.older_button)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.table_view)
+        layout.addLayout(buttons)
+
+        self.newer_button.clicked.connect(self.model.previous_page)
+        self.older_button.clicked.connect(self.model.next_page)
+        self.model.pageChanged.connect(self.update_controls)
+
+    def update_controls(self) -> None:
+        self.table_view.setColumnHidden(0, True)
+        self.table_view.setColumnHidden(self.model.record().indexOf('deleted_at'), True)
+        self.newer_button.setEnabled(self.model.has_previous())
+        self.older_button.setEnabled(self.model.has_next())
+        self.page_label.setText(f"Page {self.model.page_number}")
@@ -0,0 +1,94 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
+from PyQt6.QtWidgets import QAbstractItemView, QHeaderView, QLineEdit, QTableView, QVBoxLayout, QWidget
+
+from logger_setup import logger
+
+# How the source tables are labelled in the results view
+SOURCE_LABELS = {
+    'lily_notes_table': "Lily Note",
+    'lily_walk_notes_table': "Walk Note",
+    'diet_table': "Food",
+}
+
+
+class SearchPage(QWidget):
+    """
+    A mainStack page with a search box feeding a results table.
+
+    Searching is debounced so the FTS query runs once the user pauses typing rather than on
+    every keystroke.
+
+    Attributes:
+        db_manager: The DataManager providing search_entries.
+        search_box (QLineEdit): The search input.
+        search_results_table (QTableView): The view showing the results.
+        results_model (QStandardItemModel): The model holding the current results.
+    """
+    
+    DEBOUNCE_MS = 150
+    RESULT_LIMIT = 100
+    
+    def __init__(self, db_manager, parent=None) -> None:
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setObjectName("search_page")
+        
+        self.search_box = QLineEdit(parent=self)
+        self.search_box.setObjectName("search_box")
+        self.search_box.setPlaceholderText("Search notes and food...")
+        self.search_box.setClearButtonEnabled(True)
+        
+        self.results_model = QStandardItemModel(0, 4, self)
+        self.results_model.setHorizontalHeaderLabels(["Source", "Date", "Time", "Match"])
+        
+        self.search_results_table = QTableView(parent=self)
+        self.search_results_table.setObjectName("search_results_table")
+        self.search_results_table.setModel(self.results_model)
+        self.search_results_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.search_results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.search_results_table.verticalHeader().setVisible(False)
+        self.search_results_table.horizontalHeader().setSectionResizeMode(
+            3, QHeaderView.ResizeMode.Stretch)
+        
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.search_box)
+        layout.addWidget(self.search_results_table)
+        
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.run_search)
+        self.search_box.textChanged.connect(self.debounce_timer.start)
+        self.search_box.returnPressed.connect(self.run_search)
+    
+    def set_db_manager(self, db_manager) -> None:
+        """
+        Searches another profile's database from now on, re-running the current search.
+
+        Args:
+            db_manager: The DataManager of the active profile.
+        """
+        self.db_manager = db_manager
+        self.run_search()
+    
+    def run_search(self) -> None:
+        """
+        Runs the search for the current search box text and refills the results model.
+
+        Returns:
+            None
+        """
+        try:
+            self.debounce_timer.stop()
+            results = self.db_manager.search_entries(self.search_box.text(), self.RESULT_LIMIT)
+            self.results_model.setRowCount(0)
+            for source, entry_date, entry_time, snippet in results:
+                self.results_model.appendRow([
+                    QStandardItem(SOURCE_LABELS.get(source, source)),
+                    QStandardItem(entry_date or ""),
+                    QStandardItem(entry_time or ""),
+                    QStandardItem(snippet or ""),
+                ])
+        except Exception as e:
+            logger.error(f"Error running search: {e}", exc_info=True)
@@ -0,0 +1,199 @@
+from typing import Optional, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+from logger_setup import logger
+
+
+class SeriesBuffer:
+    """
+    A growable (x, y) time series.
+
+    x is in days since 1970-01-01 and kept sorted. Appends are amortised O(1) by doubling the
+    backing arrays; a back-dated point is inserted in place.
+    """
+
+    def __init__(self, x: Optional[np.ndarray] = None, y: Optional[np.ndarray] = None) -> None:
+        x = np.asarray(x if x is not None else [], dtype=np.float64)
+        y = np.asarray(y if y is not None else [], dtype=np.float64)
+        keep = ~np.isnan(y)
+        x, y = x[keep], y[keep]
+        self._size = x.size
+        capacity = max(64, self._size * 2)
+        self._x = np.empty(capacity)
+        self._y = np.empty(capacity)
+        self._x[:self._size] = x
+        self._y[:self._size] = y
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x[:self._size]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[:self._size]
+
+    def append(self, x: float, y: float) -> None:
+        if self._size and x < self._x[self._size - 1]:
+            at = int(np.searchsorted(self.x, x, side='right'))
+            self._x = np.insert(self.x, at, x)
+            self._y = np.insert(self.y, at, y)
+            self._size += 1
+            return
+        if self._size == self._x.size:
+            self._x = np.concatenate((self._x, np.empty(self._x.size)))
+            self._y = np.concatenate((self._y, np.empty(self._y.size)))
+        self._x[self._size] = x
+        self._y[self._size] = y
+        self._size += 1
+
+
+def minmax_decimate(x: np.ndarray,
+                    y: np.ndarray,
+                    x0: float,
+                    x1: float,
+                    columns: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a series to the min and max y of each of `columns` equal-width x buckets.
+
+    Drawing the min/max envelope per pixel column looks identical to drawing every point,
+    whatever the length of the series.
+
+    :param x: The x values, non-decreasing.
+    :param y: The y values.
+    :param x0: The x at the left edge of the first column.
+    :param x1: The x at the right edge of the last column.
+    :param columns: The number of columns, normally the widget width in pixels.
+    :return: (mins, maxs), each of length columns, NaN for columns without points.
+    """
+    mins = np.full(columns, np.nan)
+    maxs = np.full(columns, np.nan)
+    if x.size == 0 or columns <= 0:
+        return mins, maxs
+    column = np.clip(((x - x0) / max(x1 - x0, 1e-9) * columns).astype(np.int64), 0, columns - 1)
+    # x is sorted, so each column's points are contiguous and reduceat can work on the runs
+    occupied, starts = np.unique(column, return_index=True)
+    mins[occupied] = np.minimum.reduceat(y, starts)
+    maxs[occupied] = np.maximum.reduceat(y, starts)
+    return mins, maxs
+
+
+class SeriesPlot(QWidget):
+    """
+    A lightweight line plot for long histories.
+
+    The series is decimated to one min/max pair per pixel column and the decimation is cached.
+    Appending a point that falls inside the current x range only updates its own column; the x
+    range keeps HEADROOM spare so that new days rarely force a re-decimation.
+    """
+
+    HEADROOM = 0.1
+    MARGIN = 8
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setMinimumHeight(160)
+        self.series = SeriesBuffer()
+        self.line_color = QColor(129, 179, 234)
+        self._x_range: Optional[Tuple[float, float]] = None
+        self._y_range: Optional[Tuple[float, float]] = None
+        self._mins: Optional[np.ndarray] = None
+        self._maxs: Optional[np.ndarray] = None
+
+    def set_series(self, series: SeriesBuffer) -> None:
+        """
+        Shows a different series, decimating it once.
+
+        :param series: The series to draw; later appends should go through append_point.
+        """
+        self.series = series
+        self._invalidate()
+        self.update()
+
+    def append_point(self, x: float, y: float) -> None:
+        """
+        Appends a point to the series and updates only the column it lands in.
+
+        :param x: Days since 1970-01-01.
+        :param y: The value.
+        """
+        try:
+            self.series.append(x, y)
+            if self._mins is None or not self._fits(x, y):
+                self._invalidate()
+            else:
+                x0, x1 = self._x_range
+                column = min(int((x - x0) / (x1 - x0) * self._mins.size), self._mins.size - 1)
+                self._mins[column] = np.fmin(self._mins[column], y)
+                self._maxs[column] = np.fmax(self._maxs[column], y)
+            self.update()
+        except Exception as e:
+            logger.error(f"Error appending chart point: {e}", exc_info=True)
+
+    def _fits(self, x: float, y: float) -> bool:
+        x0, x1 = self._x_range
+        y0, y1 = self._y_range
+        return x0 <= x < x1 and y0 <= y <= y1
+
+    def _invalidate(self) -> None:
+        self._mins = self._maxs = None
+
+    def _decimate(self, columns: int) -> None:
+        x, y = self.series.x, self.series.y
+        if x.size:
+            span = max(x[-1] - x[0], 1.0)
+            self._x_range = (x[0], x[-1] + 1 + span * self.HEADROOM)
+            low, high = float(y.min()), float(y.max())
+            pad = max((high - low) * self.HEADROOM, 1.0)
+            self._y_range = (low - pad, high + pad)
+        else:
+            self._x_range = (0.0, 1.0)
+            self._y_range = (0.0, 1.0)
+        self._mins, self._maxs = minmax_decimate(x, y, *self._x_range, columns)
+
+    def resizeEvent(self, event) -> None:
+        self._invalidate()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event) -> None:
+        try:
+            columns = max(self.width() - 2 * self.MARGIN, 1)
+            if self._mins is None or self._mins.size != columns:
+                self._decimate(columns)
+
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(QPen(QColor(60, 60, 60), 1))
+            painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+            if not len(self.series):
+                painter.setPen(QColor(160, 160, 160))
+                painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No data yet")
+                return
+
+            y0, y1 = self._y_range
+            height = self.height() - 2 * self.MARGIN
+            scale = height / (y1 - y0)
+            occupied = np.flatnonzero(~np.isnan(self._mins))
+            pixel_x = occupied + self.MARGIN
+            top = self.MARGIN + height - (self._maxs[occupied] - y0) * scale
+            bottom = self.MARGIN + height - (self._mins[occupied] - y0) * scale
+
+            # Trace the envelope: down each column, across to the next, so spikes survive
+            polygon = QPolygonF()
+            for px, y_top, y_bottom in zip(pixel_x.tolist(), top.tolist(), bottom.tolist()):
+                polygon.append(QPointF(px, y_top))
+                polygon.append(QPointF(px, y_bottom))
+            painter.setPen(QPen(self.line_color, 1.5))
+            painter.drawPolyline(polygon)
+
+            painter.setPen(QColor(160, 160, 160))
+            painter.drawText(self.MARGIN + 2, self.MARGIN + 12, f"{y1:.1f}")
+            painter.drawText(self.MARGIN + 2, self.height() - self.MARGIN - 2, f"{y0:.1f}")
+        except Exception as e:
+            logger.error(f"Error painting chart: {e}", exc_info=True)
@@ -0,0 +1,243 @@
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, List, Optional, Tuple
+from urllib.request import pathname2url
+
+import numpy as np
+
+import tracker_config as tkc
+from database.table_specs import LIVE_ROWS, PET_TABLES
+
+# name: (table, date column, value SQL expression, how several entries on one day combine)
+METRICS: Dict[str, Tuple[str, str, str, str]] = {
+    'lily_mood': ('lily_mood_table', 'lily_date', 'lily_mood_slider', 'mean'),
+    'lily_activity': ('lily_mood_table', 'lily_date', 'lily_mood_activity_slider', 'mean'),
+    'lily_energy': ('lily_mood_table', 'lily_date', 'lily_energy_slider', 'mean'),
+    'lily_walk_behavior': ('lily_walk_table', 'lily_date', 'lily_behavior', 'mean'),
+    'lily_walk_gait': ('lily_walk_table', 'lily_date', 'lily_gait', 'mean'),
+    'hours_slept': ('sleep_table', 'sleep_date', 'sleep_minutes / 60.0', 'mean'),
+    'hydration': ('hydration_table', 'diet_date', 'hydration', 'sum'),
+    'calories': ('diet_table', 'diet_date', 'calories', 'sum'),
+}
+
+SLEEP_METRIC = 'hours_slept'
+MOOD_METRICS = ('lily_mood', 'lily_activity', 'lily_energy')
+
+
+def open_readonly(db_path: str) -> sqlite3.Connection:
+    """
+    Opens a read-only sqlite3 connection, for use off the GUI thread.
+
+    :param db_path: The path of the database file.
+    :return: The connection.
+    """
+    return sqlite3.connect(f"file:{pathname2url(db_path)}?mode=ro", uri=True)
+
+
+def load_metrics(db_path: str,
+                 names: List[str],
+                 start: str,
+                 end: str,
+                 pet_id: Optional[int] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Loads metrics for a date range, one bulk query per table.
+
+    :param db_path: The path of the database file.
+    :param names: Keys of METRICS to load.
+    :param start: The first date, 'yyyy-MM-dd'.
+    :param end: The last date, 'yyyy-MM-dd'.
+    :param pet_id: The pet whose rows the metrics of the PET_TABLES read, or None for every pet's.
+    :return: name -> (entry dates as datetime64[D], entry values as float64, NaN where missing).
+    """
+    by_table: Dict[Tuple[str, str], List[str]] = {}
+    for name in names:
+        table, date_column, _, _ = METRICS[name]
+        by_table.setdefault((table, date_column), []).append(name)
+
+    loaded: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    with closing(open_readonly(db_path)) as conn:
+        for (table, date_column), members in by_table.items():
+            expressions = ", ".join(f"CAST({METRICS[name][2]} AS REAL)" for name in members)
+            where, params = f"{date_column} BETWEEN ? AND ? AND {LIVE_ROWS}", [start, end]
+            if pet_id is not None and table in PET_TABLES:
+                where, params = f"pet_id = ? AND {where}", [pet_id] + params
+            rows = conn.execute(
+                f"SELECT {date_column}, {expressions} FROM {table} WHERE {where} ORDER BY {date_column}",
+                params).fetchall()
+            if rows:
+                columns = np.array(rows, dtype=object).T
+                days = columns[0].astype('datetime64[D]')
+                values = columns[1:].astype(np.float64)
+            else:
+                days = np.array([], dtype='datetime64[D]')
+                values = np.empty((len(members), 0), dtype=np.float64)
+            for row, name in enumerate(members):
+                loaded[name] = (days, values[row])
+    return loaded
+
+
+def day_axis(start: str, end: str) -> np.ndarray:
+    """
+    :return: Every date from start to end inclusive, as datetime64[D].
+    """
+    return np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+
+
+def daily_values(days: np.ndarray, values: np.ndarray, axis: np.ndarray, how: str = 'mean') -> np.ndarray:
+    """
+    Combines entries into one value per day of axis.
+
+    :param days: Entry dates, datetime64[D].
+    :param values: Entry values.
+    :param axis: The days to report, as returned by day_axis.
+    :param how: 'mean' or 'sum' of the entries on a day.
+    :return: One value per day, NaN on days without entries.
+    """
+    index = (days - axis[0]).astype(np.int64)
+    keep = ~np.isnan(values) & (index >= 0) & (index < axis.size)
+    sums = np.bincount(index[keep], weights=values[keep], minlength=axis.size)
+    counts = np.bincount(index[keep], minlength=axis.size)
+    daily = sums / np.maximum(counts, 1) if how == 'mean' else sums
+    return np.where(counts > 0, daily, np.nan)
+
+
+def rolling_mean(daily: np.ndarray, window: int = 7) -> np.ndarray:
+    """
+    Trailing mean over the last window days, ignoring days without data.
+
+    :param daily: One value per day, NaN on days without data.
+    :param window: The window length in days.
+    :return: The rolling mean, NaN where the window holds no data.
+    """
+    present = ~np.isnan(daily)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, daily, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+    upper = np.arange(1, daily.size + 1)
+    lower = np.maximum(upper - window, 0)
+    window_counts = counts[upper] - counts[lower]
+    return np.where(window_counts > 0,
+                    (sums[upper] - sums[lower]) / np.maximum(window_counts, 1),
+                    np.nan)
+
+
+def weekly_means(axis: np.ndarray, daily: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Averages daily values per Monday-starting week.
+
+    :param axis: The days of daily, as returned by day_axis.
+    :param daily: One value per day, NaN on days without data.
+    :return: (week start dates, mean of the days with data in each week, NaN for empty weeks).
+    """
+    # 1970-01-01 was a Thursday, so shifting by 3 days makes weeks start on Monday
+    week = (axis.astype(np.int64) + 3) // 7
+    week_index = week - week[0]
+    present = ~np.isnan(daily)
+    sums = np.bincount(week_index[present], weights=daily[present], minlength=week_index[-1] + 1)
+    counts = np.bincount(week_index[present], minlength=week_index[-1] + 1)
+    starts = (np.arange(week[0], week[-1] + 1) * 7 - 3).astype('datetime64[D]')
+    return starts, np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def correlation(first: np.ndarray, second: np.ndarray) -> float:
+    """
+    Pearson correlation over the days both series have data.
+
+    :return: The correlation, or NaN with fewer than three shared days or no variance.
+    """
+    both = ~np.isnan(first) & ~np.isnan(second)
+    if both.sum() < 3:
+        return float('nan')
+    a, b = first[both], second[both]
+    if a.std() == 0 or b.std() == 0:
+        return float('nan')
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+def streaks(mask: np.ndarray) -> Tuple[int, int]:
+    """
+    Finds runs of consecutive True days.
+
+    :param mask: One bool per day.
+    :return: (current streak ending on the last day, longest streak).
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if starts.size == 0:
+        return 0, 0
+    lengths = ends - starts
+    current = int(lengths[-1]) if ends[-1] == mask.size else 0
+    return current, int(lengths.max())
+
+
+def compute_trends(db_path: str, start: str, end: str, window: int = 7, pet_id: Optional[int] = None) -> Dict:
+    """
+    Computes the trend statistics for every metric over a date range.
+
+    Meant to run in a background thread; it opens its own read-only connection.
+
+    :param db_path: The path of the database file.
+    :param start: The first date, 'yyyy-MM-dd'.
+    :param end: The last date, 'yyyy-MM-dd'.
+    :param window: The rolling mean window in days.
+    :param pet_id: The pet the pet metrics are of (see load_metrics).
+    :return: A dict with per-metric series and summaries, sleep/mood correlations, the hydration
+        goal streak and the time taken in milliseconds.
+    """
+    started = time.perf_counter()
+    axis = day_axis(start, end)
+    loaded = load_metrics(db_path, list(METRICS), start, end, pet_id)
+
+    metrics = {}
+    for name, (days, values) in loaded.items():
+        daily = daily_values(days, values, axis, METRICS[name][3])
+        week_starts, weekly = weekly_means(axis, daily)
+        logged = ~np.isnan(daily)
+        current, longest = streaks(logged)
+        metrics[name] = {
+            'daily': daily,
+            'rolling': rolling_mean(daily, window),
+            'week_starts': week_starts,
+            'weekly': weekly,
+            'mean': float(np.nanmean(daily)) if logged.any() else float('nan'),
+            'logged_days': int(logged.sum()),
+            'current_streak': current,
+            'longest_streak': longest,
+        }
+
+    correlations = {
+        (SLEEP_METRIC, mood): correlation(metrics[SLEEP_METRIC]['daily'], metrics[mood]['daily'])
+        for mood in MOOD_METRICS
+    }
+    hydration = np.nan_to_num(metrics['hydration']['daily'])
+    return {
+        'start': start,
+        'end': end,
+        'days': axis,
+        'metrics': metrics,
+        'correlations': correlations,
+        'hydration_goal_streak': streaks(hydration >= tkc.HYDRATION_GOAL_OZ),
+        'elapsed_ms': (time.perf_counter() - started) * 1000,
+    }
+
+
+def format_trends(stats: Dict) -> str:
+    """
+    Renders the headline numbers of compute_trends as plain text.
+
+    :param stats: The result of compute_trends.
+    :return: A multi-line summary.
+    """
+    lines = [f"{stats['start']} to {stats['end']}"]
+    for name, metric in stats['metrics'].items():
+        if metric['logged_days']:
+            lines.append(f"{name}: avg {metric['mean']:.1f} over {metric['logged_days']} days, "
+                         f"streak {metric['current_streak']} (best {metric['longest_streak']})")
+    for (first, second), value in stats['correlations'].items():
+        if not np.isnan(value):
+            lines.append(f"{first} vs {second}: r = {value:+.2f}")
+    current, longest = stats['hydration_goal_streak']
+    lines.append(f"hydration goal ({tkc.HYDRATION_GOAL_OZ} oz) streak {current} (best {longest})")
+    lines.append(f"computed in {stats['elapsed_ms']:.1f} ms")
+    return "\n".join(lines)
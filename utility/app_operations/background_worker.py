@@ -0,0 +1,69 @@
+import traceback
+from typing import Any, Callable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from logger_setup import logger
+
+
+class WorkerSignals(QObject):
+    """
+    Signals emitted by a BackgroundTask, delivered on the thread that connected to them.
+
+    Attributes:
+        result: Emitted with the return value of the task function.
+        error: Emitted with the error message if the task function raised.
+    """
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class BackgroundTask(QRunnable):
+    """
+    Runs a plain function on the global QThreadPool.
+
+    The function must not touch widgets or the GUI thread's QSqlDatabase connection; anything
+    it needs from the database it should open itself (e.g. with sqlite3).
+    """
+
+    def __init__(self, fn: Callable[..., Any], *args, **kwargs) -> None:
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.error(f"Background task {getattr(self.fn, '__name__', self.fn)} failed: {e}\n"
+                         f"{traceback.format_exc()}")
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+
+
+def run_in_background(fn: Callable[..., Any],
+                      *args,
+                      on_result: Optional[Callable[[Any], None]] = None,
+                      on_error: Optional[Callable[[str], None]] = None,
+                      **kwargs) -> BackgroundTask:
+    """
+    Runs fn(*args, **kwargs) on the global thread pool.
+
+    Args:
+        fn: The function to run off the GUI thread.
+        on_result: Called on the GUI thread with fn's return value.
+        on_error: Called on the GUI thread with the error message if fn raised.
+
+    Returns:
+        BackgroundTask: The queued task.
+    """
+    task = BackgroundTask(fn, *args, **kwargs)
+    if on_result is not None:
+        task.signals.result.connect(on_result)
+    if on_error is not None:
+        task.signals.error.connect(on_error)
+    QThreadPool.globalInstance().start(task)
+    return task
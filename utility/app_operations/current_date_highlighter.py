@@ -1,20 +1,31 @@
 from PyQt6.QtWidgets import QDateEdit
-from PyQt6.QtGui import QFont, QColor
 from PyQt6.QtCore import QDate
-import tracker_config as tkc
 from typing import Dict
 from logger_setup import logger
+from utility.app_operations.day_clock import DayClock
+from utility.app_operations.theme import set_style_property
 
 
 class DateHighlighter:
-    def __init__(self, date_widgets: Dict) -> None:
+    def __init__(self, date_widgets: Dict, clock: DayClock) -> None:
         """
         Initializes the DateHighlighter with a dictionary of QDateEdit widgets.
+
+        Each widget is restyled on its own when its date changes, and all of them when the clock
+        moves to a new day.
         :param date_widgets: A dictionary of QDateEdit widgets with keys like
         'sun_date', 'mon_date', etc.
+        :param clock: The DayClock that says which date is today.
         """
         self.date_widgets = date_widgets
-        self.current_date = QDate.currentDate()
+        self.current_date = clock.today()
+        for widget in self.date_widgets.values():
+            widget.dateChanged.connect(lambda date, w=widget: self.update_widget_style(w))
+        clock.dayChanged.connect(self.on_day_changed)
+        self.update_date_styles()
+
+    def on_day_changed(self, new_day: QDate, previous_day: QDate) -> None:
+        self.current_date = new_day
         self.update_date_styles()
 
     def update_date_styles(self) -> None:
@@ -23,36 +34,34 @@ class DateHighlighter:
         """
         try:
             for day, widget in self.date_widgets.items():
-                if widget.date() == self.current_date:
-                    self.highlight_current_date(widget)
-                else:
-                    self.normalize_date(widget)
+                self.update_widget_style(widget)
         except Exception as e:
             logger.error(f"An error occurred while updating date styles: {e}")
 
+    def update_widget_style(self, widget: QDateEdit) -> None:
+        if widget.date() == self.current_date:
+            self.highlight_current_date(widget)
+        else:
+            self.normalize_date(widget)
+
     @staticmethod
     def highlight_current_date(widget: QDateEdit) -> None:
         """
-        Applies the highlight style to the current date widget.
+        Marks the widget as showing today, which the theme's [today="true"] rules style.
         :param widget: The QDateEdit widget to be highlighted.
         """
         try:
-            font = QFont()
-            widget.setFont(font)
-            widget.setStyleSheet(tkc.COLOR)
+            set_style_property(widget, 'today', True)
         except Exception as e:
             logger.error(f"An error occurred while highlighting the current date: {e}")
 
     @staticmethod
     def normalize_date(widget: QDateEdit) -> None:
         """
-        Applies the normal style to non-current date widgets.
+        Clears the today mark from a widget showing another day.
         :param widget: The QDateEdit widget to be normalized.
         """
         try:
-            font = QFont()
-            font.setBold(False)
-            widget.setFont(font)
-            widget.setStyleSheet(tkc.STYLESHEET)
+            set_style_property(widget, 'today', False)
         except Exception as e:
             logger.error(f"An error occurred while normalizing the date: {e}")
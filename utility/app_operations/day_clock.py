@@ -0,0 +1,86 @@
+from typing import Optional
+
+from PyQt6.QtCore import QDate, QDateTime, QObject, Qt, QTime, QTimer, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+from logger_setup import logger
+
+# Fire this long after midnight so the new day has certainly begun
+MIDNIGHT_MARGIN_MS = 500
+
+
+class DayClock(QObject):
+    """
+    The app's one source of "today".
+
+    A single-shot QTimer is armed for the next midnight; when it fires the clock moves to the new
+    day, emits dayChanged and re-arms, so nothing has to poll the date. The timer runs on a
+    monotonic clock that stops while the machine sleeps, so the date is also re-checked whenever
+    the application becomes active again.
+
+    Attributes:
+        dayChanged: Emitted with (new day, previous day) when the date rolls over.
+    """
+
+    dayChanged = pyqtSignal(QDate, QDate)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.current = QDate.currentDate()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.check)
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.applicationStateChanged.connect(self.on_application_state_changed)
+        self.arm()
+
+    def today(self) -> QDate:
+        return QDate(self.current)
+
+    def arm(self) -> None:
+        midnight = QDateTime(self.current.addDays(1), QTime(0, 0))
+        wait = QDateTime.currentDateTime().msecsTo(midnight)
+        self.timer.start(max(wait, 0) + MIDNIGHT_MARGIN_MS)
+
+    def check(self) -> None:
+        """
+        Emits dayChanged if the date has moved on since it was last seen, then re-arms the timer.
+
+        Returns:
+            None
+        """
+        try:
+            now = QDate.currentDate()
+            if now != self.current:
+                previous, self.current = self.current, now
+                logger.info(f"Day changed to {now.toString('yyyy-MM-dd')}")
+                self.dayChanged.emit(QDate(now), previous)
+        except Exception as e:
+            logger.error(f"Error checking for a new day: {e}", exc_info=True)
+        self.arm()
+
+    def on_application_state_changed(self, state: Qt.ApplicationState) -> None:
+        if state == Qt.ApplicationState.ApplicationActive:
+            self.check()
+
+
+_shared_clock: Optional[DayClock] = None
+
+
+def shared_clock() -> DayClock:
+    """
+    :return: The application-wide DayClock, created on first use.
+    """
+    global _shared_clock
+    if _shared_clock is None:
+        _shared_clock = DayClock()
+    return _shared_clock
+
+
+def today() -> QDate:
+    """
+    :return: Today's date according to the shared DayClock.
+    """
+    return shared_clock().today()
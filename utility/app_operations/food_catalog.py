@@ -0,0 +1,188 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QStringListModel, Qt
+from PyQt6.QtWidgets import QCompleter, QLineEdit, QSpinBox
+
+from logger_setup import logger
+
+
+class _TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.top: List[str] = []
+
+
+class FoodCatalog:
+    """
+    In-memory prefix index over the food catalog.
+
+    Foods live in a trie keyed by their lower-cased name. Every node keeps the keys of its
+    TOP_K most eaten foods, so a suggestion is a walk down the prefix plus a copy of that list;
+    no scanning or sorting happens per keystroke.
+
+    Attributes:
+        foods (Dict[str, Tuple[str, int, int]]): food key -> (display name, calories, times eaten).
+    """
+
+    TOP_K = 10
+
+    def __init__(self, entries: Iterable[Tuple[str, int, int]] = ()) -> None:
+        """
+        Builds the catalog from (food name, calories, times eaten) rows.
+
+        :param entries: The rows, e.g. from DataManager.fetch_food_catalog.
+        """
+        self.foods: Dict[str, Tuple[str, int, int]] = {}
+        self._root = _TrieNode()
+        for food_name, calories, times_eaten in entries:
+            self._set(food_name, calories or 0, times_eaten or 0)
+
+    @staticmethod
+    def _key(food_name: str) -> str:
+        return (food_name or "").strip().lower()
+
+    def _rank(self, key: str) -> Tuple[int, str]:
+        return -self.foods[key][2], key
+
+    def _set(self, food_name: str, calories: int, times_eaten: int) -> None:
+        key = self._key(food_name)
+        if not key:
+            return
+        self.foods[key] = (food_name.strip(), calories, times_eaten)
+        node = self._root
+        self._offer(node, key)
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            self._offer(node, key)
+
+    def _offer(self, node: _TrieNode, key: str) -> None:
+        """Puts key into the node's top list if it ranks high enough, keeping the list ordered."""
+        top = node.top
+        if key in top:
+            top.remove(key)
+        elif len(top) >= self.TOP_K and self._rank(key) >= self._rank(top[-1]):
+            return
+        rank = self._rank(key)
+        index = 0
+        while index < len(top) and self._rank(top[index]) < rank:
+            index += 1
+        top.insert(index, key)
+        del top[self.TOP_K:]
+
+    def record(self, food_name: str, calories: int) -> None:
+        """
+        Records a food just logged to the diet table, mirroring the food_catalog trigger.
+
+        :param food_name: The food eaten.
+        :param calories: The calories logged with it.
+        """
+        try:
+            key = self._key(food_name)
+            if not key:
+                return
+            times_eaten = self.foods[key][2] if key in self.foods else 0
+            self._set(food_name, calories, times_eaten + 1)
+        except Exception as e:
+            logger.error(f"Error recording food in catalog: {e}", exc_info=True)
+
+    def set_calories(self, food_name: str, calories: int) -> None:
+        """
+        Applies a user edit of a food's calories, mirroring DataManager.upsert_food_catalog.
+
+        :param food_name: The food name.
+        :param calories: The new calories.
+        """
+        key = self._key(food_name)
+        if key:
+            times_eaten = self.foods[key][2] if key in self.foods else 0
+            self._set(food_name, calories, times_eaten)
+
+    def suggest(self, prefix: str, limit: int = TOP_K) -> List[str]:
+        """
+        Returns the most eaten foods starting with prefix.
+
+        :param prefix: The text typed so far.
+        :param limit: The maximum number of suggestions.
+        :return: Display names, most eaten first.
+        """
+        node = self._root
+        for char in self._key(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.foods[key][0] for key in node.top[:limit]]
+
+    def calories_for(self, food_name: str) -> Optional[int]:
+        """
+        Returns the calories last logged for a food.
+
+        :param food_name: The food name, in any case.
+        :return: The calories, or None if the food isn't in the catalog.
+        """
+        food = self.foods.get(self._key(food_name))
+        return food[1] if food else None
+
+
+def connect_food_completer(food_edit: QLineEdit,
+                           calories_spinbox: QSpinBox,
+                           get_catalog: Callable[[], FoodCatalog],
+                           on_calories_corrected: Optional[Callable[[str, int], None]] = None) -> QCompleter:
+    """
+    Attaches a QCompleter driven by the catalog to the food field and auto-fills calories.
+
+    Suggestions are recomputed from the catalog on every edit; choosing a suggestion, or
+    finishing the edit on a known food, fills the calories spinbox with that food's calories.
+    Changing calories that were filled in, while the food is still the same, is a correction of
+    that food's calories and is passed to on_calories_corrected.
+
+    :param food_edit: The QLineEdit the food is typed into.
+    :param calories_spinbox: The QSpinBox holding the calories.
+    :param get_catalog: Returns the in-memory food catalog in use, e.g. the active profile's.
+    :param on_calories_corrected: Called with (food name, calories) for a correction.
+    :return: The completer attached to food_edit.
+    """
+    suggestions = QStringListModel(food_edit)
+    completer = QCompleter(suggestions, food_edit)
+    completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    # The catalog already did the filtering and ranking
+    completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+    food_edit.setCompleter(completer)
+
+    def update_suggestions(text: str) -> None:
+        try:
+            suggestions.setStringList(get_catalog().suggest(text) if text.strip() else [])
+            if suggestions.rowCount():
+                completer.complete()
+        except Exception as e:
+            logger.error(f"Error updating food suggestions: {e}", exc_info=True)
+
+    # (food key, calories) of the last fill, while the spinbox still shows those calories
+    filled: List[Tuple[str, int]] = []
+
+    def fill_calories(food_name: str) -> None:
+        calories = get_catalog().calories_for(food_name)
+        if calories is not None:
+            calories_spinbox.setValue(calories)
+            filled[:] = [(FoodCatalog._key(food_name), calories)]
+
+    def fill_missing_calories() -> None:
+        if calories_spinbox.value() == 0:
+            fill_calories(food_edit.text())
+
+    def correct_calories() -> None:
+        if not filled:
+            return
+        food_key, calories = filled[0]
+        if FoodCatalog._key(food_edit.text()) != food_key:
+            filled.clear()
+        elif calories_spinbox.value() != calories and on_calories_corrected is not None:
+            filled[:] = [(food_key, calories_spinbox.value())]
+            on_calories_corrected(food_edit.text().strip(), calories_spinbox.value())
+
+    food_edit.textEdited.connect(update_suggestions)
+    completer.activated.connect(fill_calories)
+    food_edit.editingFinished.connect(fill_missing_calories)
+    calories_spinbox.editingFinished.connect(correct_calories)
+    return completer
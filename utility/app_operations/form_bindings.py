@@ -0,0 +1,185 @@
+"""
+Bindings between the entry forms' widgets and the values they commit.
+
+Every widget is looked up once, after setupUi, and bound to closures that read its value the way
+it is stored, write a value back, reset it after a commit, and save and restore it in QSettings.
+Commits, form resets and the window's saved state all go through these bindings, so
+none of them resolves a widget or a method by name while the app runs.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QDate, QSettings, QTime
+from PyQt6.QtWidgets import (QAbstractButton, QAbstractSlider, QDateEdit, QLineEdit, QSpinBox, QTextEdit,
+                             QTimeEdit, QWidget)
+
+from logger_setup import logger
+from utility.app_operations.day_clock import today
+
+DATE_FORMAT = 'yyyy-MM-dd'
+TIME_FORMAT = 'hh:mm:ss'
+
+# table: (the widgets holding its insert arguments, in order; the model to refresh after a commit)
+FORMS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    'sleep_table': (('sleep_date', 'time_asleep', 'time_awake'), 'sleep_sessions_model'),
+    'total_hours_slept_table': (('sleep_date', 'total_hours_slept'), 'sleep_sessions_model'),
+    'woke_up_like_table': (('sleep_date', 'woke_up_like'), 'sleep_sessions_model'),
+    'sleep_quality_table': (('sleep_date', 'sleep_quality'), 'sleep_sessions_model'),
+    'shower_table': (('basics_date', 'basics_time', 'shower_check'), 'shower_model'),
+    'exercise_table': (('basics_date', 'basics_time', 'exerc_check'), 'exercise_model'),
+    'tooth_table': (('basics_date', 'basics_time', 'tooth_check'), 'tooth_model'),
+    'diet_table': (('diet_date', 'diet_time', 'food_eaten', 'calories'), 'diet_model'),
+    'lily_diet_table': (('lily_date', 'lily_time'), 'lily_diet_model'),
+    'lily_mood_table': (('lily_date', 'lily_time', 'lily_mood_slider', 'lily_mood_activity_slider',
+                         'lily_energy_slider'), 'lily_mood_model'),
+    'lily_walk_table': (('lily_date', 'lily_time', 'lily_behavior_slider', 'lily_gait_slider'),
+                        'lily_walk_model'),
+    'lily_in_room_table': (('lily_date', 'lily_time', 'lily_time_in_room_slider'), 'lily_room_model'),
+    'lily_notes_table': (('lily_date', 'lily_time', 'lily_notes'), 'lily_note_model'),
+    'lily_walk_notes_table': (('lily_date', 'lily_time', 'lily_walk_note'), 'lily_walk_note_model'),
+    'mental_mental_table': (('mental_mental_date', 'mental_mental_time', 'mood_slider', 'mania_slider',
+                             'depression_slider', 'mixed_risk_slider'), 'mental_mental_model'),
+    'cspr_table': (('cspr_date', 'cspr_time', 'calm_slider', 'stress_slider', 'pain_slider',
+                    'rage_slider'), 'cspr_model'),
+    'wefe_table': (('wefe_date', 'wefe_time', 'wellbeing_slider', 'excite_slider', 'focus_slider',
+                    'energy_slider', 'summing_box'), 'wefe_model'),
+}
+
+# The mind page's forms, committed together by its commit button
+MIND_FORMS = ('mental_mental_table', 'cspr_table', 'wefe_table')
+
+# Widgets whose value is kept between sessions, under their own name in QSettings
+PERSISTED = (
+    'lily_time_in_room_slider',
+    'lily_mood_slider',
+    'lily_mood_activity_slider',
+    'lily_energy_slider',
+    'lily_time_in_room',
+    'lily_mood',
+    'lily_activity',
+    'lily_energy',
+    'lily_notes',
+)
+
+
+class FieldBinding:
+    """
+    One widget's accessors.
+
+    Attributes:
+        name (str): The widget's attribute name on the window.
+        get: Returns the value as it is committed (dates and times as formatted text).
+        set: Shows a value as returned by get.
+        reset: Puts the widget back to its default (today, now, 0, unchecked or empty).
+        save: Returns the value kept in QSettings (rich text for text edits, else as get).
+        load: Shows a value returned by save.
+        settings_type (type): The type QSettings should read the saved value as.
+        default: The value reset shows, for widgets that have one.
+    """
+    __slots__ = ('name', 'get', 'set', 'reset', 'save', 'load', 'settings_type', 'default')
+
+    def __init__(self, name: str, get: Callable[[], Any], set: Callable[[Any], None],
+                 reset: Callable[[], None], save: Optional[Callable[[], Any]] = None,
+                 load: Optional[Callable[[Any], None]] = None, settings_type: type = str,
+                 default: Any = None) -> None:
+        self.name = name
+        self.get = get
+        self.set = set
+        self.reset = reset
+        self.save = save or get
+        self.load = load or set
+        self.settings_type = settings_type
+        self.default = default
+
+
+def bind_widget(name: str, widget: QWidget, default: Any = 0) -> FieldBinding:
+    """
+    Builds the accessors for a widget from its type.
+
+    :param name: The widget's attribute name.
+    :param widget: The widget.
+    :param default: The value sliders, spin boxes and check boxes reset to.
+    :return: The binding.
+    :raises TypeError: If the widget is of a type forms don't use.
+    """
+    if isinstance(widget, QDateEdit):
+        return FieldBinding(name, lambda: widget.date().toString(DATE_FORMAT),
+                            lambda value: widget.setDate(QDate.fromString(value, DATE_FORMAT)),
+                            lambda: widget.setDate(today()))
+    if isinstance(widget, QTimeEdit):
+        return FieldBinding(name, lambda: widget.time().toString(TIME_FORMAT),
+                            lambda value: widget.setTime(QTime.fromString(value, TIME_FORMAT)),
+                            lambda: widget.setTime(QTime.currentTime()))
+    if isinstance(widget, (QAbstractSlider, QSpinBox)):
+        return FieldBinding(name, widget.value, lambda value: widget.setValue(int(value)),
+                            lambda: widget.setValue(default), settings_type=int, default=default)
+    if isinstance(widget, QAbstractButton):
+        return FieldBinding(name, widget.isChecked, lambda value: widget.setChecked(bool(value)),
+                            lambda: widget.setChecked(bool(default)), settings_type=bool,
+                            default=bool(default))
+    if isinstance(widget, QLineEdit):
+        return FieldBinding(name, widget.text, widget.setText, widget.clear)
+    if isinstance(widget, QTextEdit):
+        return FieldBinding(name, widget.toPlainText, widget.setPlainText, widget.clear,
+                            save=widget.toHtml, load=widget.setHtml)
+    raise TypeError(f"Can't bind {name}, a {type(widget).__name__}")
+
+
+class FormBindings:
+    """
+    The bindings of every form widget of a window, built once after setupUi.
+
+    Per table, the bindings of its form are kept in insert order, so a commit is one pass over a
+    tuple of getters.
+    """
+
+    def __init__(self, window: QWidget) -> None:
+        """
+        :param window: The window the FORMS and PERSISTED widgets are attributes of.
+        """
+        self.bindings: Dict[str, FieldBinding] = {}
+        self.forms: Dict[str, Tuple[FieldBinding, ...]] = {}
+        for table, (names, _) in FORMS.items():
+            form = []
+            for name in names:
+                if name not in self.bindings:
+                    self.bindings[name] = bind_widget(name, getattr(window, name))
+                form.append(self.bindings[name])
+            self.forms[table] = tuple(form)
+        for name in PERSISTED:
+            if name not in self.bindings:
+                self.bindings[name] = bind_widget(name, getattr(window, name))
+
+    def __getitem__(self, name: str) -> FieldBinding:
+        return self.bindings[name]
+
+    def values(self, table: str) -> List[Any]:
+        """
+        :param table: A key of FORMS.
+        :return: The form's values, in insert order.
+        """
+        return [binding.get() for binding in self.forms[table]]
+
+    def reset(self, table: str) -> None:
+        """
+        Puts a form's widgets back to their defaults after a commit.
+
+        :param table: A key of FORMS.
+        """
+        for binding in self.forms[table]:
+            binding.reset()
+
+    def save_state(self, settings: QSettings) -> None:
+        for name in PERSISTED:
+            try:
+                settings.setValue(name, self.bindings[name].save())
+            except Exception as e:
+                logger.error(f"Error saving {name}: {e}", exc_info=True)
+
+    def restore_state(self, settings: QSettings) -> None:
+        for name in PERSISTED:
+            binding = self.bindings[name]
+            try:
+                if settings.contains(name):
+                    binding.load(settings.value(name, type=binding.settings_type))
+            except Exception as e:
+                logger.error(f"Error restoring {name}: {e}", exc_info=True)
@@ -0,0 +1,285 @@
+"""
+A small HTTP/JSON API on localhost, so scripts and other devices on this machine (phone shortcuts
+through a forwarded port, home automation) can log entries without going through the window.
+
+    GET  /tables                          the tables, by short name, and their columns
+    POST /entries/<table>                 a JSON object or array of objects; answers {"ids": [...]}
+    GET  /entries/<table>?since=&until=&pet=&limit=
+                                          the entries as JSON lines, streamed in chunks
+
+Tables can be named by their TABLE_ALIASES short name or by table name. POSTed entries take the
+same fields as 'python -m fullfucker log' (see entries.build_row). A batch with invalid entries is
+refused whole with a 400 listing each entry's problems. Writes go to an IngestWriter, which
+coalesces queued batches into one transaction, so the event loop never waits on SQLite.
+
+The server runs on its own thread with its own event loop and imports no Qt (apart from QtCore,
+loaded for sleep entries' duration), so it also runs headless with 'python -m fullfucker serve'.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import tracker_config as tkc
+from database.database_utility.entries import IngestWriter, entries_query, pet_id_for
+from database.database_utility.validation import ValidationError
+from database.table_specs import TABLE_ALIASES, TABLE_SPECS
+from logger_setup import logger
+
+REASONS = {
+    200: 'OK', 201: 'Created', 400: 'Bad Request', 401: 'Unauthorized', 403: 'Forbidden',
+    404: 'Not Found', 405: 'Method Not Allowed', 411: 'Length Required', 413: 'Payload Too Large',
+    415: 'Unsupported Media Type', 500: 'Internal Server Error',
+}
+LOCAL_HOSTS = {'127.0.0.1', 'localhost', '[::1]'}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def resolve_table(name: str) -> str:
+    """
+    :param name: A TABLE_ALIASES short name or a table name.
+    :return: The table name.
+    :raises ApiError: 404 if there is no such table.
+    """
+    table = TABLE_ALIASES.get(name, name)
+    if table not in TABLE_SPECS:
+        raise ApiError(404, f"No table {name}")
+    return table
+
+
+def describe_tables() -> Dict:
+    return {
+        alias: {
+            'table': table,
+            'date': TABLE_SPECS[table][0],
+            'time': TABLE_SPECS[table][1],
+            'columns': [{'name': name, 'type': kind.__name__, 'required': default is None}
+                        for name, kind, default in TABLE_SPECS[table][2]],
+        }
+        for alias, table in TABLE_ALIASES.items()
+    }
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    """
+    Reads one HTTP/1.1 request.
+
+    :return: The method, target, headers (lower-cased names) and body.
+    """
+    request_line = (await reader.readline()).decode('latin-1').strip()
+    try:
+        method, target, _ = request_line.split(' ', 2)
+    except ValueError:
+        raise ApiError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin-1')
+        if line in ('\r\n', '\n', ''):
+            break
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = b''
+    if method == 'POST':
+        if 'content-length' not in headers:
+            raise ApiError(411, "Content-Length is required")
+        length = int(headers['content-length'])
+        if length > tkc.API_MAX_BODY_BYTES:
+            raise ApiError(413, f"Bodies are limited to {tkc.API_MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length)
+    return method, target, headers, body
+
+
+class LocalApiServer:
+    """
+    Serves the local API for one database until stopped.
+
+    Attributes:
+        db_path (str): The database entries are written to and read from.
+        port (int): The port listened on, on tkc.API_HOST.
+        writer (IngestWriter): The database writer, while the server runs.
+    """
+
+    def __init__(self, db_path: str, port: int = tkc.API_PORT,
+                 on_written: Optional[Callable[[str, List[int]], None]] = None) -> None:
+        """
+        :param db_path: The database to serve.
+        :param port: The port to listen on, 0 for any free port.
+        :param on_written: Called on the writer thread with (table, row ids) after each committed batch.
+        """
+        self.db_path = db_path
+        self.port = port
+        self.on_written = on_written
+        self.writer: Optional[IngestWriter] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stop_event: Optional[asyncio.Event] = None
+        self.thread: Optional[threading.Thread] = None
+        self.started = threading.Event()
+        self.start_error: Optional[Exception] = None
+
+    def start(self) -> bool:
+        """
+        Starts serving on a background thread.
+
+        :return: True once the server is listening, False if it couldn't start.
+        """
+        self.thread = threading.Thread(target=self.run, name='local-api', daemon=True)
+        self.thread.start()
+        self.started.wait()
+        if self.start_error is not None:
+            logger.error(f"Local API could not start on {tkc.API_HOST}:{self.port}: {self.start_error}")
+            return False
+        logger.info(f"Local API listening on http://{tkc.API_HOST}:{self.port}")
+        return True
+
+    def stop(self) -> None:
+        """
+        Stops listening, finishes the queued writes and waits for the server thread.
+        """
+        if self.loop is not None and self.stop_event is not None and self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+        if self.thread is not None:
+            self.thread.join()
+
+    def run(self) -> None:
+        try:
+            asyncio.run(self.serve())
+        except Exception as e:
+            if not self.started.is_set():
+                self.start_error = e
+                self.started.set()
+            else:
+                logger.error(f"Local API stopped: {e}", exc_info=True)
+
+    async def serve(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        server = await asyncio.start_server(self.handle, tkc.API_HOST, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.writer = IngestWriter(self.db_path, self.on_written)
+        self.started.set()
+        try:
+            async with server:
+                await self.stop_event.wait()
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, self.writer.close)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, headers, body = await read_request(reader)
+                self.check_access(headers)
+                await self.dispatch(method, target, headers, body, writer)
+            except ApiError as e:
+                await self.send_json(writer, e.status, {'error': str(e)})
+            except ValidationError as e:
+                await self.send_json(writer, 400, {
+                    'error': str(e),
+                    'errors': [{'index': index, 'message': message} for index, message in e.errors],
+                })
+            except (ValueError, sqlite3.Error) as e:
+                await self.send_json(writer, 400, {'error': str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error(f"Local API request failed: {e}", exc_info=True)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def check_access(headers: Dict[str, str]) -> None:
+        """
+        Refuses requests that didn't come from a local client: the Host header must be a loopback
+        name (which stops web pages reaching the API through DNS rebinding), and the token must
+        match when tkc.API_TOKEN is set.
+        """
+        host = headers.get('host', '')
+        host = host.rsplit(':', 1)[0] if not host.endswith(']') else host
+        if host not in LOCAL_HOSTS:
+            raise ApiError(403, "Only local clients may use this API")
+        if tkc.API_TOKEN and headers.get('authorization') != f"Bearer {tkc.API_TOKEN}":
+            raise ApiError(401, "Missing or wrong token")
+
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes,
+                       writer: asyncio.StreamWriter) -> None:
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        if parts == ['tables']:
+            if method != 'GET':
+                raise ApiError(405, "Use GET")
+            await self.send_json(writer, 200, describe_tables())
+        elif len(parts) == 2 and parts[0] == 'entries':
+            table = resolve_table(parts[1])
+            if method == 'POST':
+                await self.post_entries(table, headers, body, writer)
+            elif method == 'GET':
+                query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                await self.stream_entries(table, query, writer)
+            else:
+                raise ApiError(405, "Use GET or POST")
+        else:
+            raise ApiError(404, f"No resource {url.path}")
+
+    async def post_entries(self, table: str, headers: Dict[str, str], body: bytes,
+                           writer: asyncio.StreamWriter) -> None:
+        """
+        Queues a batch for the writer and answers with the new ids once it has committed.
+
+        Requiring a JSON content type means a browser can't send one without a CORS preflight,
+        which this server never approves.
+        """
+        if headers.get('content-type', '').split(';')[0].strip() != 'application/json':
+            raise ApiError(415, "Send application/json")
+        try:
+            entries = json.loads(body)
+        except ValueError as e:
+            raise ApiError(400, f"Invalid JSON: {e}")
+        if isinstance(entries, dict):
+            entries = [entries]
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+            raise ApiError(400, "Send an entry object or an array of them")
+        ids = await asyncio.wrap_future(self.writer.submit(table, entries))
+        await self.send_json(writer, 201, {'table': table, 'ids': ids})
+
+    async def stream_entries(self, table: str, query: Dict[str, str], writer: asyncio.StreamWriter) -> None:
+        """
+        Sends a table's entries as JSON lines with chunked transfer encoding.
+
+        Rows are read tkc.API_STREAM_ROWS at a time on the default executor, and each chunk waits
+        for the client to drain the previous one, so a large range is never held in memory.
+        """
+        loop = asyncio.get_running_loop()
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        try:
+            limit = int(query['limit']) if query.get('limit') else None
+            pet_id = pet_id_for(conn, query['pet']) if query.get('pet') else None
+            sql, params = entries_query(table, query.get('since'), query.get('until'), pet_id, limit)
+            cursor = await loop.run_in_executor(None, conn.execute, sql, params)
+            columns = [column[0] for column in cursor.description]
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+            while True:
+                rows = await loop.run_in_executor(None, cursor.fetchmany, tkc.API_STREAM_ROWS)
+                if not rows:
+                    break
+                chunk = ''.join(json.dumps(dict(zip(columns, row))) + '\n' for row in rows).encode()
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            conn.close()
+
+    @staticmethod
+    async def send_json(writer: asyncio.StreamWriter, status: int, payload) -> None:
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
@@ -0,0 +1,117 @@
+import os
+import time
+
+from PyQt6.QtCore import QDateTime, QEvent, QObject, QSettings, QTimer, pyqtSignal
+
+import tracker_config as tkc
+from database.database_utility.maintenance import run_maintenance
+from logger_setup import logger
+from utility.app_operations.background_worker import run_in_background
+
+# Input events that count as the user being active
+ACTIVITY_EVENTS = {
+    QEvent.Type.KeyPress,
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseMove,
+    QEvent.Type.Wheel,
+}
+
+
+class IdleMonitor(QObject):
+    """
+    Tracks the time since the last keyboard or mouse input anywhere in the application.
+
+    Install it on the QApplication with installEventFilter.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.last_activity = time.monotonic()
+
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() in ACTIVITY_EVENTS:
+            self.last_activity = time.monotonic()
+        return False
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_activity
+
+
+class MaintenanceScheduler(QObject):
+    """
+    Runs database maintenance in the background once the app has been idle for a while.
+
+    A QTimer checks every tkc.MAINTENANCE_CHECK_MINUTES. Maintenance runs when the last run is at
+    least tkc.MAINTENANCE_INTERVAL_HOURS old and there has been no input for
+    tkc.MAINTENANCE_IDLE_SECONDS. The time of the last run is kept in QSettings per database file,
+    so each profile gets its own schedule; set db_path to follow the active profile.
+
+    Attributes:
+        finished: Emitted with the timings from run_maintenance.
+    """
+
+    finished = pyqtSignal(object)
+
+    def __init__(self, db_path: str, settings: QSettings, idle_monitor: IdleMonitor, parent=None) -> None:
+        super().__init__(parent)
+        self.db_path = db_path
+        self.settings = settings
+        self.idle_monitor = idle_monitor
+        self.running = False
+        self.running_path = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(tkc.MAINTENANCE_CHECK_MINUTES * 60 * 1000)
+        self.timer.timeout.connect(self.run_if_due)
+
+    def start(self) -> None:
+        self.timer.start()
+
+    def stop(self) -> None:
+        self.timer.stop()
+
+    @staticmethod
+    def settings_key(db_path: str) -> str:
+        return f"lastMaintenance/{os.path.basename(db_path)}"
+
+    def is_due(self) -> bool:
+        last_run = self.settings.value(self.settings_key(self.db_path), QDateTime())
+        if not isinstance(last_run, QDateTime) or not last_run.isValid():
+            return True
+        return last_run.secsTo(QDateTime.currentDateTime()) >= tkc.MAINTENANCE_INTERVAL_HOURS * 3600
+
+    def run_if_due(self) -> None:
+        """
+        Starts maintenance if it is due and the user is idle.
+
+        Returns:
+            None
+        """
+        try:
+            if self.is_due() and self.idle_monitor.idle_seconds() >= tkc.MAINTENANCE_IDLE_SECONDS:
+                self.run_now()
+        except Exception as e:
+            logger.error(f"Error checking maintenance schedule: {e}", exc_info=True)
+
+    def run_now(self) -> None:
+        """
+        Starts maintenance in a worker thread unless it is already running.
+
+        Returns:
+            None
+        """
+        if self.running:
+            return
+        self.running = True
+        self.running_path = self.db_path
+        run_in_background(run_maintenance, self.db_path,
+                          on_result=self.on_finished,
+                          on_error=self.on_failed)
+
+    def on_finished(self, timings) -> None:
+        self.running = False
+        self.settings.setValue(self.settings_key(self.running_path), QDateTime.currentDateTime())
+        self.finished.emit(timings)
+
+    def on_failed(self, message: str) -> None:
+        self.running = False
+        logger.error(f"Database maintenance failed: {message}")
@@ -0,0 +1,203 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+import tracker_config as tkc
+from database.database_manager import DEFAULT_PET_ID, DataManager
+from logger_setup import logger
+
+DUE_FORMAT = '%Y-%m-%d %H:%M:%S'
+# QTimer intervals are 32-bit milliseconds; waits longer than this are re-armed in steps
+MAX_TIMER_MS = 24 * 3600 * 1000
+
+
+def hydration_goal_met(db_manager: DataManager, reminder: dict, now: datetime, pet_id: int) -> bool:
+    """
+    :return: True when today's logged water already meets tkc.HYDRATION_GOAL_OZ.
+    """
+    return db_manager.hydration_total(now.strftime('%Y-%m-%d')) >= tkc.HYDRATION_GOAL_OZ
+
+
+def walk_logged(db_manager: DataManager, reminder: dict, now: datetime, pet_id: int) -> bool:
+    """
+    :return: True when the pet has had a walk logged within the reminder's interval.
+    """
+    latest = db_manager.latest_entry_time('lily_walk_table', 'lily_date', 'lily_time', pet_id)
+    if not latest:
+        return False
+    try:
+        walked_at = datetime.strptime(latest, DUE_FORMAT)
+    except ValueError:
+        return False
+    return now - walked_at < timedelta(minutes=reminder['interval_minutes'])
+
+
+# rule name (the reminders.rule column) -> check returning True when a firing should be skipped
+REMINDER_RULES: Dict[str, Callable[[DataManager, dict, datetime, int], bool]] = {
+    'hydration_goal': hydration_goal_met,
+    'walk_logged': walk_logged,
+}
+
+
+def parse_clock(value: str) -> Tuple[int, int]:
+    hours, minutes = value.split(':')[:2]
+    return int(hours), int(minutes)
+
+
+def next_due_after(reminder: dict, now: datetime) -> datetime:
+    """
+    Works out when a reminder next fires after a moment.
+
+    A reminder fires at window_start and then every interval_minutes until window_end, every day.
+
+    :param reminder: A row from DataManager.fetch_reminders.
+    :param now: The moment to look after.
+    :return: The first firing strictly after now.
+    """
+    interval = timedelta(minutes=reminder['interval_minutes'])
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_hour, start_minute = parse_clock(reminder['window_start'])
+    end_hour, end_minute = parse_clock(reminder['window_end'])
+    start = day.replace(hour=start_hour, minute=start_minute)
+    end = day.replace(hour=end_hour, minute=end_minute)
+    if now < start:
+        return start
+    candidate = start + interval * ((now - start) // interval + 1)
+    if candidate <= end:
+        return candidate
+    return start + timedelta(days=1)
+
+
+class ReminderScheduler(QObject):
+    """
+    Fires the reminders stored in the database.
+
+    Due times sit in a heap and a single-shot QTimer is armed for the earliest one, so the scheduler
+    does no work between firings however many reminders there are. When the timer fires, every
+    reminder that is due is popped, checked against its rule (which may skip it, e.g. the hydration
+    reminder once today's goal is met), given its next due time and pushed back; then the timer is
+    re-armed for the new earliest entry. Heap entries are invalidated lazily: an entry only counts
+    if it still matches the reminder's current due time.
+
+    Set db_manager and pet_id (then call reload) to follow the active profile and pet.
+
+    Attributes:
+        reminderDue: Emitted with the reminder dict when a reminder fires.
+    """
+
+    reminderDue = pyqtSignal(dict)
+
+    def __init__(self, db_manager: DataManager, parent=None) -> None:
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.pet_id = DEFAULT_PET_ID
+        self.reminders: Dict[int, dict] = {}
+        self.due: Dict[int, datetime] = {}
+        self.heap: List[Tuple[datetime, int]] = []
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.fire_due)
+
+    def reload(self) -> None:
+        """
+        Loads the reminders from the database and schedules the enabled ones.
+
+        Due times missed while the app was closed are moved on to their next firing rather than
+        all firing at once.
+
+        Returns:
+            None
+        """
+        try:
+            now = datetime.now()
+            self.reminders = {reminder['id']: reminder for reminder in self.db_manager.fetch_reminders()}
+            self.due.clear()
+            self.heap.clear()
+            with self.db_manager.transaction():
+                for reminder in self.reminders.values():
+                    if not reminder['enabled']:
+                        continue
+                    due = self.parse_due(reminder['next_due'])
+                    if due is None or due <= now:
+                        due = next_due_after(reminder, now)
+                        self.db_manager.update_reminder(reminder['id'], next_due=due.strftime(DUE_FORMAT))
+                    self.due[reminder['id']] = due
+            self.heap = [(due, reminder_id) for reminder_id, due in self.due.items()]
+            heapq.heapify(self.heap)
+            self.rearm()
+        except Exception as e:
+            logger.error(f"Error loading reminders: {e}", exc_info=True)
+
+    @staticmethod
+    def parse_due(value) -> Optional[datetime]:
+        try:
+            return datetime.strptime(value, DUE_FORMAT) if value else None
+        except (TypeError, ValueError):
+            return None
+
+    def schedule(self, reminder_id: int, due: datetime) -> None:
+        self.due[reminder_id] = due
+        heapq.heappush(self.heap, (due, reminder_id))
+        self.reminders[reminder_id]['next_due'] = due.strftime(DUE_FORMAT)
+        self.db_manager.update_reminder(reminder_id, next_due=due.strftime(DUE_FORMAT))
+
+    def set_enabled(self, reminder_id: int, enabled: bool) -> None:
+        """
+        Turns a reminder on or off and saves the choice.
+
+        Args:
+            reminder_id (int): The reminder's id.
+            enabled (bool): Whether it should fire.
+        """
+        reminder = self.reminders.get(reminder_id)
+        if reminder is None:
+            return
+        reminder['enabled'] = int(enabled)
+        self.db_manager.update_reminder(reminder_id, enabled=int(enabled))
+        if enabled:
+            self.schedule(reminder_id, next_due_after(reminder, datetime.now()))
+        else:
+            self.due.pop(reminder_id, None)
+        self.rearm()
+
+    def discard_stale(self) -> None:
+        while self.heap and self.due.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def rearm(self) -> None:
+        self.discard_stale()
+        if not self.heap:
+            self.timer.stop()
+            return
+        wait = (self.heap[0][0] - datetime.now()).total_seconds() * 1000
+        self.timer.start(int(min(max(wait, 0), MAX_TIMER_MS)))
+
+    def stop(self) -> None:
+        self.timer.stop()
+
+    def fire_due(self) -> None:
+        """
+        Fires every reminder that is due, unless its rule skips it, then re-arms the timer.
+
+        Returns:
+            None
+        """
+        now = datetime.now()
+        try:
+            self.discard_stale()
+            with self.db_manager.transaction():
+                while self.heap and self.heap[0][0] <= now:
+                    due, reminder_id = heapq.heappop(self.heap)
+                    reminder = self.reminders[reminder_id]
+                    rule = REMINDER_RULES.get(reminder['rule'])
+                    if rule is not None and rule(self.db_manager, reminder, now, self.pet_id):
+                        logger.info(f"Skipped reminder {reminder['kind']}: {reminder['rule']} already met")
+                    else:
+                        self.reminderDue.emit(dict(reminder))
+                    self.schedule(reminder_id, next_due_after(reminder, now))
+                    self.discard_stale()
+        except Exception as e:
+            logger.error(f"Error firing reminders: {e}", exc_info=True)
+        self.rearm()
@@ -0,0 +1,346 @@
+"""
+Weekly, monthly and yearly reports, built from the database and written as HTML, Markdown or PDF
+off the GUI thread.
+
+A report is a list of sections: an overview of every metric over the whole range, then a sleep
+table and a chart for each chunk of it (the week or month itself, or each month of a year). The
+data for the whole range is read up front in one bulk query per table, then cut into chunks. Each
+section is rendered to an HTML fragment plus its chart images, and kept in a SectionCache under
+a hash of the data it was built from, so a report asked for again only renders the sections whose
+data changed; for a year report after a day of new entries, that is the current month.
+
+The finished HTML is laid out in an off-screen QTextDocument. PDFs are printed from it with a
+QPdfWriter and Markdown is exported from it; QTextDocument, QImage and QPdfWriter may all be used
+outside the GUI thread.
+"""
+import base64
+import hashlib
+import html
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QPointF, QUrl
+from PyQt6.QtGui import QColor, QImage, QPageSize, QPainter, QPdfWriter, QPen, QPolygonF, QTextDocument
+
+import tracker_config as tkc
+from utility.app_operations.analytics import METRICS, daily_values, day_axis, load_metrics, open_readonly
+
+PERIODS = ('week', 'month', 'year')
+FORMATS = ('pdf', 'html', 'md')
+
+# Metrics drawn in every chunk's chart: name -> (label, line colour)
+CHART_SERIES = {
+    'hours_slept': ('Hours slept', '#3b6ea5'),
+    'lily_mood': ('Lily mood', '#c2703d'),
+    'lily_energy': ('Lily energy', '#5a9a5a'),
+}
+CHART_SIZE = (720, 220)
+
+SLEEP_COLUMNS = ('sleep_date', 'time_asleep', 'time_awake', 'duration_minutes', 'sleep_quality', 'woke_up_like')
+SLEEP_HEADERS = ('Night', 'Asleep', 'Awake', 'Hours', 'Quality', 'Woke up like')
+
+# A section as cached: (HTML fragment, image name -> PNG bytes)
+Section = Tuple[str, Dict[str, bytes]]
+
+
+def report_range(period: str, day: date) -> Tuple[date, date]:
+    """
+    :param period: One of PERIODS.
+    :param day: A day in the period to report.
+    :return: (first day, last day) of the period, the last day no later than day.
+    """
+    if period == 'week':
+        start = day - timedelta(days=day.weekday())
+        end = start + timedelta(days=6)
+    elif period == 'month':
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    elif period == 'year':
+        start, end = day.replace(month=1, day=1), day.replace(month=12, day=31)
+    else:
+        raise ValueError(f"Unknown report period {period!r}")
+    return start, min(end, day)
+
+
+def report_chunks(period: str, start: date, end: date) -> List[Tuple[str, date, date]]:
+    """
+    :return: (title, first day, last day) of each chunk with its own sleep table and chart: the
+        whole range, or each month of a year.
+    """
+    if period != 'year':
+        return [(f"{start.isoformat()} to {end.isoformat()}", start, end)]
+    chunks = []
+    first = start
+    while first <= end:
+        last = min((first + timedelta(days=32)).replace(day=1) - timedelta(days=1), end)
+        chunks.append((first.strftime('%B %Y'), first, last))
+        first = last + timedelta(days=1)
+    return chunks
+
+
+def fingerprint(*parts) -> str:
+    """
+    :return: A hash of a section's data: numpy arrays by their bytes, anything else by repr.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.tobytes() if isinstance(part, np.ndarray) else repr(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class SectionCache:
+    """
+    Rendered sections, keyed by (database, section, chunk) and checked against the hash of the
+    data they were rendered from. The least recently used are dropped past max_sections. Reports
+    run on worker threads, so every access holds a lock.
+    """
+
+    def __init__(self, max_sections: int = tkc.REPORT_CACHE_SECTIONS) -> None:
+        self.max_sections = max_sections
+        self.sections: 'OrderedDict[tuple, Tuple[str, Section]]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple, data_hash: str) -> Optional[Section]:
+        """
+        :return: The section rendered for key from data with this hash, or None.
+        """
+        with self.lock:
+            cached = self.sections.get(key)
+            if cached is None or cached[0] != data_hash:
+                return None
+            self.sections.move_to_end(key)
+            return cached[1]
+
+    def put(self, key: tuple, data_hash: str, section: Section) -> None:
+        with self.lock:
+            self.sections[key] = (data_hash, section)
+            self.sections.move_to_end(key)
+            while len(self.sections) > self.max_sections:
+                self.sections.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.sections.clear()
+
+
+def table_html(headers: Sequence[str], rows: Sequence[Sequence]) -> str:
+    head = ''.join(f"<th>{html.escape(header)}</th>" for header in headers)
+    body = ''.join('<tr>' + ''.join(f"<td>{html.escape(cell)}</td>" for cell in row) + '</tr>' for row in rows)
+    return f'<table border="1" cellspacing="0" cellpadding="4"><tr>{head}</tr>{body}</table>'
+
+
+def number(value: float, digits: int = 1) -> str:
+    return '' if value is None or np.isnan(value) else f"{value:.{digits}f}"
+
+
+def render_chart(axis: np.ndarray, series: Dict[str, np.ndarray]) -> bytes:
+    """
+    Draws the CHART_SERIES of one chunk as lines over its days, gaps where a day has no data.
+
+    :param axis: The chunk's days, as returned by day_axis.
+    :param series: Metric name -> one value per day of axis.
+    :return: The chart as PNG bytes.
+    """
+    width, height = CHART_SIZE
+    margin = 30
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(QColor('white'))
+    painter = QPainter(image)
+    try:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor('#999999'), 1))
+        painter.drawRect(margin, 10, width - margin - 10, height - margin - 10)
+        values = [daily for daily in series.values() if not np.isnan(daily).all()]
+        top = max(float(np.nanmax(daily)) for daily in values) if values else 1.0
+        top = max(top, 1.0)
+        painter.drawText(2, 20, f"{top:.0f}")
+        painter.drawText(2, height - margin, "0")
+        span = max(axis.size - 1, 1)
+        legend_x = margin + 6
+        for name, daily in series.items():
+            label, colour = CHART_SERIES[name]
+            painter.setPen(QPen(QColor(colour), 2))
+            painter.drawText(legend_x, height - 8, label)
+            legend_x += 12 + painter.fontMetrics().horizontalAdvance(label)
+            x = margin + np.arange(axis.size) * (width - margin - 10) / span
+            y = height - margin - np.nan_to_num(daily) * (height - margin - 20) / top
+            present = ~np.isnan(daily)
+            # one polyline per run of days with data
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], present.astype(np.int8), [0]))))
+            for first, stop in zip(edges[::2], edges[1::2]):
+                points = [QPointF(float(x[i]), float(y[i])) for i in range(first, stop)]
+                if len(points) == 1:
+                    painter.drawEllipse(points[0], 2, 2)
+                else:
+                    painter.drawPolyline(QPolygonF(points))
+    finally:
+        painter.end()
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(data)
+
+
+def overview_section(axis: np.ndarray, daily: Dict[str, np.ndarray]) -> Section:
+    rows = []
+    for name, values in daily.items():
+        logged = ~np.isnan(values)
+        if logged.any():
+            how = METRICS[name][3]
+            rows.append((name.replace('_', ' '), f"{int(logged.sum())} of {axis.size}", how,
+                         number(float(np.nanmean(values))), number(float(np.nanmin(values))),
+                         number(float(np.nanmax(values)))))
+    if not rows:
+        return "<h2>Overview</h2><p>Nothing was logged.</p>", {}
+    return "<h2>Overview</h2>" + table_html(
+        ('Metric', 'Days logged', 'Per day', 'Average', 'Lowest', 'Highest'), rows), {}
+
+
+def chunk_section(title: str, image_name: str, axis: np.ndarray, daily: Dict[str, np.ndarray],
+                  sleep_rows: List[tuple]) -> Section:
+    parts = [f"<h2>{html.escape(title)}</h2>"]
+    images = {}
+    series = {name: daily[name] for name in CHART_SERIES}
+    if any(not np.isnan(values).all() for values in series.values()):
+        images[image_name] = render_chart(axis, series)
+        parts.append(f'<p><img src="{image_name}" width="{CHART_SIZE[0]}" height="{CHART_SIZE[1]}"></p>')
+    if sleep_rows:
+        rows = [(night, asleep or '', awake or '', number(minutes / 60 if minutes is not None else None),
+                 '' if quality is None else str(quality), '' if woke is None else str(woke))
+                for night, asleep, awake, minutes, quality, woke in sleep_rows]
+        parts.append("<h3>Sleep</h3>" + table_html(SLEEP_HEADERS, rows))
+    else:
+        parts.append("<p>No sleep logged.</p>")
+    return ''.join(parts), images
+
+
+def build_report(db_path: str, period: str, day: date, cache: SectionCache,
+                 pet_id: Optional[int] = None) -> Dict:
+    """
+    Builds a report's HTML, rendering only the sections the cache doesn't hold for the same data.
+
+    Meant to run in a background thread; it opens its own read-only connection.
+
+    :param db_path: The path of the database file.
+    :param period: One of PERIODS.
+    :param day: A day in the period to report.
+    :param cache: Sections rendered before.
+    :param pet_id: The pet the pet metrics are of (see load_metrics).
+    :return: A dict with the title, the HTML (images referenced by name), the images as PNG bytes,
+        the number of sections rendered and reused, and the time taken in milliseconds.
+    """
+    started = time.perf_counter()
+    start, end = report_range(period, day)
+    first, last = start.isoformat(), end.isoformat()
+    axis = day_axis(first, last)
+    loaded = load_metrics(db_path, list(METRICS), first, last, pet_id)
+    daily = {name: daily_values(days, values, axis, METRICS[name][3]) for name, (days, values) in loaded.items()}
+    with closing(open_readonly(db_path)) as conn:
+        sleep_rows = conn.execute(f"SELECT {', '.join(SLEEP_COLUMNS)} FROM sleep_sessions "
+                                  f"WHERE sleep_date BETWEEN ? AND ? ORDER BY sleep_date, id",
+                                  (first, last)).fetchall()
+
+    title = f"{period.capitalize()} report, {first} to {last}"
+    parts = [f"<h1>{html.escape(title)}</h1>"]
+    images: Dict[str, bytes] = {}
+    built = reused = 0
+
+    def section(key: tuple, data_hash: str, render) -> None:
+        nonlocal built, reused
+        cached = cache.get((db_path, pet_id, *key), data_hash)
+        if cached is None:
+            cached = render()
+            cache.put((db_path, pet_id, *key), data_hash, cached)
+            built += 1
+        else:
+            reused += 1
+        parts.append(cached[0])
+        images.update(cached[1])
+
+    section(('overview', first, last), fingerprint(*daily.values()), lambda: overview_section(axis, daily))
+    for chunk_title, chunk_start, chunk_end in report_chunks(period, start, end):
+        lo = (np.datetime64(chunk_start.isoformat(), 'D') - axis[0]).astype(int)
+        hi = (np.datetime64(chunk_end.isoformat(), 'D') - axis[0]).astype(int) + 1
+        chunk_daily = {name: values[lo:hi] for name, values in daily.items()}
+        chunk_sleep = [row for row in sleep_rows if chunk_start.isoformat() <= row[0] <= chunk_end.isoformat()]
+        image_name = f"chart-{chunk_start.isoformat()}.png"
+        section(('chunk', chunk_start.isoformat(), chunk_end.isoformat()),
+                fingerprint(chunk_title, *(chunk_daily[name] for name in CHART_SERIES), chunk_sleep),
+                lambda: chunk_section(chunk_title, image_name, axis[lo:hi], chunk_daily, chunk_sleep))
+
+    return {
+        'title': title,
+        'html': (f"<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head>"
+                 f"<body>{''.join(parts)}</body></html>"),
+        'images': images,
+        'sections_built': built,
+        'sections_reused': reused,
+        'elapsed_ms': (time.perf_counter() - started) * 1000,
+    }
+
+
+def write_document(document_html: str, images: Dict[str, bytes], filename: str) -> str:
+    """
+    Writes HTML as a file in the format of filename's extension (see FORMATS).
+
+    HTML gets its images inline as data URIs. Markdown is exported from a QTextDocument, with
+    the images saved as PNG files next to it. PDF is printed from a QTextDocument with a QPdfWriter.
+    Safe to call from a background thread.
+
+    :param document_html: The HTML, images referenced by their names in images.
+    :param images: Image name -> PNG bytes.
+    :param filename: The file to write; .pdf, .html or .md.
+    :return: The path written.
+    :raises ValueError: For another extension.
+    """
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    if extension not in FORMATS:
+        raise ValueError(f"Can't write a report as .{extension}, use one of {', '.join(FORMATS)}")
+    if extension == 'html':
+        for name, png in images.items():
+            document_html = document_html.replace(
+                f'src="{name}"', f'src="data:image/png;base64,{base64.b64encode(png).decode()}"')
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write(document_html)
+        return filename
+
+    if extension == 'md':
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        for name, png in images.items():
+            with open(os.path.join(os.path.dirname(filename), f"{stem}-{name}"), 'wb') as file:
+                file.write(png)
+            document_html = document_html.replace(f'src="{name}"', f'src="{stem}-{name}"')
+        images = {f"{stem}-{name}": png for name, png in images.items()}
+    document = QTextDocument()
+    for name, png in images.items():
+        document.addResource(QTextDocument.ResourceType.ImageResource.value, QUrl(name), QImage.fromData(png))
+    document.setHtml(document_html)
+    if extension == 'md':
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write(document.toMarkdown())
+    else:
+        writer = QPdfWriter(filename)
+        writer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        writer.setTitle(document.metaInformation(QTextDocument.MetaInformation.DocumentTitle))
+        document.print(writer)
+    return filename
+
+
+def generate_report(db_path: str, period: str, day: date, filename: str, cache: SectionCache,
+                    pet_id: Optional[int] = None) -> Dict:
+    """
+    Builds a report and writes it. Meant to run in a background thread.
+
+    :return: The result of build_report, with the path written as 'filename'.
+    """
+    report = build_report(db_path, period, day, cache, pet_id)
+    report['filename'] = write_document(report['html'], report['images'], filename)
+    return report
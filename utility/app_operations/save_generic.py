@@ -2,7 +2,9 @@ import logging
 from PyQt6.QtWidgets import QTextEdit, QFileDialog
 from PyQt6.QtCore import QFileInfo, QByteArray
 from PyQt6.QtGui import QTextDocument, QTextDocumentWriter
-from PyQt6.QtPrintSupport import QPrinter
+
+from utility.app_operations.background_worker import run_in_background
+from utility.app_operations.reports import write_document
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +43,8 @@ class TextEditSaver:
         """
         Save the current text in the text editor to a file.
         This function opens a dialog to select the file format and location for saving the text.
-        It then saves the text in the chosen format and logs the file saving action.
+        It then saves the text in the chosen format and logs the file saving action. PDFs are
+        rendered from a copy of the document in a worker thread, so long texts don't hold up the window.
         If an error occurs during the file saving process, it logs the error.
 
         """
@@ -59,10 +62,9 @@ class TextEditSaver:
                     filename += ".txt"  # Default to .txt if no valid extension is provided
 
                 if file_extension == "pdf":
-                    printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-                    printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
-                    printer.setOutputFileName(filename)
-                    self.current_text_edit.document().print(printer)
+                    run_in_background(write_document, self.current_text_edit.toHtml(), {}, filename,
+                                      on_result=lambda path: logger.info(f"Saved file: {path}"))
+                    return
                 else:
                     with open(filename, 'w', encoding='utf-8') as file:
                         if file_extension == "html":
@@ -0,0 +1,52 @@
+from typing import Union
+from PyQt6.QtCore import QTime
+from logger_setup import logger
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minutes_of_day(value: Union[QTime, str]) -> int:
+    """
+    Converts a time of day to minutes since midnight.
+
+    Args:
+    value (Union[QTime, str]): A QTime, or text in 'hh:mm' / 'hh:mm:ss' form.
+
+    Returns:
+    int: Minutes since midnight.
+    """
+    if isinstance(value, QTime):
+        return value.hour() * 60 + value.minute()
+    hours, minutes = value.split(':')[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def sleep_duration_minutes(time_asleep: Union[QTime, str], time_awake: Union[QTime, str]) -> int:
+    """
+    Calculates how long someone slept, wrapping past midnight.
+
+    Args:
+    time_asleep (Union[QTime, str]): When they fell asleep.
+    time_awake (Union[QTime, str]): When they woke up.
+
+    Returns:
+    int: The sleep duration in whole minutes, 0 to 1439.
+    """
+    return (minutes_of_day(time_awake) - minutes_of_day(time_asleep)) % MINUTES_PER_DAY
+
+
+def format_minutes(total_minutes: int) -> str:
+    """
+    Formats a duration in minutes as 'HH:mm'.
+
+    Args:
+    total_minutes (int): The duration in minutes.
+
+    Returns:
+    str: The duration as 'HH:mm'.
+    """
+    try:
+        return f"{total_minutes // 60:02}:{total_minutes % 60:02}"
+    except Exception as e:
+        logger.error(f"An error occurred while formatting minutes: {e}")
+        return ""
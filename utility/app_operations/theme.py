@@ -0,0 +1,170 @@
+import re
+from string import Template
+from typing import Dict, List
+
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from logger_setup import logger
+
+# Rules layered over the generated UI's styles. Highlighting is done with dynamic properties (set
+# one with set_style_property) so a restyle is a property flip and a repolish, never a new sheet.
+# $root is the main window's id selector; it lifts these rules above the per-widget #name rules.
+THEME_TEMPLATE = Template("""
+$root QDateEdit[today="true"] {
+    color: $today;
+    font-weight: bold;
+}
+$root QDateEdit[today="true"]:focus {
+    color: $today_focus;
+}
+""")
+
+# theme name -> colours substituted into THEME_TEMPLATE
+THEMES: Dict[str, Dict[str, str]] = {
+    'dusk': {
+        'today': '#ffb86c',
+        'today_focus': '#ffd7a8',
+    },
+    'mint': {
+        'today': 'rgb(73,183,149)',
+        'today_focus': 'rgb(133,223,189)',
+    },
+    'high contrast': {
+        'today': '#ffff00',
+        'today_focus': '#ffffff',
+    },
+}
+
+COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+RULE = re.compile(r'([^{}]*)\{([^{}]*)\}')
+COMBINATOR = re.compile(r'\s*>\s*|\s+')
+COMPOUND = re.compile(r'^(\*|[A-Za-z_][\w-]*)?(.*)$')
+
+
+def scope_selector(selector: str, name: str) -> List[str]:
+    """
+    Rewrites one selector from a widget's own stylesheet so it means the same at application level.
+
+    A widget stylesheet applies to the widget itself and to its children, so the selector becomes
+    the widget's descendants (#name S) plus the widget itself (#name added to S's last compound,
+    unless that compound already names another id).
+
+    :param selector: A single selector, e.g. 'QSlider::handle:horizontal'.
+    :param name: The widget's objectName.
+    :return: The application-level selectors.
+    """
+    selector = selector.strip()
+    scoped = [f"#{name} {selector}"]
+    parts = COMBINATOR.split(selector)
+    head, last = selector[:len(selector) - len(parts[-1])], parts[-1]
+    type_part, rest = COMPOUND.match(last).groups()
+    if not rest.startswith('#'):
+        scoped.append(f"{head}{type_part or ''}#{name}{rest}")
+    return scoped
+
+
+def scope_stylesheet(sheet: str, name: str) -> str:
+    """
+    Rewrites a widget's stylesheet into application-level rules that only reach that widget.
+
+    :param sheet: The widget's stylesheet.
+    :param name: The widget's objectName.
+    :return: The scoped rules.
+    """
+    sheet = COMMENT.sub('', sheet)
+    if '{' not in sheet:
+        # A bare declaration list styles the widget itself
+        return f"#{name} {{{sheet.strip()}}}\n" if sheet.strip() else ""
+    rules = []
+    for selectors, declarations in RULE.findall(sheet):
+        scoped = [s for selector in selectors.split(',') if selector.strip()
+                  for s in scope_selector(selector, name)]
+        if scoped:
+            rules.append(f"{', '.join(scoped)} {{{declarations.strip()}}}")
+    return '\n'.join(rules) + '\n'
+
+
+def collect_widget_sheets(root: QWidget) -> str:
+    """
+    Moves the stylesheets set on root and its named children into one application-level sheet.
+
+    Root's own sheet is kept as the base; every other sheet is scoped to its widget with
+    scope_stylesheet and then cleared from the widget, so Qt has a single sheet to resolve.
+    Unnamed widgets keep their sheets, as they can't be selected by id.
+
+    :param root: The main window.
+    :return: The collected sheet.
+    """
+    parts = [COMMENT.sub('', root.styleSheet())]
+    root.setStyleSheet("")
+    for widget in root.findChildren(QWidget):
+        sheet, name = widget.styleSheet(), widget.objectName()
+        if not sheet.strip() or not name:
+            continue
+        parts.append(scope_stylesheet(sheet, name))
+        widget.setStyleSheet("")
+    return '\n'.join(parts)
+
+
+def set_style_property(widget: QWidget, name: str, value) -> None:
+    """
+    Sets a dynamic property that theme rules select on and repolishes the widget if it changed.
+
+    :param widget: The widget.
+    :param name: The property, e.g. 'today'.
+    :param value: Its new value.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+class ThemeManager:
+    """
+    Compiles and applies the application stylesheet.
+
+    The generated UI's per-widget sheets are collected once into a base sheet; each theme's
+    compiled sheet (base plus its THEME_TEMPLATE rules) is cached, so switching themes at runtime
+    costs one setStyleSheet on the application.
+
+    Attributes:
+        current (str): The applied theme.
+    """
+
+    def __init__(self, root: QWidget) -> None:
+        self.root_selector = f"#{root.objectName()}"
+        self.base = collect_widget_sheets(root)
+        self.compiled: Dict[str, str] = {}
+        self.current = None
+
+    @staticmethod
+    def available() -> List[str]:
+        return list(THEMES)
+
+    def compile(self, name: str) -> str:
+        """
+        :param name: A key of THEMES.
+        :return: The full application stylesheet for the theme.
+        """
+        if name not in self.compiled:
+            rules = THEME_TEMPLATE.substitute(THEMES[name], root=self.root_selector)
+            self.compiled[name] = f"{self.base}\n{rules}"
+        return self.compiled[name]
+
+    def apply(self, name: str) -> bool:
+        """
+        Makes a theme the application's stylesheet.
+
+        :param name: A key of THEMES.
+        :return: True if the theme was applied, False if there is no such theme.
+        """
+        if name not in THEMES:
+            logger.error(f"Unknown theme {name}")
+            return False
+        if name != self.current:
+            QApplication.instance().setStyleSheet(self.compile(name))
+            self.current = name
+        return True
@@ -0,0 +1,181 @@
+from typing import Dict, List
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QUndoCommand, QUndoStack
+
+from database.table_specs import TABLE_ALIASES
+from logger_setup import logger
+
+# table -> short name shown in the Undo/Redo action text
+TABLE_LABELS = {table: alias for alias, table in TABLE_ALIASES.items()}
+
+
+def describe(verb: str, rows: Dict[str, list]) -> str:
+    count = sum(len(ids) for ids in rows.values())
+    names = ', '.join(TABLE_LABELS.get(table, table) for table in rows)
+    return f"{verb} {names} entry" if count == 1 else f"{verb} {count} {names} entries"
+
+
+class AddRowsCommand(QUndoCommand):
+    """
+    Rows committed together. They already exist when the command is pushed; undo soft-deletes
+    them and redo restores them.
+    """
+
+    def __init__(self, history: 'UndoHistory', row_ids: Dict[str, List[int]]) -> None:
+        super().__init__(describe("Add", row_ids))
+        self.history = history
+        self.row_ids = row_ids
+        self.applied = True
+
+    def undo(self) -> None:
+        self.applied = not self.history.apply(self, remove=self.row_ids)
+
+    def redo(self) -> None:
+        if not self.applied:
+            self.applied = self.history.apply(self, restore=self.row_ids)
+
+
+class DeleteRowsCommand(QUndoCommand):
+    """
+    Rows deleted together. Deletes are soft, so undo only clears the rows' deleted_at.
+    """
+
+    def __init__(self, history: 'UndoHistory', row_ids: Dict[str, List[int]]) -> None:
+        super().__init__(describe("Delete", row_ids))
+        self.history = history
+        self.row_ids = row_ids
+
+    def undo(self) -> None:
+        self.history.apply(self, restore=self.row_ids)
+
+    def redo(self) -> None:
+        self.history.apply(self, remove=self.row_ids)
+
+
+class EditCellCommand(QUndoCommand):
+    """
+    One cell edited in a table view. The model has written the new value when the command is
+    pushed; consecutive edits of the same cell merge into one step.
+    """
+
+    def __init__(self, history: 'UndoHistory', table: str, row_id: int, column: str, old, new) -> None:
+        super().__init__(f"Edit {TABLE_LABELS.get(table, table)} {column}")
+        self.history = history
+        self.table = table
+        self.row_id = row_id
+        self.column = column
+        self.old = old
+        self.new = new
+        self.applied = True
+
+    def id(self) -> int:
+        return 1
+
+    def mergeWith(self, other: QUndoCommand) -> bool:
+        if (other.table, other.row_id, other.column) != (self.table, self.row_id, self.column):
+            return False
+        self.new = other.new
+        return True
+
+    def undo(self) -> None:
+        self.applied = not self.history.apply_edit(self, self.old)
+
+    def redo(self) -> None:
+        if not self.applied:
+            self.applied = self.history.apply_edit(self, self.new)
+
+
+class UndoHistory(QObject):
+    """
+    Undo and redo for one database's commits, deletes and cell edits.
+
+    Inserts reach record_insert through DataManager's insert listeners; the ones made in the same
+    pass of the event loop (one commit button can fill several tables) become a single step.
+    Every step is applied in one transaction on the GUI connection. The change log triggers record
+    it like any other change, so an undo reaches synced devices too.
+
+    Attributes:
+        rowsChanged: Emitted with a table whose rows were added or removed by undo or redo.
+        rowEdited: Emitted with (table, row id) after undo or redo rewrote a cell.
+    """
+
+    rowsChanged = pyqtSignal(str)
+    rowEdited = pyqtSignal(str, int)
+
+    def __init__(self, db_manager, parent=None) -> None:
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.stack = QUndoStack(self)
+        self.pending: Dict[str, List[int]] = {}
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(0)
+        self.flush_timer.timeout.connect(self.flush_inserts)
+        db_manager.insert_listeners.append(self.record_insert)
+
+    def record_insert(self, table: str, row_id: int) -> None:
+        self.pending.setdefault(table, []).append(int(row_id))
+        self.flush_timer.start()
+
+    def flush_inserts(self) -> None:
+        if self.pending:
+            self.stack.push(AddRowsCommand(self, self.pending))
+            self.pending = {}
+
+    def clear(self) -> None:
+        """
+        Forgets every recorded change, for when the database was replaced under them.
+        """
+        self.flush_timer.stop()
+        self.pending = {}
+        self.stack.clear()
+
+    def record_edit(self, table: str, row_id: int, column: str, old, new) -> None:
+        self.flush_inserts()
+        self.stack.push(EditCellCommand(self, table, row_id, column, old, new))
+
+    def delete_rows(self, row_ids: Dict[str, List[int]]) -> None:
+        """
+        Deletes rows as one undoable step.
+
+        Args:
+            row_ids (Dict[str, List[int]]): Table -> ids of the rows to delete.
+        """
+        self.flush_inserts()
+        row_ids = {table: ids for table, ids in row_ids.items() if ids}
+        if row_ids:
+            self.stack.push(DeleteRowsCommand(self, row_ids))
+
+    def apply(self, command: QUndoCommand, remove: Dict[str, List[int]] = None,
+              restore: Dict[str, List[int]] = None) -> bool:
+        """
+        Soft-deletes or restores a step's rows in one transaction. A step that fails is rolled back
+        and dropped from the stack, as its rows no longer match the database.
+
+        Returns:
+            bool: True if the rows were changed.
+        """
+        remove, restore = remove or {}, restore or {}
+        try:
+            with self.db_manager.transaction():
+                for table, ids in remove.items():
+                    if not self.db_manager.delete_rows(table, ids):
+                        raise RuntimeError(f"could not delete from {table}")
+                for table, ids in restore.items():
+                    if not self.db_manager.restore_rows(table, ids):
+                        raise RuntimeError(f"could not restore rows of {table}")
+        except Exception as e:
+            logger.error(f"Error applying '{command.text()}': {e}")
+            command.setObsolete(True)
+            return False
+        for table in {*remove, *restore}:
+            self.rowsChanged.emit(table)
+        return True
+
+    def apply_edit(self, command: EditCellCommand, value) -> bool:
+        if not self.db_manager.update_value(command.table, command.row_id, command.column, value):
+            command.setObsolete(True)
+            return False
+        self.rowEdited.emit(command.table, command.row_id)
+        return True